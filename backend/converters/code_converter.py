@@ -1,13 +1,33 @@
 import os
+import re
 import json
 import shutil
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Dict, Any, Optional, AsyncIterator
 from pathlib import Path
 from services.genai_service import GenAIService
+from parsers.code_span import entry_text
+
+logger = logging.getLogger(__name__)
 
 class CodeConverter:
-    def __init__(self):
-        self.genai_service = GenAIService()
+    # Patterns for repairing and salvaging AI responses, compiled once
+    _JSON_CONTENT_RE = re.compile(r'"content":\s*"([^"]*(?:\\.[^"]*)*)"')
+    _JSON_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+    _JSON_BARE_KEY_RE = re.compile(r'(\s*)(\w+)(\s*):')
+    _GENERIC_CODE_BLOCK_RE = re.compile(r'```\s*\n(.*?)\n```', re.DOTALL)
+    _CONTENT_FIELD_RES = (
+        re.compile(r'"content":\s*"([^"]*(?:\\.[^"]*)*)"', re.DOTALL),
+        re.compile(r'content:\s*"([^"]*(?:\\.[^"]*)*)"', re.DOTALL),
+        re.compile(r'content:\s*`([^`]*)`', re.DOTALL),
+        re.compile(r'content:\s*"""([^"]*)"""', re.DOTALL),
+    )
+    
+    def __init__(self, genai_service: Optional[GenAIService] = None):
+        # An injected service is shared with (and initialized and closed by) its owner, so the
+        # process keeps one client, connection pool and response cache
+        self._owns_genai_service = genai_service is None
+        self.genai_service = genai_service if genai_service is not None else GenAIService()
         self.supported_conversions = {
             'python': ['python', 'java', 'javascript', 'typescript', 'go', 'rust'],
             'java': ['java', 'python', 'javascript', 'typescript', 'go', 'rust'],
@@ -25,12 +45,18 @@ class CodeConverter:
     async def initialize(self):
         """Initialize the code converter"""
         try:
-            await self.genai_service.initialize()
-            print("Code Converter initialized successfully")
+            if self._owns_genai_service:
+                await self.genai_service.initialize()
+            logger.info("Code Converter initialized successfully")
         except Exception as e:
-            print(f"Failed to initialize Code Converter: {str(e)}")
+            logger.error("Failed to initialize Code Converter: %s", e)
             raise
     
+    async def close(self):
+        """Release the GenAI service if this converter created it"""
+        if self._owns_genai_service:
+            await self.genai_service.close()
+    
     async def convert_code(
         self, 
         ast_data: List[Dict[str, Any]], 
@@ -41,59 +67,15 @@ class CodeConverter:
     ) -> Dict[str, Any]:
         """Convert code from source language to target language"""
         try:
-            if not self._is_conversion_supported(source_language, target_language):
-                raise ValueError(f"Conversion from {source_language} to {target_language} is not supported")
-            
             converted_files = []
-            all_dependencies = {}
-            
-            # Convert each file individually
-            for file_data in ast_data:
-                file_path = file_data.get("file_path", "unknown")
-                print(f"Converting file: {file_path}")
-                
-                try:
-                    # Prepare source code for this specific file
-                    source_code = self._prepare_single_file_code(file_data, source_language)
-                    
-                    # Generate conversion prompt for this file
-                    prompt = self._create_single_file_conversion_prompt(
-                        source_code, 
-                        source_language, 
-                        target_language, 
-                        file_path,
-                        source_framework,
-                        target_framework
-                    )
-                    
-                    # Get AI response for this file
-                    converted_code = await self.genai_service._chat_with_azure(prompt)
-                    
-                    # Parse the converted code for this file
-                    parsed_conversion = self._parse_single_file_conversion(
-                        converted_code, 
-                        target_language, 
-                        file_path,
-                        target_framework
-                    )
-                    
-                    if parsed_conversion:
-                        converted_files.append(parsed_conversion)
-                        # Merge dependencies
-                        file_deps = parsed_conversion.get("dependencies", {})
-                        all_dependencies.update(file_deps)
-                        print(f"Successfully converted: {file_path}")
-                    else:
-                        print(f"Failed to convert: {file_path} - no valid content extracted")
-                        
-                except Exception as e:
-                    print(f"Error converting file {file_path}: {str(e)}")
-                    # Continue with other files instead of failing completely
-                    continue
-            
-            # Create startup files based on target language and framework
-            startup_files = await self._create_startup_files(target_language, target_framework, converted_files)
-            converted_files.extend(startup_files)
+            async for parsed_conversion in self.iter_convert_code(
+                ast_data,
+                source_language,
+                target_language,
+                source_framework,
+                target_framework
+            ):
+                converted_files.append(parsed_conversion)
             
             # Generate dependencies with framework support
             dependencies = await self.generate_dependencies(target_language, {
@@ -116,13 +98,107 @@ class CodeConverter:
                 "conversion_notes": f"Converted {len(converted_files)} files from {source_language} to {target_language}"
             }
             
-            print(f'Conversion result: {len(converted_files)} files converted')
+            logger.info("Conversion result: %s files converted", len(converted_files))
             return result
             
         except Exception as e:
-            print(f"Failed to convert code: {str(e)}")
+            logger.error("Failed to convert code: %s", e)
             raise
     
+    async def iter_convert_code(
+        self, 
+        ast_data: List[Dict[str, Any]], 
+        source_language: str, 
+        target_language: str,
+        source_framework: Optional[str] = None,
+        target_framework: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Convert files one at a time, yielding each converted file as soon as it is ready"""
+        if not self._is_conversion_supported(source_language, target_language):
+            raise ValueError(f"Conversion from {source_language} to {target_language} is not supported")
+        
+        # Only filenames are needed to decide on startup files
+        converted_filenames = []
+        
+        # Convert each file individually
+        for file_data in ast_data:
+            file_path = file_data.get("file_path", "unknown")
+            logger.info("Converting file: %s", file_path)
+            
+            try:
+                # Prepare source code for this specific file
+                source_code = self._prepare_single_file_code(file_data, source_language)
+                
+                # Generate conversion prompt for this file
+                prompt = self._create_single_file_conversion_prompt(
+                    source_code, 
+                    source_language, 
+                    target_language, 
+                    file_path,
+                    source_framework,
+                    target_framework
+                )
+                
+                # Get AI response for this file
+                converted_code = await self.genai_service._chat_with_azure(prompt)
+                
+                # Parse the converted code for this file
+                parsed_conversion = self._parse_single_file_conversion(
+                    converted_code, 
+                    target_language, 
+                    file_path,
+                    target_framework
+                )
+                
+                if parsed_conversion:
+                    converted_filenames.append({"filename": parsed_conversion["filename"]})
+                    logger.info("Successfully converted: %s", file_path)
+                    yield parsed_conversion
+                else:
+                    logger.warning("Failed to convert: %s - no valid content extracted", file_path)
+                    
+            except Exception as e:
+                logger.warning("Error converting file %s: %s", file_path, e)
+                # Continue with other files instead of failing completely
+                continue
+        
+        # Create startup files based on target language and framework
+        for startup_file in await self._create_startup_files(target_language, target_framework, converted_filenames):
+            yield startup_file
+    
+    async def stream_converted_code(
+        self, 
+        ast_data: List[Dict[str, Any]], 
+        output_dir: str,
+        source_language: str, 
+        target_language: str,
+        source_framework: Optional[str] = None,
+        target_framework: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Convert, save and yield files one at a time so only one file is held in memory"""
+        os.makedirs(output_dir, exist_ok=True)
+        dependencies = self._get_default_dependencies(target_language, target_framework)
+        files_converted = 0
+        
+        async for file_data in self.iter_convert_code(
+            ast_data,
+            source_language,
+            target_language,
+            source_framework,
+            target_framework
+        ):
+            self._save_converted_file(output_dir, file_data)
+            dependencies.update(self._analyze_file_dependencies(file_data["content"], target_language))
+            files_converted += 1
+            yield file_data
+        
+        self._save_conversion_metadata(output_dir, {
+            "source_language": source_language,
+            "target_language": target_language,
+            "conversion_notes": f"Converted {files_converted} files from {source_language} to {target_language}"
+        }, dependencies)
+        logger.info("Conversion result: %s files converted", files_converted)
+    
     async def generate_dependencies(self, target_language: str, converted_code: Dict[str, Any], target_framework: Optional[str] = None) -> Dict[str, Any]:
         """Generate dependencies file for target language"""
         try:
@@ -137,7 +213,7 @@ class CodeConverter:
             return dependencies
             
         except Exception as e:
-            print(f"Failed to generate dependencies: {str(e)}")
+            logger.warning("Failed to generate dependencies: %s", e)
             return self._get_default_dependencies(target_language)
     
     async def save_converted_code(
@@ -152,46 +228,54 @@ class CodeConverter:
             
             # Save converted files
             for file_data in converted_code.get("converted_files", []):
-                file_path = os.path.join(output_dir, file_data["filename"])
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(file_data["content"])
+                self._save_converted_file(output_dir, file_data)
             
-            # Save dependencies file
-            deps_file = self._get_dependencies_filename(converted_code.get("target_language", "unknown"))
-            deps_path = os.path.join(output_dir, deps_file)
+            self._save_conversion_metadata(output_dir, converted_code, dependencies)
             
-            with open(deps_path, 'w', encoding='utf-8') as f:
-                if deps_file.endswith('.json'):
-                    json.dump(dependencies, f, indent=2)
-                elif deps_file.endswith('.txt'):
-                    for dep, version in dependencies.items():
-                        f.write(f"{dep}=={version}\n")
-                elif deps_file.endswith('.toml'):
-                    f.write("[dependencies]\n")
-                    for dep, version in dependencies.items():
-                        f.write(f'{dep} = "{version}"\n')
-                elif deps_file == 'pom.xml':
-                    # Generate proper Maven pom.xml for Spring Boot
-                    pom_content = self._generate_spring_boot_pom_xml(dependencies, converted_code)
-                    f.write(pom_content)
-            
-            # Save conversion notes
-            notes_path = os.path.join(output_dir, "CONVERSION_NOTES.md")
-            with open(notes_path, 'w', encoding='utf-8') as f:
-                f.write("# Code Conversion Notes\n\n")
-                f.write(f"**Source Language:** {converted_code.get('source_language', 'unknown')}\n")
-                f.write(f"**Target Language:** {converted_code.get('target_language', 'unknown')}\n\n")
-                f.write("## Conversion Summary\n\n")
-                f.write(converted_code.get("conversion_notes", "No notes available."))
-            
-            print(f"Converted code saved to {output_dir}")
+            logger.info("Converted code saved to %s", output_dir)
             
         except Exception as e:
-            print(f"Failed to save converted code: {str(e)}")
+            logger.warning("Failed to save converted code: %s", e)
             raise
     
+    def _save_converted_file(self, output_dir: str, file_data: Dict[str, Any]):
+        """Write a single converted file below the output directory"""
+        file_path = os.path.join(output_dir, file_data["filename"])
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(file_data["content"])
+    
+    def _save_conversion_metadata(self, output_dir: str, converted_code: Dict[str, Any], dependencies: Dict[str, Any]):
+        """Write the dependencies file and conversion notes"""
+        # Save dependencies file
+        deps_file = self._get_dependencies_filename(converted_code.get("target_language", "unknown"))
+        deps_path = os.path.join(output_dir, deps_file)
+        
+        with open(deps_path, 'w', encoding='utf-8') as f:
+            if deps_file.endswith('.json'):
+                json.dump(dependencies, f, indent=2)
+            elif deps_file.endswith('.txt'):
+                for dep, version in dependencies.items():
+                    f.write(f"{dep}=={version}\n")
+            elif deps_file.endswith('.toml'):
+                f.write("[dependencies]\n")
+                for dep, version in dependencies.items():
+                    f.write(f'{dep} = "{version}"\n')
+            elif deps_file == 'pom.xml':
+                # Generate proper Maven pom.xml for Spring Boot
+                pom_content = self._generate_spring_boot_pom_xml(dependencies, converted_code)
+                f.write(pom_content)
+        
+        # Save conversion notes
+        notes_path = os.path.join(output_dir, "CONVERSION_NOTES.md")
+        with open(notes_path, 'w', encoding='utf-8') as f:
+            f.write("# Code Conversion Notes\n\n")
+            f.write(f"**Source Language:** {converted_code.get('source_language', 'unknown')}\n")
+            f.write(f"**Target Language:** {converted_code.get('target_language', 'unknown')}\n\n")
+            f.write("## Conversion Summary\n\n")
+            f.write(converted_code.get("conversion_notes", "No notes available."))
+    
     def _is_conversion_supported(self, source_language: str, target_language: str) -> bool:
         """Check if conversion is supported"""
         source_lang = source_language.lower()
@@ -281,9 +365,9 @@ Provide only the JSON response, no additional text. The content field should be
     def _parse_converted_code(self, ai_response: str, target_language: str) -> Dict[str, Any]:
         """Parse AI response into structured converted code"""
         try:
-            print(f"Parsing AI response for {target_language}")
-            print(f"Response length: {len(ai_response)}")
-            print(f"Response preview: {ai_response[:200]}...")
+            logger.debug("Parsing AI response for %s", target_language)
+            logger.debug("Response length: %s", len(ai_response))
+            logger.debug("Response preview: %s...", ai_response[:200])
             
             # Try to extract JSON from response
             start_idx = ai_response.find('{')
@@ -291,10 +375,10 @@ Provide only the JSON response, no additional text. The content field should be
             
             if start_idx != -1 and end_idx != 0:
                 json_str = ai_response[start_idx:end_idx]
-                print(f"Extracted JSON string length: {len(json_str)}")
+                logger.debug("Extracted JSON string length: %s", len(json_str))
                 
                 parsed = json.loads(json_str)
-                print(f"Successfully parsed JSON with keys: {list(parsed.keys())}")
+                logger.debug("Successfully parsed JSON with keys: %s", list(parsed.keys()))
                 
                 # Extract the actual code content from the JSON structure
                 files = parsed.get("files", [])
@@ -302,8 +386,8 @@ Provide only the JSON response, no additional text. The content field should be
                     # Get the content from the first file
                     first_file = files[0]
                     content = first_file.get("content", "")
-                    print(f"Extracted content length: {len(content)}")
-                    print(f"Content preview: {content[:200]}...")
+                    logger.debug("Extracted content length: %s", len(content))
+                    logger.debug("Content preview: %s...", content[:200])
                     
                     # If content is still JSON, try to extract the actual code
                     if content.startswith('```'):
@@ -320,12 +404,12 @@ Provide only the JSON response, no additional text. The content field should be
                                 code_lines.append(line)
                         
                         content = '\n'.join(code_lines)
-                        print(f"Extracted code from markdown blocks, length: {len(content)}")
+                        logger.debug("Extracted code from markdown blocks, length: %s", len(content))
                     
                     # If content contains escaped newlines, unescape them
                     if '\\n' in content:
                         content = content.replace('\\n', '\n')
-                        print("Unescaped newlines in content")
+                        logger.debug("Unescaped newlines in content")
                     
                     return {
                         "files": [{
@@ -336,7 +420,7 @@ Provide only the JSON response, no additional text. The content field should be
                         "notes": parsed.get("notes", "Conversion completed")
                     }
                 else:
-                    print("No files found in JSON response")
+                    logger.info("No files found in JSON response")
                     # No files in JSON, use the entire response as content
                     return {
                         "files": [{
@@ -347,7 +431,7 @@ Provide only the JSON response, no additional text. The content field should be
                         "notes": "No files found in JSON response"
                     }
             else:
-                print("Could not find JSON structure in response")
+                logger.warning("Could not find JSON structure in response")
                 # Fallback: create basic structure
                 return {
                     "files": [{
@@ -359,8 +443,8 @@ Provide only the JSON response, no additional text. The content field should be
                 }
                 
         except Exception as e:
-            print(f"Failed to parse converted code: {str(e)}")
-            print(f"Error type: {type(e).__name__}")
+            logger.warning("Failed to parse converted code: %s", e)
+            logger.warning("Error type: %s", type(e).__name__)
             return {
                 "files": [{
                     "filename": f"main.{self._get_file_extension(target_language)}",
@@ -633,7 +717,7 @@ Provide only the JSON response, no additional text. The content field should be
         # Add classes
         for cls in classes:
             class_name = cls.get('name', 'unknown')
-            full_code = cls.get('full_code', '')
+            full_code = entry_text(file_data, cls, 'full_code')
             
             if full_code:
                 code_parts.append(full_code)
@@ -657,7 +741,7 @@ Provide only the JSON response, no additional text. The content field should be
         # Add functions
         for func in functions:
             func_name = func.get('name', 'unknown')
-            full_code = func.get('full_code', '')
+            full_code = entry_text(file_data, func, 'full_code')
             
             if full_code:
                 code_parts.append(full_code)
@@ -770,9 +854,9 @@ Respond with ONLY the JSON object, no other text.
     ) -> Optional[Dict[str, Any]]:
         """Parse AI response for a single file conversion"""
         try:
-            print(f"Parsing single file conversion for {original_file_path}")
-            print(f"Response length: {len(ai_response)}")
-            print(f"Response preview: {ai_response[:200]}...")
+            logger.debug("Parsing single file conversion for %s", original_file_path)
+            logger.debug("Response length: %s", len(ai_response))
+            logger.debug("Response preview: %s...", ai_response[:200])
             
             # Try multiple strategies to extract valid JSON
             json_data = None
@@ -783,27 +867,27 @@ Respond with ONLY the JSON object, no other text.
             
             if start_idx != -1 and end_idx != 0:
                 json_str = ai_response[start_idx:end_idx]
-                print(f"Extracted JSON string length: {len(json_str)}")
+                logger.debug("Extracted JSON string length: %s", len(json_str))
                 
                 try:
                     json_data = json.loads(json_str)
-                    print(f"Successfully parsed JSON with keys: {list(json_data.keys())}")
+                    logger.debug("Successfully parsed JSON with keys: %s", list(json_data.keys()))
                 except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {e}")
-                    print(f"Problematic JSON: {json_str[:500]}...")
+                    logger.warning("JSON decode error: %s", e)
+                    logger.warning("Problematic JSON: %s...", json_str[:500])
                     
                     # Strategy 2: Try to fix common JSON issues
                     fixed_json = self._fix_common_json_issues(json_str)
                     try:
                         json_data = json.loads(fixed_json)
-                        print(f"Successfully parsed fixed JSON")
+                        logger.info("Successfully parsed fixed JSON")
                     except json.JSONDecodeError as e2:
-                        print(f"Fixed JSON still has errors: {e2}")
+                        logger.warning("Fixed JSON still has errors: %s", e2)
                         json_data = None
             
             # Strategy 3: If JSON parsing fails, try to extract content manually
             if json_data is None:
-                print("JSON parsing failed, trying manual extraction...")
+                logger.debug("JSON parsing failed, trying manual extraction...")
                 json_data = self._extract_content_manually(ai_response, target_language, original_file_path)
             
             if json_data:
@@ -813,25 +897,25 @@ Respond with ONLY the JSON object, no other text.
                 dependencies = json_data.get("dependencies", {})
                 notes = json_data.get("notes", "")
                 
-                print(f"Extracted filename: {filename}")
-                print(f"Content length: {len(content)}")
-                print(f"Content preview: {content[:200]}...")
+                logger.debug("Extracted filename: %s", filename)
+                logger.debug("Content length: %s", len(content))
+                logger.debug("Content preview: %s...", content[:200])
                 
                 # If content contains escaped newlines, unescape them
                 if '\\n' in content:
                     content = content.replace('\\n', '\n')
-                    print("Unescaped newlines in content")
+                    logger.debug("Unescaped newlines in content")
                 
                 # Validate that we have content
                 if not content.strip():
-                    print("Warning: No content found in conversion")
+                    logger.warning("No content found in conversion")
                     return None
                 
                 # Generate proper directory structure based on framework
                 if target_framework:
                     framework_path = self._get_framework_directory_structure(target_language, target_framework, original_file_path)
                     filename = framework_path
-                    print(f"Generated framework path: {filename}")
+                    logger.debug("Generated framework path: %s", filename)
                 
                 return {
                     "filename": filename,
@@ -840,23 +924,19 @@ Respond with ONLY the JSON object, no other text.
                     "notes": notes
                 }
             else:
-                print("Could not extract valid data from response")
+                logger.warning("Could not extract valid data from response")
                 return None
                 
         except Exception as e:
-            print(f"Failed to parse single file conversion: {str(e)}")
-            print(f"Error type: {type(e).__name__}")
+            logger.warning("Failed to parse single file conversion: %s", e)
+            logger.warning("Error type: %s", type(e).__name__)
             return None
     
     def _fix_common_json_issues(self, json_str: str) -> str:
         """Fix common JSON formatting issues"""
         try:
-            # Fix unescaped quotes in content
-            import re
-            
-            # Find content field and fix quotes
-            content_pattern = r'"content":\s*"([^"]*(?:\\.[^"]*)*)"'
-            match = re.search(content_pattern, json_str)
+            # Find content field and fix unescaped quotes
+            match = self._JSON_CONTENT_RE.search(json_str)
             
             if match:
                 content_start = match.start(1)
@@ -874,15 +954,15 @@ Respond with ONLY the JSON object, no other text.
                 json_str = json_str[:content_start] + content + json_str[content_end:]
             
             # Fix trailing commas
-            json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
+            json_str = self._JSON_TRAILING_COMMA_RE.sub(r'\1', json_str)
             
             # Fix missing quotes around property names
-            json_str = re.sub(r'(\s*)(\w+)(\s*):', r'\1"\2"\3:', json_str)
+            json_str = self._JSON_BARE_KEY_RE.sub(r'\1"\2"\3:', json_str)
             
             return json_str
             
         except Exception as e:
-            print(f"Error fixing JSON: {e}")
+            logger.warning("Error fixing JSON: %s", e)
             return json_str
     
     def _extract_content_manually(self, ai_response: str, target_language: str, original_file_path: str) -> Optional[Dict[str, Any]]:
@@ -897,27 +977,18 @@ Respond with ONLY the JSON object, no other text.
             code_blocks = []
             
             # Look for markdown code blocks
-            import re
             code_block_pattern = rf'```{target_language}?\s*\n(.*?)\n```'
             matches = re.findall(code_block_pattern, ai_response, re.DOTALL)
             code_blocks.extend(matches)
             
             # Look for code blocks without language specification
-            generic_pattern = r'```\s*\n(.*?)\n```'
-            matches = re.findall(generic_pattern, ai_response, re.DOTALL)
+            matches = self._GENERIC_CODE_BLOCK_RE.findall(ai_response)
             code_blocks.extend(matches)
             
             # If no code blocks found, try to extract content after "content:" or similar
             if not code_blocks:
-                content_patterns = [
-                    r'"content":\s*"([^"]*(?:\\.[^"]*)*)"',
-                    r'content:\s*"([^"]*(?:\\.[^"]*)*)"',
-                    r'content:\s*`([^`]*)`',
-                    r'content:\s*"""([^"]*)"""',
-                ]
-                
-                for pattern in content_patterns:
-                    match = re.search(pattern, ai_response, re.DOTALL)
+                for pattern in self._CONTENT_FIELD_RES:
+                    match = pattern.search(ai_response)
                     if match:
                         content = match.group(1)
                         # Unescape common escape sequences
@@ -927,7 +998,7 @@ Respond with ONLY the JSON object, no other text.
             
             if code_blocks:
                 content = code_blocks[0]  # Use the first code block found
-                print(f"Manually extracted content with length: {len(content)}")
+                logger.debug("Manually extracted content with length: %s", len(content))
                 
                 return {
                     "filename": filename,
@@ -936,11 +1007,11 @@ Respond with ONLY the JSON object, no other text.
                     "notes": f"Manually extracted from AI response for {original_file_path}"
                 }
             
-            print("No code content found in response")
+            logger.info("No code content found in response")
             return None
             
         except Exception as e:
-            print(f"Error in manual extraction: {e}")
+            logger.warning("Error in manual extraction: %s", e)
             return None
 
     async def _create_startup_files(self, target_language: str, target_framework: Optional[str], converted_files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -960,13 +1031,13 @@ Respond with ONLY the JSON object, no other text.
                 existing_startup_files.append(filename)
         
         if existing_startup_files:
-            print(f"Startup files already exist: {existing_startup_files}")
+            logger.info("Startup files already exist: %s", existing_startup_files)
             return startup_files
         
         # Create startup file based on target language and framework
         startup_file_info = self._get_startup_file_info(target_language, target_framework)
         if not startup_file_info:
-            print(f"No startup file configuration for {target_language}")
+            logger.info("No startup file configuration for %s", target_language)
             return startup_files
         
         filename, template = startup_file_info
@@ -996,12 +1067,12 @@ Respond with ONLY the JSON object, no other text.
             
             if parsed_startup_file:
                 startup_files.append(parsed_startup_file)
-                print(f"Created startup file: {filename}")
+                logger.info("Created startup file: %s", filename)
             else:
-                print(f"Failed to create startup file: {filename}")
+                logger.warning("Failed to create startup file: %s", filename)
                 
         except Exception as e:
-            print(f"Error creating startup file: {str(e)}")
+            logger.warning("Error creating startup file: %s", e)
         
         return startup_files
     
@@ -23,7 +23,7 @@ class ArangoDBClient:
                 host = os.getenv("ARANGO_HOST", "dfe0f71e8439.arangodb.cloud")
                 port = int(os.getenv("ARANGO_PORT", "8529"))
                 username = os.getenv("ARANGO_USER", "root")
-                password = os.getenv("ARANGO_PASSWORD", "3QFuyS33nuXJGvUP8vQT")
+                password = os.getenv("ARANGO_PASSWORD", "")
                 db_name = os.getenv("ARANGO_DB", "code_modernisation")
                 
                 print(f"Attempting to connect to ArangoDB at {host}:{port} (attempt {attempt + 1}/{max_retries})")
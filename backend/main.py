@@ -1,14 +1,31 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 import os
 import shutil
 import uuid
 import zipfile
 from typing import List, Optional
 import json
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 
+# Per-file parser logging is at DEBUG level; keep it off by default. Records are handed to a
+# queue and written to stderr by a listener thread, so request handlers never block on log I/O
+_log_queue = queue.SimpleQueue()
+_stderr_handler = logging.StreamHandler()
+_stderr_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_queue_handler = QueueHandler(_log_queue)
+# Only the message is merged before queueing; the listener's handler applies the real format
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener = QueueListener(_log_queue, _stderr_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 # Performance configuration
 MAX_UPLOAD_FILE_SIZE_MB = 100  # Maximum file size to upload (MB)
 MAX_UPLOAD_FILES = 10000  # Maximum number of files to upload
@@ -24,7 +41,9 @@ from models.schemas import (
     ConversionRequest,
     ProjectResponse,
     ChatResponse,
-    ConversionResponse
+    ConversionResponse,
+    ConvertedFile,
+    FrameworkOptions
 )
 from models.framework_config import get_frameworks_for_language, is_valid_framework
 
@@ -42,8 +61,9 @@ app.add_middleware(
 # Initialize services
 db_client = ArangoDBClient()
 ast_parser = ASTParser()
-code_converter = CodeConverter()
 genai_service = GenAIService()
+# The converter shares the app's GenAI service: one client, connection pool and response cache
+code_converter = CodeConverter(genai_service)
 
 @app.on_event("startup")
 async def startup_event():
@@ -82,11 +102,44 @@ async def startup_event():
     
     print("Server startup complete!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled connections on shutdown"""
+    await code_converter.close()
+    await genai_service.close()
+
+async def _read_string_fields(request: Request, *fields: str) -> dict:
+    """Read a JSON body and check the given fields are strings, without Pydantic"""
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Request body must be valid JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON object")
+    for field in fields:
+        if not isinstance(body.get(field), str):
+            raise HTTPException(status_code=422, detail=f"Field '{field}' must be a string")
+    return body
+
+def _json_body_schema(model) -> dict:
+    """OpenAPI requestBody for endpoints that validate their JSON body by hand"""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}}
+        }
+    }
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
     return {"message": "Code Modernization Tool API", "status": "running"}
 
+@app.get("/health")
+async def health():
+    """Health check including the AI service connection"""
+    return {"status": "running", "genai": await genai_service.healthcheck()}
+
 @app.post("/api/upload")
 async def upload_project(
     file: UploadFile = File(...),
@@ -220,7 +273,8 @@ async def upload_project(
         
         print(f"Project {project_id} uploaded and extracted successfully with {len(extracted_files)} files")
         
-        return ProjectResponse(
+        # Built from trusted values; skip re-validating the (possibly large) file list
+        return ProjectResponse.model_construct(
             project_id=project_id,
             project_name=project_data["project_name"],
             source_language=source_language,
@@ -238,11 +292,12 @@ async def upload_project(
         print(f"Upload failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
-@app.post("/api/parse")
-async def parse_project(request: ParseRequest):
+@app.post("/api/parse", openapi_extra=_json_body_schema(ParseRequest))
+async def parse_project(request: Request):
     """Parse uploaded project files"""
+    body = await _read_string_fields(request, "project_id")
     try:
-        project_id = request.project_id
+        project_id = body["project_id"]
         print(f"Starting parse for project: {project_id}")
         
         # Get project data
@@ -300,12 +355,13 @@ async def parse_project(request: ParseRequest):
         print(f"Parse endpoint error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Parse failed: {str(e)}")
 
-@app.post("/api/chat", response_model=ChatResponse)
-async def chat_with_codebase(chat_request: ChatRequest):
+@app.post("/api/chat", response_model=ChatResponse, openapi_extra=_json_body_schema(ChatRequest))
+async def chat_with_codebase(request: Request):
     """Chat with AI about the codebase"""
+    body = await _read_string_fields(request, "project_id", "question")
     try:
-        project_id = chat_request.project_id
-        question = chat_request.question
+        project_id = body["project_id"]
+        question = body["question"]
         
         # Get project and AST data
         project = await db_client.get_project(project_id)
@@ -321,10 +377,12 @@ async def chat_with_codebase(chat_request: ChatRequest):
             raise HTTPException(status_code=404, detail="Project not parsed yet")
         
         # Generate AI response using GenAI
+        # Every question about a project starts with the same context, so the project is the session
         response = await genai_service.chat_about_codebase(
             question, 
             ast_data, 
-            project["source_language"]
+            project["source_language"],
+            session_id=project_id
         )
         
         return ChatResponse(
@@ -336,6 +394,33 @@ async def chat_with_codebase(chat_request: ChatRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
 
+@app.post("/api/chat/stream", openapi_extra=_json_body_schema(ChatRequest))
+async def chat_with_codebase_stream(request: Request):
+    """Chat with AI about the codebase, streaming the answer as plain text while it is generated"""
+    body = await _read_string_fields(request, "project_id", "question")
+    project_id = body["project_id"]
+    
+    # Validate up front so errors are still reported as HTTP status codes
+    try:
+        project = await db_client.get_project(project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        
+        ast_data = await db_client.get_ast_data(project_id)
+        if not ast_data:
+            raise HTTPException(status_code=404, detail="Project not parsed yet")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+    
+    return StreamingResponse(
+        genai_service.stream_chat_about_codebase(
+            body["question"], ast_data, project["source_language"], session_id=project_id
+        ),
+        media_type="text/plain; charset=utf-8"
+    )
+
 @app.post("/api/convert", response_model=ConversionResponse)
 async def convert_code(conversion_request: ConversionRequest):
     """Convert code to target language"""
@@ -382,19 +467,58 @@ async def convert_code(conversion_request: ConversionRequest):
             dependencies
         )
         
-        return ConversionResponse(
+        return ConversionResponse.model_construct(
             project_id=project_id,
             target_language=target_language,
             target_framework=target_framework,
             output_directory=output_dir,
             message="Code converted successfully",
-            converted_files=converted_code["converted_files"],
+            converted_files=[
+                ConvertedFile.model_construct(**file_data)
+                for file_data in converted_code["converted_files"]
+            ],
             dependencies=dependencies
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Conversion failed: {str(e)}")
 
+@app.post("/api/convert/stream")
+async def convert_code_stream(conversion_request: ConversionRequest):
+    """Convert code to target language, streaming each converted file as an NDJSON line"""
+    project_id = conversion_request.project_id
+    target_language = conversion_request.target_language
+    target_framework = conversion_request.target_framework
+    
+    # Validate up front so errors are still reported as HTTP status codes
+    project = await db_client.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    if target_framework and not is_valid_framework(target_language, target_framework):
+        raise HTTPException(status_code=400, detail=f"Invalid framework '{target_framework}' for language '{target_language}'")
+    
+    ast_data = await db_client.get_ast_data(project_id)
+    if not ast_data:
+        raise HTTPException(status_code=404, detail="Project not parsed yet")
+    
+    async def converted_file_lines():
+        try:
+            async for file_data in code_converter.stream_converted_code(
+                ast_data,
+                f"converted/{project_id}",
+                project["source_language"],
+                target_language,
+                project.get("source_framework"),
+                target_framework
+            ):
+                yield ConvertedFile.model_construct(**file_data).model_dump_json() + "\n"
+        except Exception as e:
+            print(f"Streaming conversion failed: {str(e)}")
+            yield json.dumps({"error": f"Conversion failed: {str(e)}"}) + "\n"
+    
+    return StreamingResponse(converted_file_lines(), media_type="application/x-ndjson")
+
 @app.get("/api/download/{project_id}")
 async def download_converted_code(project_id: str):
     """Download converted code as a zip file"""
@@ -435,8 +559,9 @@ async def list_projects():
     """List all projects"""
     try:
         projects = await db_client.list_projects()
+        # Records come from our own database; response_model still checks the output
         return [
-            ProjectResponse(
+            ProjectResponse.model_construct(
                 project_id=project["project_id"],
                 project_name=project["project_name"],
                 status=project["status"],
@@ -461,7 +586,7 @@ async def get_project(project_id: str):
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        return ProjectResponse(
+        return ProjectResponse.model_construct(
             project_id=project["project_id"],
             project_name=project["project_name"],
             status=project["status"],
@@ -474,15 +599,12 @@ async def get_project(project_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get project: {str(e)}")
 
-@app.get("/api/frameworks/{language}")
+@app.get("/api/frameworks/{language}", response_model=FrameworkOptions)
 async def get_frameworks(language: str):
     """Get available frameworks for a specific language"""
     try:
         frameworks = get_frameworks_for_language(language)
-        return {
-            "language": language,
-            "frameworks": frameworks
-        }
+        return FrameworkOptions.model_construct(language=language, frameworks=frameworks)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get frameworks: {str(e)}")
 
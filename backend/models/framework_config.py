@@ -2,6 +2,16 @@
 Framework configuration for different programming languages
 """
 
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Tuple
+
+@dataclass(frozen=True, slots=True)
+class FrameworkEntry:
+    """Immutable framework option shown to the user"""
+    name: str
+    label: str
+    description: str
+
 FRAMEWORK_CONFIG = {
     "java": [
         {"name": "spring", "label": "Spring Framework", "description": "Enterprise Java framework"},
@@ -109,9 +119,20 @@ FRAMEWORK_CONFIG = {
     ]
 }
 
-def get_frameworks_for_language(language: str) -> list:
+# Built once at import so metadata lookups never allocate per request
+FRAMEWORKS: Dict[str, Tuple[FrameworkEntry, ...]] = {
+    language: tuple(FrameworkEntry(**framework) for framework in frameworks)
+    for language, frameworks in FRAMEWORK_CONFIG.items()
+}
+
+FRAMEWORK_NAMES: Dict[str, FrozenSet[str]] = {
+    language: frozenset(entry.name for entry in entries)
+    for language, entries in FRAMEWORKS.items()
+}
+
+def get_frameworks_for_language(language: str) -> Tuple[FrameworkEntry, ...]:
     """Get available frameworks for a specific language"""
-    return FRAMEWORK_CONFIG.get(language.lower(), [])
+    return FRAMEWORKS.get(language.lower(), ())
 
 def get_all_frameworks() -> dict:
     """Get all framework configurations"""
@@ -119,13 +140,11 @@ def get_all_frameworks() -> dict:
 
 def is_valid_framework(language: str, framework: str) -> bool:
     """Check if a framework is valid for a given language"""
-    frameworks = get_frameworks_for_language(language)
-    return any(f["name"] == framework for f in frameworks)
+    return framework in FRAMEWORK_NAMES.get(language.lower(), frozenset())
 
 def get_framework_label(language: str, framework: str) -> str:
     """Get the display label for a framework"""
-    frameworks = get_frameworks_for_language(language)
-    for f in frameworks:
-        if f["name"] == framework:
-            return f["label"]
-    return framework 
\ No newline at end of file
+    for entry in get_frameworks_for_language(language):
+        if entry.name == framework:
+            return entry.label
+    return framework 
@@ -1,58 +1,89 @@
+from __future__ import annotations
+
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic.json_schema import DEFAULT_REF_TEMPLATE, GenerateJsonSchema, JsonSchemaMode
+from typing import List, Optional, Dict, Any, Tuple, Literal
+from models.framework_config import FrameworkEntry
+
+_SCHEMA_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
+class CachedSchemaModel(BaseModel):
+    """Base model that memoizes its JSON schema (treat the result as read-only)"""
 
-class ProjectUpload(BaseModel):
+    @classmethod
+    def model_json_schema(
+        cls,
+        by_alias: bool = True,
+        ref_template: str = DEFAULT_REF_TEMPLATE,
+        schema_generator: type[GenerateJsonSchema] = GenerateJsonSchema,
+        mode: JsonSchemaMode = 'validation',
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        key = (cls, by_alias, ref_template, schema_generator, mode, tuple(sorted(kwargs.items())))
+        schema = _SCHEMA_CACHE.get(key)
+        if schema is None:
+            schema = super().model_json_schema(by_alias, ref_template, schema_generator, mode, **kwargs)
+            _SCHEMA_CACHE[key] = schema
+        return schema
+
+class ProjectUpload(CachedSchemaModel):
     project_name: str = Field(..., description="Name of the project")
     source_language: str = Field(..., description="Source programming language")
     source_framework: Optional[str] = Field(None, description="Source framework (e.g., Spring, Django, React)")
     description: Optional[str] = Field(None, description="Project description")
 
-class ParseRequest(BaseModel):
+class ParseRequest(CachedSchemaModel):
     project_id: str = Field(..., description="ID of the project to parse")
 
-class ChatRequest(BaseModel):
+class ChatRequest(CachedSchemaModel):
     project_id: str = Field(..., description="ID of the project")
     question: str = Field(..., description="Question about the codebase")
 
-class ConversionRequest(BaseModel):
+class ConversionRequest(CachedSchemaModel):
     project_id: str = Field(..., description="ID of the project to convert")
     target_language: str = Field(..., description="Target programming language")
     target_framework: Optional[str] = Field(None, description="Target framework (e.g., Spring, Django, React)")
 
-class ProjectResponse(BaseModel):
+class ProjectResponse(CachedSchemaModel):
     project_id: str = Field(..., description="Unique project identifier")
     project_name: str = Field(..., description="Name of the project")
     status: str = Field(..., description="Current status of the project")
     message: str = Field(..., description="Response message")
-    source_language: Optional[str] = Field(None, description="Source programming language")
+    source_language: str = Field(..., description="Source programming language")
     source_framework: Optional[str] = Field(None, description="Source framework")
-    description: Optional[str] = Field(None, description="Project description")
-    files: Optional[List[str]] = Field(None, description="List of uploaded files")
+    description: str = Field(..., description="Project description")
+    files: List[str] = Field(..., description="List of uploaded files")
     created_at: Optional[str] = Field(None, description="Project creation timestamp")
 
-class ChatResponse(BaseModel):
+class ChatResponse(CachedSchemaModel):
     question: str = Field(..., description="User's question")
     answer: str = Field(..., description="AI-generated answer")
     project_id: str = Field(..., description="Project identifier")
 
-class ConversionResponse(BaseModel):
+class ConvertedFile(CachedSchemaModel):
+    filename: str = Field(..., description="Path of the converted file in the output project")
+    content: str = Field(..., description="Converted source code")
+    dependencies: Dict[str, Any] = Field(default_factory=dict, description="Dependencies required by this file")
+    notes: str = Field("", description="Conversion notes for this file")
+
+class ConversionResponse(CachedSchemaModel):
     project_id: str = Field(..., description="Project identifier")
     target_language: str = Field(..., description="Target programming language")
     target_framework: Optional[str] = Field(None, description="Target framework")
     output_directory: str = Field(..., description="Directory containing converted code")
     message: str = Field(..., description="Conversion status message")
-    converted_files: Optional[List[Dict[str, Any]]] = Field(None, description="List of converted files with filename, content, dependencies, and notes")
-    dependencies: Optional[Dict[str, Any]] = Field(None, description="Dependencies for target language")
+    converted_files: List[ConvertedFile] = Field(..., description="List of converted files with filename, content, dependencies, and notes")
+    dependencies: Dict[str, Any] = Field(..., description="Dependencies for target language")
 
-class ASTNode(BaseModel):
+class ASTNode(CachedSchemaModel):
     node_type: str = Field(..., description="Type of AST node")
     value: Optional[str] = Field(None, description="Value of the node")
-    children: List['ASTNode'] = Field(default_factory=list, description="Child nodes")
+    children: List[ASTNode] = Field(default_factory=list, description="Child nodes")
     line_number: Optional[int] = Field(None, description="Line number in source")
     column: Optional[int] = Field(None, description="Column number in source")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
-class ASTData(BaseModel):
+class ASTData(CachedSchemaModel):
     file_path: str = Field(..., description="Path to the source file")
     language: str = Field(..., description="Programming language")
     root_node: ASTNode = Field(..., description="Root AST node")
@@ -60,16 +91,35 @@ class ASTData(BaseModel):
     functions: List[Dict[str, Any]] = Field(default_factory=list, description="Function definitions")
     classes: List[Dict[str, Any]] = Field(default_factory=list, description="Class definitions")
     variables: List[Dict[str, Any]] = Field(default_factory=list, description="Variable declarations")
+    cache_key: Optional[str] = Field(None, description="Content hash used as the AST cache key")
 
-class ParsedProject(BaseModel):
+class ParsedProject(CachedSchemaModel):
     project_id: str = Field(..., description="Project identifier")
     ast_data: List[ASTData] = Field(..., description="AST data for all files")
     summary: Dict[str, Any] = Field(..., description="Project summary statistics")
 
+class CodebaseAnalysis(CachedSchemaModel):
+    language: str = Field(..., description="The programming language")
+    total_files: int = Field(..., description="Number of files analyzed")
+    structure: str = Field(..., description="Brief description of code structure and architecture")
+    complexity: Literal["Low", "Medium", "High"] = Field(..., description="Assessment of code complexity")
+    suggestions: List[str] = Field(default_factory=list, description="Improvement suggestions")
+    patterns: List[str] = Field(default_factory=list, description="Common patterns found in the code")
+
+class ModernizationPlan(CachedSchemaModel):
+    source_language: str = Field(..., description="Original language")
+    target_language: str = Field(..., description="Target language")
+    modernization_plan: List[str] = Field(..., description="Step-by-step plan for conversion")
+    estimated_effort: Literal["Low", "Medium", "High"] = Field(..., description="Effort assessment")
+    key_changes: List[str] = Field(default_factory=list, description="Major changes needed")
+    dependencies: List[str] = Field(default_factory=list, description="New dependencies required")
+    risks: List[str] = Field(default_factory=list, description="Potential risks and challenges")
+
 # Framework definitions for different languages
-class FrameworkOptions(BaseModel):
+class FrameworkOptions(CachedSchemaModel):
     language: str = Field(..., description="Programming language")
-    frameworks: List[Dict[str, str]] = Field(..., description="List of available frameworks with name and description")
+    frameworks: Tuple[FrameworkEntry, ...] = Field(..., description="List of available frameworks with name and description")
 
-# Update forward references
-ASTNode.model_rebuild() 
\ No newline at end of file
+# Resolve the self-referencing ASTNode annotation once, with an explicit namespace
+if not getattr(ASTNode, '__pydantic_complete__', False):
+    ASTNode.model_rebuild(_types_namespace={'ASTNode': ASTNode})
@@ -0,0 +1,136 @@
+import os
+import logging
+import hashlib
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from parsers import json_codec
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+logger = logging.getLogger(__name__)
+
+class ASTCache:
+    """Content-addressed on-disk cache of parsed AST data"""
+
+    # Bump whenever the parser output format changes so stale entries are ignored
+    VERSION = 12
+
+    # Stale stat index entries are pruned at most once per process
+    _stat_index_pruned = False
+
+    def __init__(self, cache_dir: str, memory_entries: int = 0):
+        self.cache_dir = os.path.join(cache_dir, f"v{self.VERSION}")
+        self.stat_dir = os.path.join(self.cache_dir, "stat")
+        # Optional in-process LRU of decoded entries in front of the disk cache
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+
+    @staticmethod
+    def compute_key(data: bytes) -> str:
+        """Compute the cache key for raw source file bytes"""
+        if blake3 is not None:
+            return blake3.blake3(data).hexdigest()
+        return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+    def _entry_path(self, cache_key: str, language: str) -> str:
+        """Get the on-disk location of a cache entry"""
+        return os.path.join(self.cache_dir, language, f"{cache_key}.json")
+
+    def _stat_entry_path(self, file_path: str, stat_result: os.stat_result) -> str:
+        """Get the stat index location for a file's (path, mtime, size)"""
+        stat_id = f"{os.path.abspath(file_path)}:{stat_result.st_mtime_ns}:{stat_result.st_size}"
+        return os.path.join(self.stat_dir, f"{hashlib.blake2b(stat_id.encode('utf-8'), digest_size=16).hexdigest()}.json")
+
+    def _read_json(self, entry_path: str) -> Optional[Any]:
+        """Load a JSON cache file, or None if it is missing or unreadable"""
+        try:
+            with open(entry_path, 'rb') as f:
+                return json_codec.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable AST cache entry %s: %s", entry_path, e)
+            return None
+
+    def _write_json(self, entry_path: str, data: Any):
+        """Write a JSON cache file atomically so concurrent readers never see partial entries"""
+        entry_dir = os.path.dirname(entry_path)
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=entry_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(json_codec.dumps(data))
+                os.replace(tmp_path, entry_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Failed to write AST cache entry %s: %s", entry_path, e)
+
+    def _remember(self, memory_key: tuple, ast_data: Dict[str, Any]):
+        """Keep an entry in the in-process LRU, evicting the least recently used"""
+        self._memory[memory_key] = ast_data
+        self._memory.move_to_end(memory_key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, cache_key: str, language: str) -> Optional[Dict[str, Any]]:
+        """Load cached AST data, or None on a cache miss"""
+        memory_key = (cache_key, language)
+        if self.memory_entries:
+            ast_data = self._memory.get(memory_key)
+            if ast_data is not None:
+                self._memory.move_to_end(memory_key)
+                # Callers set per-file fields on what they get back, so each hit gets its own dict
+                return dict(ast_data)
+        ast_data = self._read_json(self._entry_path(cache_key, language))
+        if self.memory_entries and isinstance(ast_data, dict):
+            self._remember(memory_key, dict(ast_data))
+        return ast_data
+
+    def put(self, cache_key: str, language: str, ast_data: Dict[str, Any]):
+        """Store AST data for the given content hash"""
+        self._write_json(self._entry_path(cache_key, language), ast_data)
+        if self.memory_entries:
+            self._remember((cache_key, language), dict(ast_data))
+
+    def clear_memory(self):
+        """Drop the in-process LRU; entries on disk are kept"""
+        self._memory.clear()
+
+    def get_key_for_stat(self, file_path: str, stat_result: os.stat_result) -> Optional[str]:
+        """Look up the content hash recorded for an unchanged file, without reading it"""
+        entry = self._read_json(self._stat_entry_path(file_path, stat_result))
+        return entry.get("cache_key") if isinstance(entry, dict) else None
+
+    def put_key_for_stat(self, file_path: str, stat_result: os.stat_result, cache_key: str):
+        """Record the content hash of a file at its current (path, mtime, size)"""
+        self._write_json(self._stat_entry_path(file_path, stat_result), {
+            "path": os.path.abspath(file_path),
+            "cache_key": cache_key
+        })
+
+    def prune_stat_index(self):
+        """Drop stat index entries for files that no longer exist (once per process)"""
+        if ASTCache._stat_index_pruned:
+            return
+        ASTCache._stat_index_pruned = True
+        try:
+            entry_names = os.listdir(self.stat_dir)
+        except FileNotFoundError:
+            return
+        for entry_name in entry_names:
+            if not entry_name.endswith(".json"):
+                continue
+            entry_path = os.path.join(self.stat_dir, entry_name)
+            entry = self._read_json(entry_path)
+            if not isinstance(entry, dict) or not os.path.exists(entry.get("path", "")):
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    pass
@@ -1,10 +1,61 @@
 import os
+import sys
 import ast
 import json
 import re
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+import fnmatch
 import gc
+import mmap
+import asyncio
+import logging
+from logging.handlers import QueueHandler
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator, Tuple, Union
+from bisect import bisect_right
+from itertools import accumulate
+from operator import itemgetter
+from pathlib import Path
+from contextlib import contextmanager
+import tempfile
+from parsers.ast_cache import ASTCache
+from parsers import json_codec
+from parsers.code_span import CodeSpan
+from parsers.regex_language_specs import REGEX_LANGUAGE_SPECS
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+logger = logging.getLogger(__name__)
+
+# True on free-threaded (no-GIL) CPython builds, where threads can parse in parallel
+FREE_THREADED = hasattr(sys, '_is_gil_enabled') and not sys._is_gil_enabled()
+
+@contextmanager
+def _gc_paused():
+    """Suspend cyclic garbage collection while building large acyclic containers"""
+    # Parsed trees are plain dicts/lists with no reference cycles, so reference counting frees
+    # them anyway; left on, the collector rescans every result already held by the caller.
+    # The switch is process-wide, so free-threaded builds parsing on several threads leave it alone.
+    if FREE_THREADED:
+        yield
+        return
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def iter_ast_records(jsonl_path: str) -> Iterator[Dict[str, Any]]:
+    """Iterate the per-file AST records written by ASTParser.parse_project_to_jsonl"""
+    with open(jsonl_path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield json_codec.loads(line)
 
 class ASTParser:
     """AST Parser for multiple programming languages"""
@@ -13,9 +64,205 @@ class ASTParser:
     MAX_FILE_SIZE_MB = 10  # Maximum file size to parse (MB)
     MAX_FILES_TO_PARSE = 5000  # Maximum number of files to parse
     BATCH_SIZE = 100  # Number of files to process in each batch
+    PARSE_WORKERS = os.cpu_count() or 1  # Worker processes used by parse_project
+    ENABLE_AST_CACHE = True  # Reuse parsed ASTs for unchanged source files
+    AST_CACHE_DIR = os.path.join(".cache", "ast")  # On-disk AST cache location
+    AST_MEMORY_CACHE_ENTRIES = 0  # Parsed ASTs also kept in memory by content hash (0 = off; opt in for re-parse-heavy runs)
+    BINARY_SNIFF_BYTES = 8192  # Leading bytes checked for NUL to reject binary files
+    MMAP_MIN_BYTES = 1024 * 1024  # Pool workers memory-map files at least this large
+    OFFLOAD_MIN_CHARS = 64 * 1024  # Smaller sources parse in-process; shipping them to a worker costs more
+    
+    # Files to skip for performance ('*.ext' = suffix, anything else = path substring)
+    SKIP_PATTERNS = [
+        'node_modules', '.git', '.svn', '.hg', '.bzr',
+        '__pycache__', '.pytest_cache', '.mypy_cache',
+        'target', 'build', 'dist', 'out', 'bin',
+        '.DS_Store', 'Thumbs.db', '.idea', '.vscode',
+        '*.log', '*.tmp', '*.temp', '*.bak', '*.backup',
+        '*.min.js', '*.min.css', '*.map',
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.bmp', '*.ico',
+        '*.mp3', '*.mp4', '*.avi', '*.mov', '*.wmv',
+        '*.zip', '*.tar', '*.gz', '*.rar', '*.7z',
+        '*.pdf', '*.doc', '*.docx', '*.xls', '*.xlsx',
+        '*.ppt', '*.pptx', '*.odt', '*.ods', '*.odp'
+    ]
+    
+    # Java declaration lines are classified by prefix and keyword (see _classify_java_line);
+    # the regexes below only run on lines that already look like a declaration
+    _JAVA_LINE_PREFIXES = ('import ', 'package ', 'public', 'private', 'protected', 'static', 'final', 'abstract', 'class')
+    # Lines that can declare something, found without stripping every line. Scan '\n' + content.
+    _JAVA_LINE_RE = re.compile(r'\n[^\S\n]*+(?:' + '|'.join(_JAVA_LINE_PREFIXES) + ')')
+    _JAVA_MODIFIERS = ('public', 'private', 'protected', 'static', 'final', 'abstract')
+    _JAVA_METHOD_MODIFIERS = frozenset(_JAVA_MODIFIERS)
+    _JAVA_VISIBILITY_MODIFIERS = frozenset(('public', 'private', 'protected'))
+    _JAVA_VARIABLE_MODIFIERS = frozenset(('public', 'private', 'protected', 'static', 'final'))
+    _JAVA_CLASS_MODIFIERS = ('public', 'abstract', 'final')
+    _JAVA_IDENTIFIER_RE = re.compile(r'\w+')
+    _JAVA_METHOD_NAME_RE = re.compile(r'(\w+)\s*\([^)]*\)')
+    _JAVA_VAR_RE = re.compile(r'(\w+)\s+(\w+)')
+    
+    # Top-level Python statements for the symbols-only fast path
+    _PYTHON_SYMBOL_RE = re.compile(
+        r'^(?:from[ \t]+(?P<from_module>[\w.]+)[ \t]+import[ \t]+(?P<from_names>[^\n;]+)'
+        r'|import[ \t]+(?P<import>[^\n;]+)'
+        r'|def[ \t]+(?P<function>\w+)'
+        r'|class[ \t]+(?P<class>\w+)'
+        r'|(?P<variable>\w+)[ \t]*=(?!=))',
+        re.MULTILINE
+    )
+    
+    # Line patterns of the COBOL, CSS, XML and Makefile parsers
+    _COBOL_DATA_ITEM_RE = re.compile(r'^\d{2}\s+\w+')
+    _COBOL_LEVEL_RE = re.compile(r'^\d{2}\s+')
+    _COBOL_BLOCK_END_PREFIXES = ('DIVISION', 'SECTION', 'PROCEDURE', 'DATA')
+    _CSS_SELECTOR_RE = re.compile(r'\s*([.#]?\w+)')
+    _HTML_TAG_RE = re.compile(r'<(?:script|style|link|meta)')
+    _XML_TAG_NAME_RE = re.compile(r'<(\w+)')
+    # XML lines are matched over the whole content, anchored on the newline before each line
+    # (scan '\n' + content) and dispatched on lastgroup; declaration/doctype lines are kept verbatim
+    _XML_LINE_RE = re.compile(
+        r'\n[^\S\n]*(?:(?P<declaration><\?xml.*)|(?P<doctype><!DOCTYPE.*)'
+        r'|(?P<element><(?:(?P<name>\w+)|[^/!\s]|(?=[^\S\n].*\S)).*))'
+    )
+    _XML_DECLARATIONS = {
+        "declaration": "XMLDeclaration",
+        "doctype": "DOCTYPEDeclaration"
+    }
+    # Candidate statement lines: a six-letter word (str.upper() also maps 'ı' to I and 'ſ' to S),
+    # a space and more text; _SQL_STATEMENTS then checks the word. Scan '\n' + content.
+    _SQL_STATEMENT_RE = re.compile(r'\n[^\S\n]*([CcIiSsUuDdıſ][A-Za-zıſ]{5}) (?=.*\S)')
+    _SQL_STATEMENTS = {
+        "CREATE": "CreateStatement",
+        "INSERT": "InsertStatement",
+        "SELECT": "SelectStatement",
+        "UPDATE": "UpdateStatement",
+        "DELETE": "DeleteStatement"
+    }
+    # Names of Markdown headers by level, shared by every header instead of formatted per line
+    _MARKDOWN_HEADER_NAMES = tuple(sys.intern(f"header_{level}") for level in range(7))
+    # Dockerfile instructions kept as code: keyword -> (section, entry type, tree node type)
+    _DOCKERFILE_INSTRUCTIONS = {
+        "RUN": ("functions", "run", "RUNInstruction"),
+        "COPY": ("functions", "copy", "COPYInstruction"),
+        "ENV": ("variables", "environment", "ENVInstruction")
+    }
+    # CMake commands kept as code: command name -> (section, entry type, tree node type)
+    _CMAKE_COMMANDS = {
+        "project": ("functions", "project", "CMakeProject"),
+        "add_executable": ("functions", "add_executable", "CMakeAddExecutable"),
+        "set": ("variables", "cmake_set", "CMakeSet")
+    }
+    # A stripped Makefile line is a target ('name:') or else an assignment, named after the first
+    # word directly before an '='; the lookahead keeps lines without one from backtracking
+    _MAKEFILE_LINE_RE = re.compile(r'(?P<target>\w+):|(?=.*=).*?(?P<variable>\w+)\s*=')
+    
+    # Language-specific parser methods; other languages use _parse_generic_file
+    LANGUAGE_PARSERS = {
+        'python': '_parse_python_file',
+        'java': '_parse_java_file',
+        'javascript': '_parse_javascript_file',
+        'typescript': '_parse_typescript_file',
+        'cobol': '_parse_cobol_file',
+        'cpp': '_parse_cpp_file',
+        'c': '_parse_cpp_file',
+        'go': '_parse_go_file',
+        'rust': '_parse_rust_file',
+        'php': '_parse_php_file',
+        'ruby': '_parse_ruby_file',
+        'sql': '_parse_sql_file',
+        'html': '_parse_html_file',
+        'css': '_parse_css_file',
+        'xml': '_parse_xml_file',
+        'json': '_parse_json_file',
+        'yaml': '_parse_yaml_file',
+        'toml': '_parse_toml_file',
+        'ini': '_parse_ini_file',
+        'markdown': '_parse_markdown_file',
+        'dockerfile': '_parse_dockerfile',
+        'makefile': '_parse_makefile',
+        'cmake': '_parse_cmake_file'
+    }
+    
+    # Dependency/build files collected alongside a language's sources
+    DEPENDENCY_FILES = {
+        'python': ['requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile', 'poetry.lock', 'Pipfile.lock'],
+        'java': ['pom.xml', 'build.gradle', 'gradle.properties', 'gradle-wrapper.properties', 'settings.gradle'],
+        'javascript': ['package.json', 'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', '.npmrc', '.yarnrc'],
+        'typescript': ['package.json', 'package-lock.json', 'tsconfig.json', 'tslint.json', '.eslintrc'],
+        'go': ['go.mod', 'go.sum', 'go.work', 'go.work.sum'],
+        'rust': ['Cargo.toml', 'Cargo.lock', 'rust-toolchain.toml'],
+        'php': ['composer.json', 'composer.lock', 'phpunit.xml', '.phpunit.result.cache'],
+        'ruby': ['Gemfile', 'Gemfile.lock', 'Rakefile', '.ruby-version', '.ruby-gemset'],
+        'scala': ['build.sbt', 'project/build.properties', 'project/plugins.sbt'],
+        'kotlin': ['build.gradle.kts', 'gradle.properties', 'settings.gradle.kts'],
+        'swift': ['Package.swift', 'Cartfile', 'Cartfile.resolved'],
+        'dart': ['pubspec.yaml', 'pubspec.lock', 'analysis_options.yaml'],
+        'r': ['DESCRIPTION', 'NAMESPACE', '.Rprofile', '.Rhistory'],
+        'matlab': ['.matlabrc', 'startup.m'],
+        'fortran': ['Makefile', 'CMakeLists.txt'],
+        'pascal': ['Makefile', 'CMakeLists.txt'],
+        'ada': ['Makefile', 'CMakeLists.txt'],
+        'lisp': ['asd', 'asdf', 'quicklisp.lisp'],
+        'scheme': ['Makefile', 'CMakeLists.txt'],
+        'haskell': ['cabal.project', 'stack.yaml', 'package.yaml'],
+        'ocaml': ['dune', 'dune-project', 'opam'],
+        'fsharp': ['*.fsproj', 'paket.dependencies', 'paket.lock'],
+        'erlang': ['rebar.config', 'rebar.lock', 'relx.config'],
+        'elixir': ['mix.exs', 'mix.lock', 'rel/config.exs'],
+        'clojure': ['project.clj', 'deps.edn', 'shadow-cljs.edn'],
+        'groovy': ['build.gradle', 'gradle.properties'],
+        'perl': ['Makefile.PL', 'Build.PL', 'cpanfile'],
+        'bash': ['Makefile', 'CMakeLists.txt'],
+        'powershell': ['*.psd1', '*.psm1'],
+        'sql': ['*.sql', 'migration.sql'],
+        'html': ['*.html', '*.htm', '*.xhtml'],
+        'css': ['*.css', '*.scss', '*.sass', '*.less'],
+        'xml': ['*.xml', '*.xsd', '*.xsl'],
+        'json': ['*.json'],
+        'yaml': ['*.yml', '*.yaml'],
+        'toml': ['*.toml'],
+        'ini': ['*.ini', '*.cfg', '*.conf'],
+        'markdown': ['*.md', '*.markdown'],
+        'dockerfile': ['Dockerfile', '.dockerfile', 'docker-compose.yml', 'docker-compose.yaml'],
+        'makefile': ['Makefile', '*.mk', '*.make'],
+        'cmake': ['CMakeLists.txt', '*.cmake'],
+        'gradle': ['build.gradle', 'gradle.properties', 'settings.gradle'],
+        'maven': ['pom.xml', 'settings.xml'],
+        'npm': ['package.json', 'package-lock.json', '.npmrc'],
+        'pip': ['requirements.txt', 'setup.py', 'pyproject.toml'],
+        'cargo': ['Cargo.toml', 'Cargo.lock'],
+        'go_mod': ['go.mod', 'go.sum'],
+        'composer': ['composer.json', 'composer.lock'],
+        'gemfile': ['Gemfile', 'Gemfile.lock'],
+        'pubspec': ['pubspec.yaml', 'pubspec.lock'],
+        'cabal': ['*.cabal'],
+        'stack': ['stack.yaml'],
+        'mix': ['mix.exs', 'mix.lock'],
+        'rebar': ['rebar.config'],
+        'leiningen': ['project.clj'],
+        'sbt': ['build.sbt', 'project/build.properties'],
+        'gradle_wrapper': ['gradlew', 'gradlew.bat'],
+        'maven_wrapper': ['mvnw', 'mvnw.cmd'],
+        'npm_scripts': ['package.json'],
+        'pip_scripts': ['setup.py', 'pyproject.toml'],
+        'cargo_scripts': ['Cargo.toml'],
+        'go_scripts': ['go.mod'],
+        'composer_scripts': ['composer.json'],
+        'gem_scripts': ['Gemfile'],
+        'pub_scripts': ['pubspec.yaml'],
+        'cabal_scripts': ['*.cabal'],
+        'stack_scripts': ['stack.yaml'],
+        'mix_scripts': ['mix.exs'],
+        'rebar_scripts': ['rebar.config'],
+        'lein_scripts': ['project.clj'],
+        'sbt_scripts': ['build.sbt']
+    }
     
     def __init__(self):
         self.parsers = {}
+        self.ast_cache = ASTCache(self.AST_CACHE_DIR, self.AST_MEMORY_CACHE_ENTRIES) if self.ENABLE_AST_CACHE else None
+        self.async_reads = True
+        self.offload_parsing = True
         self.supported_languages = {
             'python': ['.py', '.pyw', '.pyi', '.pyx', '.pxd', '.pxi'],
             'java': ['.java', '.jav'],
@@ -93,14 +340,42 @@ class ASTParser:
             'sbt_scripts': ['build.sbt']
         }
         
+        # Bound parser methods, looked up once per file instead of walking an if/elif chain
+        self._language_parsers = {language: getattr(self, name) for language, name in self.LANGUAGE_PARSERS.items()}
+        
+        # Per-language project file patterns, filled lazily by _get_project_patterns
+        self._project_patterns = {}
+        
+        # Reverse lookups for language detection; the first language listing an entry wins
+        self._ext_to_lang = {}
+        self._name_to_lang = {}
+        for language, entries in self.supported_languages.items():
+            for entry in entries:
+                if entry.startswith('.'):
+                    self._ext_to_lang.setdefault(entry.lower(), language)
+                elif '/' not in entry:
+                    self._name_to_lang.setdefault(entry.lower(), language)
+        
+        # Split skip patterns once into a suffix tuple and a single substring regex
+        self._skip_suffixes = tuple(p[1:] for p in self.SKIP_PATTERNS if p.startswith('*.'))
+        self._skip_substrings_re = re.compile('|'.join(
+            re.escape(p[1:] if p.startswith('*') else p)
+            for p in self.SKIP_PATTERNS if not p.startswith('*.')
+        ))
+    
+    def clear_parse_cache(self):
+        """Forget parsed ASTs held in memory (the on-disk cache is kept)"""
+        if self.ast_cache is not None:
+            self.ast_cache.clear_memory()
+    
     async def initialize(self):
         """Initialize language parsers"""
         try:
             # Initialize tree-sitter parsers for different languages
             await self._setup_tree_sitter()
-            print("AST Parser initialized successfully")
+            logger.info("AST Parser initialized successfully")
         except Exception as e:
-            print(f"Failed to initialize AST Parser: {str(e)}")
+            logger.error("Failed to initialize AST Parser: %s", e)
             raise
     
     async def _setup_tree_sitter(self):
@@ -114,415 +389,378 @@ class ASTParser:
                 self.parsers[lang] = 'basic'
                 
         except Exception as e:
-            print(f"Failed to setup parsers: {str(e)}")
+            logger.error("Failed to setup parsers: %s", e)
             raise
     
-    async def parse_project(self, project_dir: str, source_language: str) -> List[Dict[str, Any]]:
+    async def parse_project(self, project_dir: str, source_language: str, mode: str = 'full') -> List[Dict[str, Any]]:
         """Parse all files in a project directory"""
+        ast_data = []
+        # Every result is kept here anyway, so files with identical content (generated or vendored
+        # copies) can share one source string, matched by their content hash
+        sources = {}
+        async for file_ast in self.iter_parse_project(project_dir, source_language, mode):
+            cache_key = file_ast.get("cache_key")
+            if cache_key is not None and "full_source_code" in file_ast:
+                file_ast["full_source_code"] = sources.setdefault(cache_key, file_ast["full_source_code"])
+            ast_data.append(file_ast)
+        logger.info("Total files parsed: %s", len(ast_data))
+        return ast_data
+    
+    async def parse_project_to_jsonl(self, project_dir: str, source_language: str, output_path: Optional[str] = None, mode: str = 'full') -> str:
+        """Parse all files in a project directory into a JSONL file (one record per file) and return its path"""
+        if output_path is None:
+            fd, output_path = tempfile.mkstemp(prefix="ast_data_", suffix=".jsonl")
+            os.close(fd)
+        
+        files_parsed = 0
+        with open(output_path, 'wb') as out:
+            async for file_ast in self.iter_parse_project(project_dir, source_language, mode):
+                out.write(json_codec.dumps(file_ast))
+                out.write(b'\n')
+                files_parsed += 1
+        
+        logger.info("Total files parsed: %s (written to %s)", files_parsed, output_path)
+        return output_path
+    
+    async def iter_parse_project(self, project_dir: str, source_language: str, mode: str = 'full') -> AsyncIterator[Dict[str, Any]]:
+        """Parse all files in a project directory, yielding each file's AST data as soon as its batch is done"""
         try:
-            ast_data = []
-            project_path = Path(project_dir)
+            logger.info("Parsing project: %s with language: %s", project_dir, source_language)
             
-            print(f"Parsing project: {project_dir} with language: {source_language}")
+            if self.ast_cache is not None:
+                self.ast_cache.prune_stat_index()
             
             # Get file extensions for the language
-            extensions = self.supported_languages.get(source_language.lower(), [])
-            print(f"Looking for extensions: {extensions}")
-            
-            # Find all relevant files including dependency files
-            all_files = []
-            
-            # Add specific dependency files for the language
-            dependency_files = self._get_dependency_files(source_language)
-            extensions.extend(dependency_files)
-            
-            # Define files to skip for performance
-            skip_patterns = [
-                'node_modules', '.git', '.svn', '.hg', '.bzr',
-                '__pycache__', '.pytest_cache', '.mypy_cache',
-                'target', 'build', 'dist', 'out', 'bin',
-                '.DS_Store', 'Thumbs.db', '.idea', '.vscode',
-                '*.log', '*.tmp', '*.temp', '*.bak', '*.backup',
-                '*.min.js', '*.min.css', '*.map',
-                '*.png', '*.jpg', '*.jpeg', '*.gif', '*.bmp', '*.ico',
-                '*.mp3', '*.mp4', '*.avi', '*.mov', '*.wmv',
-                '*.zip', '*.tar', '*.gz', '*.rar', '*.7z',
-                '*.pdf', '*.doc', '*.docx', '*.xls', '*.xlsx',
-                '*.ppt', '*.pptx', '*.odt', '*.ods', '*.odp'
-            ]
+            logger.debug("Looking for extensions: %s", self.supported_languages.get(source_language.lower(), []))
             
-            # Find all files with matching extensions
-            for ext in extensions:
-                print(f"Searching for files with extension/name: {ext}")
-                if ext.startswith('.'):
-                    # File extension
-                    for file_path in project_path.rglob(f"*{ext}"):
-                        if file_path.is_file() and not self._should_skip_file(file_path, skip_patterns):
-                            all_files.append(file_path)
-                else:
-                    # Specific filename
-                    for file_path in project_path.rglob(ext):
-                        if file_path.is_file() and not self._should_skip_file(file_path, skip_patterns):
-                            all_files.append(file_path)
+            # Extensions plus specific dependency files for the language
+            extensions = self._get_project_patterns(source_language)
             
-            # Remove duplicates and sort
-            all_files = sorted(list(set(all_files)))
+            # Find all files with matching extensions in a single directory walk
+            all_files = sorted(self._find_project_files(project_dir, extensions))
             
             # Limit the number of files to parse for performance
             if len(all_files) > self.MAX_FILES_TO_PARSE:
-                print(f"Warning: Found {len(all_files)} files, limiting to {self.MAX_FILES_TO_PARSE} for performance")
+                logger.warning("Found %s files, limiting to %s for performance", len(all_files), self.MAX_FILES_TO_PARSE)
                 all_files = all_files[:self.MAX_FILES_TO_PARSE]
             
-            print(f"Found {len(all_files)} files to parse")
+            logger.info("Found %s files to parse", len(all_files))
             
-            # Parse each file with progress tracking
+            # Parse each file, reporting progress roughly every 1% of files
             batch_size = self.BATCH_SIZE  # Process files in batches
+            progress_step = max(1, len(all_files) // 100)
             for i in range(0, len(all_files), batch_size):
                 batch = all_files[i:i + batch_size]
-                print(f"Processing batch {i//batch_size + 1}/{(len(all_files) + batch_size - 1)//batch_size}")
+                logger.debug("Processing batch %s/%s", i//batch_size + 1, (len(all_files) + batch_size - 1)//batch_size)
                 
-                for j, file_path in enumerate(batch, 1):
-                    if j % 50 == 0:
-                        print(f"Progress: {i + j}/{len(all_files)} files parsed")
+                batch_results = await self._parse_batch([str(file_path) for file_path in batch], source_language, mode)
+                
+                for j, (file_path, file_ast) in enumerate(zip(batch, batch_results), 1):
+                    if (i + j) % progress_step == 0:
+                        logger.info("Progress: %s/%s files parsed", i + j, len(all_files))
                     
-                    print(f"Parsing file: {file_path}")
-                    file_ast = await self.parse_file(str(file_path), source_language)
                     if file_ast:
-                        print(f"Successfully parsed: {file_path}")
-                        ast_data.append(file_ast)
+                        logger.debug("Successfully parsed: %s", file_path)
+                        yield file_ast
                     else:
-                        print(f"Failed to parse: {file_path}")
-                
-                # Clear some memory after each batch
-                gc.collect()
-            
-            print(f"Total files parsed: {len(ast_data)}")
-            return ast_data
+                        logger.debug("Failed to parse: %s", file_path)
             
         except Exception as e:
-            print(f"Failed to parse project {project_dir}: {str(e)}")
+            logger.error("Failed to parse project %s: %s", project_dir, e)
             raise
     
-    def _should_skip_file(self, file_path: Path, skip_patterns: List[str]) -> bool:
-        """Check if file should be skipped based on patterns"""
-        file_str = str(file_path)
+    def _find_project_files(self, project_dir: str, extensions: List[str]) -> List[Path]:
+        """Collect files matching the given extensions/names with one os.walk"""
+        classify = self._build_path_classifier(project_dir, extensions)
+        
+        found = []
+        for root, dirs, files in os.walk(project_dir):
+            # Directories whose path already contains a substring skip pattern can be pruned whole
+            dirs[:] = [d for d in dirs if not self._skip_substrings_re.search(os.path.join(root, d))]
+            
+            for name in files:
+                file_path = classify(root, name)
+                if file_path is not None and file_path.is_file():
+                    found.append(file_path)
         
-        for pattern in skip_patterns:
-            if pattern.startswith('*.'):
-                # File extension pattern
-                ext = pattern[1:]  # Remove the *
-                if file_str.endswith(ext):
-                    return True
-            elif pattern.startswith('*'):
-                # Wildcard pattern
-                if pattern[1:] in file_str:
-                    return True
+        return found
+    
+    def _build_path_classifier(self, project_dir: str, extensions: List[str]):
+        """Build a classify(root, name) -> Optional[Path] function over this walk's precomputed patterns"""
+        ext_suffixes = []
+        name_set = set()
+        name_globs = []
+        relative_paths = []
+        for ext in extensions:
+            if ext.startswith('.'):
+                ext_suffixes.append(ext)
+            elif '/' in ext:
+                relative_paths.append(ext)
+            elif '*' in ext or '?' in ext or '[' in ext:
+                if ext.startswith('*') and not any(c in ext[1:] for c in '*?['):
+                    # '*<literal>' needs no glob machinery: it is a plain suffix test
+                    ext_suffixes.append(ext[1:])
+                else:
+                    name_globs.append(ext)
             else:
-                # Direct path/name pattern
-                if pattern in file_str:
-                    return True
+                name_set.add(ext)
         
-        return False
+        # Same matching as glob('*<ext>'): any name ending with the extension
+        ext_suffixes = tuple(ext_suffixes)
+        name_set = frozenset(name_set)
+        glob_match = re.compile('|'.join(fnmatch.translate(g) for g in name_globs)).match if name_globs else None
+        # Only names that are the last component of a relative path are worth a relpath()
+        relative_names = frozenset(path.rsplit('/', 1)[1] for path in relative_paths)
+        relative_paths = tuple(relative_paths)
+        skip_suffixes = self._skip_suffixes
+        skip_search = self._skip_substrings_re.search
+        
+        def classify(root: str, name: str) -> Optional[Path]:
+            if not (name.endswith(ext_suffixes) or name in name_set
+                    or (glob_match is not None and glob_match(name) is not None)):
+                if name not in relative_names:
+                    return None
+                relative = Path(os.path.relpath(os.path.join(root, name), project_dir)).as_posix()
+                if not any(relative == path or relative.endswith('/' + path) for path in relative_paths):
+                    return None
+            file_path = Path(root, name)
+            file_str = str(file_path)
+            if file_str.endswith(skip_suffixes) or skip_search(file_str) is not None:
+                return None
+            return file_path
+        
+        return classify
+    
+    async def _parse_batch(self, file_paths: List[str], language: str, mode: str = 'full') -> List[Optional[Dict[str, Any]]]:
+        """Parse a batch of files in parallel across worker processes"""
+        if self.PARSE_WORKERS > 1 and len(file_paths) > 1 and not FREE_THREADED:
+            try:
+                loop = asyncio.get_running_loop()
+                pool = _get_process_pool(self.PARSE_WORKERS)
+                futures = [
+                    loop.run_in_executor(pool, _parse_file_worker, file_path, language, mode)
+                    for file_path in file_paths
+                ]
+                return await asyncio.gather(*futures)
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning("Process pool unavailable, parsing in-process: %s", e)
+                _reset_process_pool()
+        
+        # In-process: file reads are async, so later reads overlap earlier parses
+        # (and with no GIL, parses also overlap on the shared thread pool)
+        return await asyncio.gather(*(self.parse_file(file_path, language, mode) for file_path in file_paths))
+    
+    def _should_skip_file(self, file_path: Path) -> bool:
+        """Check if file should be skipped based on patterns"""
+        file_str = str(file_path)
+        return file_str.endswith(self._skip_suffixes) or self._skip_substrings_re.search(file_str) is not None
     
     def _get_dependency_files(self, language: str) -> List[str]:
         """Get dependency file names for a specific language"""
-        dependency_files = {
-            'python': ['requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile', 'poetry.lock', 'Pipfile.lock'],
-            'java': ['pom.xml', 'build.gradle', 'gradle.properties', 'gradle-wrapper.properties', 'settings.gradle'],
-            'javascript': ['package.json', 'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', '.npmrc', '.yarnrc'],
-            'typescript': ['package.json', 'package-lock.json', 'tsconfig.json', 'tslint.json', '.eslintrc'],
-            'go': ['go.mod', 'go.sum', 'go.work', 'go.work.sum'],
-            'rust': ['Cargo.toml', 'Cargo.lock', 'rust-toolchain.toml'],
-            'php': ['composer.json', 'composer.lock', 'phpunit.xml', '.phpunit.result.cache'],
-            'ruby': ['Gemfile', 'Gemfile.lock', 'Rakefile', '.ruby-version', '.ruby-gemset'],
-            'scala': ['build.sbt', 'project/build.properties', 'project/plugins.sbt'],
-            'kotlin': ['build.gradle.kts', 'gradle.properties', 'settings.gradle.kts'],
-            'swift': ['Package.swift', 'Cartfile', 'Cartfile.resolved'],
-            'dart': ['pubspec.yaml', 'pubspec.lock', 'analysis_options.yaml'],
-            'r': ['DESCRIPTION', 'NAMESPACE', '.Rprofile', '.Rhistory'],
-            'matlab': ['.matlabrc', 'startup.m'],
-            'fortran': ['Makefile', 'CMakeLists.txt'],
-            'pascal': ['Makefile', 'CMakeLists.txt'],
-            'ada': ['Makefile', 'CMakeLists.txt'],
-            'lisp': ['asd', 'asdf', 'quicklisp.lisp'],
-            'scheme': ['Makefile', 'CMakeLists.txt'],
-            'haskell': ['cabal.project', 'stack.yaml', 'package.yaml'],
-            'ocaml': ['dune', 'dune-project', 'opam'],
-            'fsharp': ['*.fsproj', 'paket.dependencies', 'paket.lock'],
-            'erlang': ['rebar.config', 'rebar.lock', 'relx.config'],
-            'elixir': ['mix.exs', 'mix.lock', 'rel/config.exs'],
-            'clojure': ['project.clj', 'deps.edn', 'shadow-cljs.edn'],
-            'groovy': ['build.gradle', 'gradle.properties'],
-            'perl': ['Makefile.PL', 'Build.PL', 'cpanfile'],
-            'bash': ['Makefile', 'CMakeLists.txt'],
-            'powershell': ['*.psd1', '*.psm1'],
-            'sql': ['*.sql', 'migration.sql'],
-            'html': ['*.html', '*.htm', '*.xhtml'],
-            'css': ['*.css', '*.scss', '*.sass', '*.less'],
-            'xml': ['*.xml', '*.xsd', '*.xsl'],
-            'json': ['*.json'],
-            'yaml': ['*.yml', '*.yaml'],
-            'toml': ['*.toml'],
-            'ini': ['*.ini', '*.cfg', '*.conf'],
-            'markdown': ['*.md', '*.markdown'],
-            'dockerfile': ['Dockerfile', '.dockerfile', 'docker-compose.yml', 'docker-compose.yaml'],
-            'makefile': ['Makefile', '*.mk', '*.make'],
-            'cmake': ['CMakeLists.txt', '*.cmake'],
-            'gradle': ['build.gradle', 'gradle.properties', 'settings.gradle'],
-            'maven': ['pom.xml', 'settings.xml'],
-            'npm': ['package.json', 'package-lock.json', '.npmrc'],
-            'pip': ['requirements.txt', 'setup.py', 'pyproject.toml'],
-            'cargo': ['Cargo.toml', 'Cargo.lock'],
-            'go_mod': ['go.mod', 'go.sum'],
-            'composer': ['composer.json', 'composer.lock'],
-            'gemfile': ['Gemfile', 'Gemfile.lock'],
-            'pubspec': ['pubspec.yaml', 'pubspec.lock'],
-            'cabal': ['*.cabal'],
-            'stack': ['stack.yaml'],
-            'mix': ['mix.exs', 'mix.lock'],
-            'rebar': ['rebar.config'],
-            'leiningen': ['project.clj'],
-            'sbt': ['build.sbt', 'project/build.properties'],
-            'gradle_wrapper': ['gradlew', 'gradlew.bat'],
-            'maven_wrapper': ['mvnw', 'mvnw.cmd'],
-            'npm_scripts': ['package.json'],
-            'pip_scripts': ['setup.py', 'pyproject.toml'],
-            'cargo_scripts': ['Cargo.toml'],
-            'go_scripts': ['go.mod'],
-            'composer_scripts': ['composer.json'],
-            'gem_scripts': ['Gemfile'],
-            'pub_scripts': ['pubspec.yaml'],
-            'cabal_scripts': ['*.cabal'],
-            'stack_scripts': ['stack.yaml'],
-            'mix_scripts': ['mix.exs'],
-            'rebar_scripts': ['rebar.config'],
-            'lein_scripts': ['project.clj'],
-            'sbt_scripts': ['build.sbt']
-        }
-        return dependency_files.get(language.lower(), [])
+        return self.DEPENDENCY_FILES.get(language.lower(), [])
+    
+    def _get_project_patterns(self, language: str) -> Tuple[str, ...]:
+        """Extensions plus dependency file patterns to collect for a language, computed once per language"""
+        language = language.lower()
+        patterns = self._project_patterns.get(language)
+        if patterns is None:
+            patterns = tuple(self.supported_languages.get(language, [])) + tuple(self._get_dependency_files(language))
+            self._project_patterns[language] = patterns
+        return patterns
     
-    async def parse_file(self, file_path: str, language: str) -> Optional[Dict[str, Any]]:
-        """Parse a single file and return AST data with line numbers"""
+    async def parse_file(self, file_path: str, language: str, mode: str = 'full') -> Optional[Dict[str, Any]]:
+        """Parse a single file and return AST data with line numbers ('symbols' mode: names and imports only)"""
         try:
             # Check file size - skip files larger than configured limit
-            file_size = os.path.getsize(file_path)
+            file_stat = os.stat(file_path)
+            file_size = file_stat.st_size
             max_size_bytes = self.MAX_FILE_SIZE_MB * 1024 * 1024
             if file_size > max_size_bytes:
-                print(f"Skipping large file: {file_path} ({file_size} bytes, limit: {self.MAX_FILE_SIZE_MB}MB)")
+                logger.info("Skipping large file: %s (%s bytes, limit: %sMB)", file_path, file_size, self.MAX_FILE_SIZE_MB)
                 return None
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             # Determine the actual language based on file extension
             actual_language = self._detect_language_from_file(file_path, language)
             
-            if actual_language == 'python':
-                return await self._parse_python_file(file_path, content)
-            elif actual_language == 'java':
-                return await self._parse_java_file(file_path, content)
-            elif actual_language == 'javascript':
-                return await self._parse_javascript_file(file_path, content)
-            elif actual_language == 'typescript':
-                return await self._parse_typescript_file(file_path, content)
-            elif actual_language == 'cobol':
-                return await self._parse_cobol_file(file_path, content)
-            elif actual_language in ['cpp', 'c']:
-                return await self._parse_cpp_file(file_path, content)
-            elif actual_language == 'go':
-                return await self._parse_go_file(file_path, content)
-            elif actual_language == 'rust':
-                return await self._parse_rust_file(file_path, content)
-            elif actual_language == 'php':
-                return await self._parse_php_file(file_path, content)
-            elif actual_language == 'ruby':
-                return await self._parse_ruby_file(file_path, content)
-            elif actual_language == 'sql':
-                return await self._parse_sql_file(file_path, content)
-            elif actual_language == 'html':
-                return await self._parse_html_file(file_path, content)
-            elif actual_language == 'css':
-                return await self._parse_css_file(file_path, content)
-            elif actual_language == 'xml':
-                return await self._parse_xml_file(file_path, content)
-            elif actual_language == 'json':
-                return await self._parse_json_file(file_path, content)
-            elif actual_language == 'yaml':
-                return await self._parse_yaml_file(file_path, content)
-            elif actual_language == 'toml':
-                return await self._parse_toml_file(file_path, content)
-            elif actual_language == 'ini':
-                return await self._parse_ini_file(file_path, content)
-            elif actual_language == 'markdown':
-                return await self._parse_markdown_file(file_path, content)
-            elif actual_language == 'dockerfile':
-                return await self._parse_dockerfile(file_path, content)
-            elif actual_language == 'makefile':
-                return await self._parse_makefile(file_path, content)
-            elif actual_language == 'cmake':
-                return await self._parse_cmake_file(file_path, content)
-            else:
-                # Generic parser for other file types
-                return await self._parse_generic_file(file_path, content, actual_language)
+            if mode == 'symbols':
+                return await self._parse_symbols(file_path, actual_language)
+            
+            # Unchanged file (same path, mtime and size): skip reading and hashing it
+            if self.ast_cache is not None:
+                known_key = self.ast_cache.get_key_for_stat(file_path, file_stat)
+                if known_key is not None:
+                    cached = self.ast_cache.get(known_key, actual_language)
+                    if cached is not None:
+                        cached["file_path"] = file_path
+                        return cached
+            
+            raw_content = await self._read_source(file_path, file_size)
+            try:
+                # Text sources never contain NUL bytes; reject binaries before hashing or decoding them
+                if raw_content.find(b'\x00', 0, self.BINARY_SNIFF_BYTES) != -1:
+                    logger.info("Skipping binary file: %s", file_path)
+                    return None
+                
+                # Reuse the cached AST when this exact source was parsed before
+                cache_key = None
+                if self.ast_cache is not None:
+                    cache_key = self.ast_cache.compute_key(raw_content)
+                    cached = self.ast_cache.get(cache_key, actual_language)
+                    if cached is not None:
+                        self.ast_cache.put_key_for_stat(file_path, file_stat, cache_key)
+                        cached["file_path"] = file_path
+                        return cached
+                
+                content = self._decode_source(raw_content)
+            finally:
+                if isinstance(raw_content, mmap.mmap):
+                    raw_content.close()
+            # Parsers only need the decoded text; without this the raw bytes would stay alive
+            # alongside it and the whole AST for the rest of the parse
+            del raw_content
+            
+            result = await self._parse_content_offloaded(file_path, content, actual_language)
+            
+            if result is not None and cache_key is not None:
+                result["cache_key"] = cache_key
+                self.ast_cache.put(cache_key, actual_language, result)
+                self.ast_cache.put_key_for_stat(file_path, file_stat, cache_key)
+            
+            return result
                 
         except Exception as e:
-            print(f"Failed to parse file {file_path}: {str(e)}")
+            logger.warning("Failed to parse file %s: %s", file_path, e)
             return None
     
-    def _detect_language_from_file(self, file_path: str, default_language: str) -> str:
-        """Detect language based on file extension and content"""
-        file_path_lower = file_path.lower()
+    async def _parse_symbols(self, file_path: str, actual_language: str) -> Optional[Dict[str, Any]]:
+        """Collect imports and declaration names only, without an AST, source copy or cache entry"""
+        raw_content = await self._read_source(file_path)
+        if raw_content.find(b'\x00', 0, self.BINARY_SNIFF_BYTES) != -1:
+            logger.info("Skipping binary file: %s", file_path)
+            return None
+        content = self._decode_source(raw_content)
+        del raw_content
         
-        # Check file extensions
-        if file_path_lower.endswith(('.py', '.pyw', '.pyi', '.pyx', '.pxd', '.pxi')):
-            return 'python'
-        elif file_path_lower.endswith(('.java', '.jav')):
-            return 'java'
-        elif file_path_lower.endswith(('.js', '.jsx', '.mjs', '.cjs')):
-            return 'javascript'
-        elif file_path_lower.endswith(('.ts', '.tsx', '.mts', '.cts')):
-            return 'typescript'
-        elif file_path_lower.endswith(('.cbl', '.cob', '.cpy', '.cobol')):
-            return 'cobol'
-        elif file_path_lower.endswith(('.cpp', '.cc', '.cxx', '.c++', '.h', '.hpp', '.hxx', '.hh', '.h++')):
-            return 'cpp'
-        elif file_path_lower.endswith(('.c', '.h')):
-            return 'c'
-        elif file_path_lower.endswith('.go'):
-            return 'go'
-        elif file_path_lower.endswith('.rs'):
-            return 'rust'
-        elif file_path_lower.endswith(('.php', '.php3', '.php4', '.php5', '.phtml')):
-            return 'php'
-        elif file_path_lower.endswith(('.rb', '.rbw')):
-            return 'ruby'
-        elif file_path_lower.endswith('.sql'):
-            return 'sql'
-        elif file_path_lower.endswith(('.html', '.htm', '.xhtml')):
-            return 'html'
-        elif file_path_lower.endswith(('.css', '.scss', '.sass', '.less')):
-            return 'css'
-        elif file_path_lower.endswith(('.xml', '.xsd', '.xsl')):
-            return 'xml'
-        elif file_path_lower.endswith('.json'):
-            return 'json'
-        elif file_path_lower.endswith(('.yml', '.yaml')):
-            return 'yaml'
-        elif file_path_lower.endswith('.toml'):
-            return 'toml'
-        elif file_path_lower.endswith(('.ini', '.cfg', '.conf')):
-            return 'ini'
-        elif file_path_lower.endswith(('.md', '.markdown')):
-            return 'markdown'
-        elif file_path_lower in ['dockerfile', '.dockerfile']:
-            return 'dockerfile'
-        elif file_path_lower in ['makefile', '.mk', '.make']:
-            return 'makefile'
-        elif file_path_lower in ['cmakelists.txt', '.cmake']:
-            return 'cmake'
-        elif file_path_lower in ['package.json', 'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml']:
-            return 'npm'
-        elif file_path_lower in ['requirements.txt', 'setup.py', 'pyproject.toml', 'pipfile', 'poetry.lock']:
-            return 'pip'
-        elif file_path_lower in ['cargo.toml', 'cargo.lock']:
-            return 'cargo'
-        elif file_path_lower in ['go.mod', 'go.sum']:
-            return 'go_mod'
-        elif file_path_lower in ['composer.json', 'composer.lock']:
-            return 'composer'
-        elif file_path_lower in ['gemfile', 'gemfile.lock']:
-            return 'gemfile'
-        elif file_path_lower in ['pubspec.yaml', 'pubspec.lock']:
-            return 'pubspec'
-        elif file_path_lower.endswith('.cabal'):
-            return 'cabal'
-        elif file_path_lower in ['stack.yaml']:
-            return 'stack'
-        elif file_path_lower in ['mix.exs', 'mix.lock']:
-            return 'mix'
-        elif file_path_lower in ['rebar.config']:
-            return 'rebar'
-        elif file_path_lower in ['project.clj']:
-            return 'leiningen'
-        elif file_path_lower in ['build.sbt', 'project/build.properties']:
-            return 'sbt'
-        elif file_path_lower in ['gradlew', 'gradlew.bat']:
-            return 'gradle_wrapper'
-        elif file_path_lower in ['mvnw', 'mvnw.cmd']:
-            return 'maven_wrapper'
-        elif file_path_lower in ['pom.xml', 'build.gradle', 'gradle.properties', 'settings.gradle']:
-            return 'gradle'
-        elif file_path_lower in ['maven']:
-            return 'maven'
-        else:
-            return default_language
-    
-    async def _parse_python_file(self, file_path: str, content: str) -> Dict[str, Any]:
-        """Parse Python file using built-in ast module"""
-        try:
-            tree = ast.parse(content)
-            
-            # Extract imports
+        if actual_language == 'python':
+            # Top-level statements only, found by one regex pass instead of ast.parse
             imports = []
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.Import, ast.ImportFrom)):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            imports.append(alias.name)
-                    else:
-                        module = node.module or ""
-                        for alias in node.names:
-                            imports.append(f"{module}.{alias.name}")
-            
-            # Extract functions with full body
             functions = []
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    function_body = self._extract_node_source(content, node)
-                    functions.append({
-                        "name": node.name,
-                        "line": node.lineno,
-                        "args": [arg.arg for arg in node.args.args],
-                        "decorators": [d.id for d in node.decorator_list if hasattr(d, 'id')],
-                        "body": function_body,
-                        "full_code": self._get_full_function_code(content, node)
-                    })
-            
-            # Extract classes with full implementation
             classes = []
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    class_body = self._extract_node_source(content, node)
-                    class_methods = []
-                    for child in node.body:
-                        if isinstance(child, ast.FunctionDef):
-                            class_methods.append({
-                                "name": child.name,
-                                "line": child.lineno,
-                                "body": self._extract_node_source(content, child)
-                            })
-                    
-                    classes.append({
-                        "name": node.name,
-                        "line": node.lineno,
-                        "bases": [base.id for base in node.bases if hasattr(base, 'id')],
-                        "methods": class_methods,
-                        "body": class_body,
-                        "full_code": self._get_full_class_code(content, node)
-                    })
-            
-            # Extract variables with values
             variables = []
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Assign):
-                    for target in node.targets:
-                        if isinstance(target, ast.Name):
-                            variables.append({
-                                "name": target.id,
-                                "line": node.lineno,
-                                "value": ast.unparse(node.value) if hasattr(ast, 'unparse') else str(node.value),
-                                "full_assignment": self._extract_node_source(content, node)
-                            })
+            i = 1
+            last_pos = 0
+            for match in self._PYTHON_SYMBOL_RE.finditer(content):
+                i += content.count('\n', last_pos, match.start())
+                last_pos = match.start()
+                kind = match.lastgroup
+                if kind == 'import':
+                    imports.extend(self._split_import_names(match.group('import')))
+                elif kind == 'from_names':
+                    # Relative imports keep only the module part, as the AST parser reports them
+                    module = match.group('from_module').lstrip('.')
+                    imports.extend(f"{module}.{name}" for name in self._split_import_names(match.group('from_names')))
+                elif kind == 'function':
+                    functions.append({"name": match.group('function'), "line": i})
+                elif kind == 'class':
+                    classes.append({"name": match.group('class'), "line": i})
+                else:
+                    variables.append({"name": match.group('variable'), "line": i})
+            return {
+                "file_path": file_path,
+                "language": "python",
+                "imports": imports,
+                "functions": functions,
+                "classes": classes,
+                "variables": variables
+            }
+        
+        # Other languages have no cheaper scanner than their regular parser; drop the heavy fields
+        result = await self._parse_content_offloaded(file_path, content, actual_language)
+        if result is None:
+            return None
+        symbols = {key: value for key, value in result.items() if key not in ('ast_tree', 'full_source_code')}
+        for section in ('functions', 'classes', 'variables'):
+            symbols[section] = [
+                {key: value for key, value in entry.items() if key in ('name', 'line')}
+                for entry in symbols.get(section, []) if isinstance(entry, dict)
+            ]
+        return symbols
+    
+    def _split_import_names(self, names: str) -> List[str]:
+        """Module/member names of an import list, without aliases, parentheses or comments"""
+        names = names.split('#', 1)[0].replace('(', ' ').replace(')', ' ').replace('\\', ' ')
+        return [part.split()[0] for part in names.split(',') if part.strip()]
+    
+    async def _read_source(self, file_path: str, file_size: int = 0) -> Union[bytes, mmap.mmap]:
+        """Read raw file bytes without blocking the event loop (large files in pool workers are memory-mapped)"""
+        if not self.async_reads:
+            # Pool workers parse one file at a time; a plain read is cheapest there, and mapping
+            # large files lets them be hashed and decoded without an intermediate bytes copy
+            with open(file_path, 'rb') as f:
+                if file_size >= self.MMAP_MIN_BYTES:
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                return f.read()
+        if aiofiles is not None:
+            async with aiofiles.open(file_path, 'rb') as f:
+                return await f.read()
+        return await asyncio.to_thread(Path(file_path).read_bytes)
+    
+    def _decode_source(self, raw_content: Union[bytes, mmap.mmap]) -> str:
+        """Decode with universal newlines, matching text-mode reads; stray invalid bytes become U+FFFD"""
+        content = str(raw_content, 'utf-8', 'replace')
+        # A memchr-backed '\r' probe is far cheaper than two replace() scans that find nothing
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+    
+    async def _parse_content_offloaded(self, file_path: str, content: str, actual_language: str) -> Optional[Dict[str, Any]]:
+        """Run the CPU-bound parse of a large source in a worker process so the event loop stays responsive"""
+        if (self.offload_parsing and self.PARSE_WORKERS > 1 and not FREE_THREADED
+                and len(content) >= self.OFFLOAD_MIN_CHARS):
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    _get_process_pool(self.PARSE_WORKERS), _parse_content_worker, file_path, content, actual_language
+                )
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning("Process pool unavailable, parsing in-process: %s", e)
+                _reset_process_pool()
+        return await self._parse_content(file_path, content, actual_language)
+    
+    async def _parse_content(self, file_path: str, content: str, actual_language: str) -> Optional[Dict[str, Any]]:
+        """Parse decoded source content in-process"""
+        if FREE_THREADED:
+            # Without a GIL, parses on the shared thread pool run in parallel
+            return await asyncio.get_running_loop().run_in_executor(
+                _get_thread_pool(self.PARSE_WORKERS), self._parse_source, file_path, content, actual_language
+            )
+        return self._parse_source(file_path, content, actual_language)
+    
+    def _parse_source(self, file_path: str, content: str, actual_language: str) -> Optional[Dict[str, Any]]:
+        """Dispatch decoded source content to the language-specific parser"""
+        # The parsers are plain CPU-bound functions, so no coroutine is created per file
+        parser = self._language_parsers.get(actual_language)
+        if parser is None:
+            # Generic parser for other file types
+            return self._parse_generic_file(file_path, content, actual_language)
+        return parser(file_path, content)
+    
+    def _detect_language_from_file(self, file_path: str, default_language: str) -> str:
+        """Detect language based on file extension and content"""
+        name = os.path.basename(file_path).lower()
+        language = self._ext_to_lang.get(os.path.splitext(name)[1])
+        if language is None:
+            language = self._name_to_lang.get(name, default_language)
+        return language
+    
+    def _parse_python_file(self, file_path: str, content: str) -> Dict[str, Any]:
+        """Parse Python file using built-in ast module"""
+        try:
+            with _gc_paused():
+                tree = ast.parse(content)
+            line_starts = self._compute_line_starts(content)
+            
+            with _gc_paused():
+                ast_tree, imports, functions, classes, variables = self._python_tree_to_dict(tree, line_starts)
             
             return {
                 "file_path": file_path,
@@ -531,15 +769,15 @@ class ASTParser:
                 "functions": functions,
                 "classes": classes,
                 "variables": variables,
-                "ast_tree": self._ast_to_dict(tree),
+                "ast_tree": ast_tree,
                 "full_source_code": content
             }
             
         except Exception as e:
-            print(f"Failed to parse Python file {file_path}: {str(e)}")
+            logger.warning("Failed to parse Python file %s: %s", file_path, e)
             return None
     
-    async def _parse_java_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_java_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse Java file and create AST structure with full code"""
         try:
             # Create AST structure
@@ -548,32 +786,24 @@ class ASTParser:
                 "children": []
             }
             
-            lines = content.split('\n')
+            line_starts = self._compute_line_starts(content)
             imports = []
             functions = []
             classes = []
             variables = []
             
             current_class = None
-            current_method = None
-            brace_count = 0
-            class_start_line = 0
-            method_start_line = 0
+            class_end = 0
             
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
-                original_line = line
-                
-                # Skip empty lines and comments
-                if not line or line.startswith('//') or line.startswith('/*'):
-                    continue
-                
-                # Track brace count for scope
-                brace_count += line.count('{') - line.count('}')
+            # Most lines are statements rejected by the prefix regex; only the others are stripped
+            classify = self._classify_java_line
+            for i, _ in self._iter_line_matches(self._JAVA_LINE_RE, content):
+                line = content[line_starts[i - 1]:line_starts[i] - 1].strip()
+                kind, identifier = classify(line)
                 
                 # Extract imports
-                if line.startswith('import '):
-                    import_stmt = line[7:].rstrip(';')
+                if kind == 'import':
+                    import_stmt = identifier
                     imports.append(import_stmt)
                     ast_tree["children"].append({
                         "node_type": "ImportDeclaration",
@@ -582,8 +812,8 @@ class ASTParser:
                     })
                 
                 # Extract package declaration
-                elif line.startswith('package '):
-                    package_name = line[8:].rstrip(';')
+                elif kind == 'package':
+                    package_name = identifier
                     ast_tree["children"].append({
                         "node_type": "PackageDeclaration",
                         "line": i,
@@ -591,74 +821,71 @@ class ASTParser:
                     })
                 
                 # Extract class definitions with full body
-                elif re.match(r'(public\s+)?(abstract\s+)?(final\s+)?class\s+\w+', line):
-                    class_match = re.search(r'class\s+(\w+)', line)
-                    if class_match:
-                        class_name = class_match.group(1)
-                        class_start_line = i
-                        class_code = self._extract_code_block(lines, i, content)
-                        
-                        class_node = {
-                            "node_type": "ClassDeclaration",
-                            "name": class_name,
-                            "line": i,
-                            "modifiers": self._extract_modifiers(line),
-                            "children": [],
-                            "full_code": class_code
-                        }
-                        classes.append({
-                            "name": class_name,
-                            "line": i,
-                            "type": "public" if "public" in line else "default",
-                            "modifiers": self._extract_modifiers(line),
-                            "full_code": class_code
-                        })
-                        current_class = class_node
-                        ast_tree["children"].append(class_node)
+                elif kind == 'class':
+                    class_name = identifier
+                    class_code = self._extract_code_block(content, line_starts, i)
+                    modifiers = self._extract_modifiers(line)
+                    
+                    # Tree nodes leave out empty modifiers and children
+                    class_node = {
+                        "node_type": "ClassDeclaration",
+                        "name": class_name,
+                        "line": i,
+                        "full_code_span": class_code
+                    }
+                    if modifiers:
+                        class_node["modifiers"] = modifiers
+                    classes.append({
+                        "name": class_name,
+                        "line": i,
+                        "type": "public" if "public" in modifiers else "default",
+                        "modifiers": modifiers,
+                        "full_code_span": class_code
+                    })
+                    current_class = class_node
+                    class_end = class_code.end
+                    ast_tree["children"].append(class_node)
                 
                 # Extract method definitions with full body
-                elif re.match(r'(public|private|protected|static|final|abstract)\s+.*\(.*\)', line):
-                    if 'class' not in line and 'interface' not in line:
-                        method_match = re.search(r'(\w+)\s*\([^)]*\)', line)
-                        if method_match:
-                            method_name = method_match.group(1)
-                            method_start_line = i
-                            method_code = self._extract_code_block(lines, i, content)
-                            
-                            method_node = {
-                                "node_type": "MethodDeclaration",
-                                "name": method_name,
-                                "line": i,
-                                "modifiers": self._extract_modifiers(line),
-                                "children": [],
-                                "full_code": method_code
-                            }
-                            functions.append({
-                                "name": method_name,
-                                "line": i,
-                                "visibility": "public" if "public" in line else "private" if "private" in line else "protected",
-                                "modifiers": self._extract_modifiers(line),
-                                "full_code": method_code
-                            })
-                            current_method = method_node
-                            if current_class:
-                                current_class["children"].append(method_node)
+                elif kind == 'method':
+                    method_name = identifier
+                    # A method inside the enclosing class's block cannot close past that block
+                    method_code = self._extract_code_block(
+                        content, line_starts, i, class_end if line_starts[i - 1] < class_end else None)
+                    modifiers = self._extract_modifiers(line)
+                    
+                    method_node = {
+                        "node_type": "MethodDeclaration",
+                        "name": method_name,
+                        "line": i,
+                        "full_code_span": method_code
+                    }
+                    if modifiers:
+                        method_node["modifiers"] = modifiers
+                    functions.append({
+                        "name": method_name,
+                        "line": i,
+                        "visibility": next((m for m in modifiers if m in self._JAVA_VISIBILITY_MODIFIERS), "package"),
+                        "modifiers": modifiers,
+                        "full_code_span": method_code
+                    })
+                    if current_class:
+                        current_class.setdefault("children", []).append(method_node)
                 
                 # Extract variable declarations with full assignment
-                elif re.match(r'(public|private|protected|static|final)\s+.*\w+\s+\w+', line):
-                    var_match = re.search(r'(\w+)\s+(\w+)', line)
-                    if var_match:
-                        var_type = var_match.group(1)
-                        var_name = var_match.group(2)
-                        # Get the full variable declaration including initialization
-                        var_code = self._extract_variable_declaration(lines, i, content)
-                        variables.append({
-                            "name": var_name,
-                            "type": var_type,
-                            "line": i,
-                            "modifiers": self._extract_modifiers(line),
-                            "full_code": var_code
-                        })
+                elif kind == 'variable':
+                    var_type, var_name = identifier
+                    var_type = sys.intern(var_type)
+                    # Get the full variable declaration including initialization
+                    var_code = self._extract_variable_declaration(content, line_starts, i)
+                    modifiers = self._extract_modifiers(line)
+                    variables.append({
+                        "name": var_name,
+                        "type": var_type,
+                        "line": i,
+                        "modifiers": modifiers,
+                        "full_code_span": var_code
+                    })
             
             return {
                 "file_path": file_path,
@@ -672,116 +899,143 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse Java file {file_path}: {str(e)}")
+            logger.warning("Failed to parse Java file %s: %s", file_path, e)
             return None
     
-    async def _parse_javascript_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _classify_java_line(self, line: str) -> Tuple[Optional[str], Any]:
+        """Classify a stripped Java line as import/package/class/method/variable and peel off its identifier"""
+        if line.startswith('import '):
+            return 'import', line[7:].rstrip(';')
+        if line.startswith('package '):
+            return 'package', line[8:].rstrip(';')
+        
+        # Class: optional public/abstract/final (in that order), 'class', then the name.
+        # Only lines mentioning 'class' are split into words for this.
+        if 'class' in line:
+            words = line.split(None, 5)
+            k = 0
+            for modifier in self._JAVA_CLASS_MODIFIERS:
+                if k < len(words) and words[k] == modifier:
+                    k += 1
+            if k + 1 < len(words) and words[k] == 'class':
+                name_match = self._JAVA_IDENTIFIER_RE.match(words[k + 1])
+                if name_match:
+                    return 'class', name_match.group()
+        
+        words = line.split(None, 1)
+        if len(words) < 2:
+            return None, None
+        
+        # Method: a modifier followed by a parenthesised parameter list; lines without '('
+        # skip straight to the variable test
+        first = words[0]
+        if first in self._JAVA_METHOD_MODIFIERS and '(' in line:
+            paren = line.find('(')
+            if line.find(')', paren + 1) != -1:
+                if 'class' in line or 'interface' in line:
+                    return None, None
+                method_match = self._JAVA_METHOD_NAME_RE.search(line)
+                return ('method', method_match.group(1)) if method_match else (None, None)
+        
+        # Variable: a modifier followed by at least "<type> <name>"; identifier is (type, name)
+        if first in self._JAVA_VARIABLE_MODIFIERS and self._JAVA_VAR_RE.search(line, len(first)):
+            return 'variable', self._JAVA_VAR_RE.search(line).groups()
+        return None, None
+    
+    def _parse_javascript_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse JavaScript file and create AST structure with full code"""
+        return self._parse_regex_language(file_path, content, 'javascript')
+    
+    def _parse_typescript_file(self, file_path: str, content: str) -> Dict[str, Any]:
+        """Parse TypeScript file and create AST structure with full code"""
+        return self._parse_regex_language(file_path, content, 'typescript')
+    
+    def _parse_cobol_file(self, file_path: str, content: str) -> Dict[str, Any]:
+        """Parse COBOL file and create AST structure with full code"""
         try:
             ast_tree = {
-                "node_type": "Program",
+                "node_type": "CobolProgram",
                 "children": []
             }
             
             lines = content.split('\n')
+            line_starts = self._compute_line_starts(content, lines)
             imports = []
             functions = []
             classes = []
             variables = []
             
+            current_division = None
+            current_section = None
+            
             for i, line in enumerate(lines, 1):
                 line = line.strip()
+                if not line:
+                    continue
+                upper_line = line.upper()
                 
-                # Extract imports
-                if line.startswith('import ') or ('require(' in line and line.startswith('const ')):
-                    imports.append(line)
-                    ast_tree["children"].append({
-                        "node_type": "ImportDeclaration",
+                # Extract divisions with full body
+                if 'DIVISION' in upper_line:
+                    division_name = line.split()[0]
+                    division_code = self._extract_cobol_block(lines, line_starts, i)
+                    current_division = {
+                        "node_type": "Division",
+                        "name": division_name,
                         "line": i,
-                        "import": line
+                        "children": [],
+                        "full_code_span": division_code
+                    }
+                    functions.append({
+                        "name": division_name,
+                        "line": i,
+                        "type": "division",
+                        "full_code_span": division_code
                     })
+                    ast_tree["children"].append(current_division)
                 
-                # Extract function declarations with full body
-                elif re.match(r'function\s+\w+\s*\(', line):
-                    func_match = re.search(r'function\s+(\w+)', line)
-                    if func_match:
-                        func_name = func_match.group(1)
-                        func_code = self._extract_code_block(lines, i, content)
-                        functions.append({
-                            "name": func_name,
-                            "line": i,
-                            "type": "function",
-                            "full_code": func_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "FunctionDeclaration",
-                            "name": func_name,
-                            "line": i,
-                            "full_code": func_code
-                        })
-                
-                # Extract arrow functions and const functions with full body
-                elif re.match(r'const\s+\w+\s*=\s*.*=>', line) or re.match(r'const\s+\w+\s*=\s*function', line):
-                    func_match = re.search(r'const\s+(\w+)', line)
-                    if func_match:
-                        func_name = func_match.group(1)
-                        func_code = self._extract_code_block(lines, i, content)
-                        functions.append({
-                            "name": func_name,
-                            "line": i,
-                            "type": "arrow" if '=>' in line else "function",
-                            "full_code": func_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "VariableDeclaration",
-                            "name": func_name,
-                            "line": i,
-                            "kind": "const",
-                            "full_code": func_code
-                        })
-                
-                # Extract class declarations with full body
-                elif line.startswith('class '):
-                    class_match = re.search(r'class\s+(\w+)', line)
-                    if class_match:
-                        class_name = class_match.group(1)
-                        class_code = self._extract_code_block(lines, i, content)
-                        classes.append({
-                            "name": class_name,
-                            "line": i,
-                            "full_code": class_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "ClassDeclaration",
-                            "name": class_name,
-                            "line": i,
-                            "full_code": class_code
-                        })
+                # Extract sections with full body
+                elif 'SECTION' in upper_line:
+                    section_name = line.split()[0]
+                    section_code = self._extract_cobol_block(lines, line_starts, i)
+                    current_section = {
+                        "node_type": "Section",
+                        "name": section_name,
+                        "line": i,
+                        "children": [],
+                        "full_code_span": section_code
+                    }
+                    functions.append({
+                        "name": section_name,
+                        "line": i,
+                        "type": "section",
+                        "full_code_span": section_code
+                    })
+                    if current_division:
+                        current_division["children"].append(current_section)
                 
-                # Extract variable declarations with full assignment
-                elif re.match(r'(let|const|var)\s+\w+', line):
-                    var_match = re.search(r'(let|const|var)\s+(\w+)', line)
-                    if var_match:
-                        var_kind = var_match.group(1)
-                        var_name = var_match.group(2)
-                        var_code = self._extract_variable_declaration(lines, i, content)
-                        variables.append({
-                            "name": var_name,
-                            "kind": var_kind,
-                            "line": i,
-                            "full_code": var_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "VariableDeclaration",
+                # Extract data definitions with full declaration
+                elif self._COBOL_DATA_ITEM_RE.match(line):
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        level = sys.intern(parts[0])
+                        var_name = parts[1]
+                        # One dict serves as both the variable entry and the tree node
+                        data_node = {
+                            "node_type": "DataItem",
                             "name": var_name,
+                            "level": level,
                             "line": i,
-                            "kind": var_kind,
-                            "full_code": var_code
-                        })
+                            "full_code": self._extract_cobol_data_item(lines, i, content)
+                        }
+                        variables.append(data_node)
+                        if current_section:
+                            current_section["children"].append(data_node)
+                        elif current_division:
+                            current_division["children"].append(data_node)
             
             return {
                 "file_path": file_path,
-                "language": "javascript",
+                "language": "cobol",
                 "imports": imports,
                 "functions": functions,
                 "classes": classes,
@@ -791,449 +1045,208 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse JavaScript file {file_path}: {str(e)}")
+            logger.warning("Failed to parse COBOL file %s: %s", file_path, e)
             return None
     
-    async def _parse_typescript_file(self, file_path: str, content: str) -> Dict[str, Any]:
-        """Parse TypeScript file and create AST structure with full code"""
+    def _parse_cpp_file(self, file_path: str, content: str) -> Dict[str, Any]:
+        """Parse C++ file and create AST structure with full code"""
+        return self._parse_regex_language(file_path, content, 'cpp')
+    
+    def _parse_regex_language(self, file_path: str, content: str, language: str) -> Optional[Dict[str, Any]]:
+        """Parse a line-oriented language with its table of declaration rules in one finditer pass"""
+        spec = REGEX_LANGUAGE_SPECS[language]
         try:
             ast_tree = {
-                "node_type": "Program",
+                "node_type": spec["root"],
                 "children": []
             }
             
-            lines = content.split('\n')
-            imports = []
-            functions = []
-            classes = []
-            variables = []
+            line_starts = self._compute_line_starts(content)
+            sections = {
+                "imports": [],
+                "functions": [],
+                "classes": [],
+                "variables": []
+            }
+            rules = spec["rules"]
             
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
+            for i, match in self._iter_line_matches(spec["regex"], content):
+                kind = match.lastgroup
+                rule = rules[kind]
+                line = match.group(kind).rstrip()
                 
-                # Extract imports
-                if line.startswith('import '):
-                    imports.append(line)
+                # Statements recorded as-is (imports, includes, package)
+                if "key" in rule:
+                    if rule["section"]:
+                        sections[rule["section"]].append(rule["import_value"](line))
                     ast_tree["children"].append({
-                        "node_type": "ImportDeclaration",
+                        "node_type": rule["node_type"],
                         "line": i,
-                        "import": line
+                        rule["key"]: rule["value"](line)
                     })
+                    continue
                 
-                # Extract interfaces with full body
-                elif line.startswith('interface '):
-                    interface_match = re.search(r'interface\s+(\w+)', line)
-                    if interface_match:
-                        interface_name = interface_match.group(1)
-                        interface_code = self._extract_code_block(lines, i, content)
-                        ast_tree["children"].append({
-                            "node_type": "InterfaceDeclaration",
-                            "name": interface_name,
-                            "line": i,
-                            "full_code": interface_code
-                        })
-                
-                # Extract type definitions with full body
-                elif line.startswith('type '):
-                    type_match = re.search(r'type\s+(\w+)', line)
-                    if type_match:
-                        type_name = type_match.group(1)
-                        type_code = self._extract_code_block(lines, i, content)
-                        ast_tree["children"].append({
-                            "node_type": "TypeAliasDeclaration",
-                            "name": type_name,
-                            "line": i,
-                            "full_code": type_code
-                        })
-                
-                # Extract function declarations with types and full body
-                elif re.match(r'function\s+\w+\s*\(.*\)\s*:\s*\w+', line):
-                    func_match = re.search(r'function\s+(\w+)', line)
-                    if func_match:
-                        func_name = func_match.group(1)
-                        func_code = self._extract_code_block(lines, i, content)
-                        functions.append({
-                            "name": func_name,
-                            "line": i,
-                            "type": "function",
-                            "full_code": func_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "FunctionDeclaration",
-                            "name": func_name,
-                            "line": i,
-                            "full_code": func_code
-                        })
-                
-                # Extract class declarations with full body
-                elif line.startswith('class '):
-                    class_match = re.search(r'class\s+(\w+)', line)
-                    if class_match:
-                        class_name = class_match.group(1)
-                        class_code = self._extract_code_block(lines, i, content)
-                        classes.append({
-                            "name": class_name,
-                            "line": i,
-                            "full_code": class_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "ClassDeclaration",
-                            "name": class_name,
-                            "line": i,
-                            "full_code": class_code
-                        })
-                
-                # Extract variable declarations with types and full assignment
-                elif re.match(r'(let|const|var)\s+\w+\s*:\s*\w+', line):
-                    var_match = re.search(r'(let|const|var)\s+(\w+)', line)
-                    if var_match:
-                        var_kind = var_match.group(1)
-                        var_name = var_match.group(2)
-                        var_code = self._extract_variable_declaration(lines, i, content)
-                        variables.append({
-                            "name": var_name,
-                            "kind": var_kind,
-                            "line": i,
-                            "full_code": var_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "VariableDeclaration",
-                            "name": var_name,
-                            "line": i,
-                            "kind": var_kind,
-                            "full_code": var_code
-                        })
-            
-            return {
-                "file_path": file_path,
-                "language": "typescript",
-                "imports": imports,
-                "functions": functions,
-                "classes": classes,
-                "variables": variables,
-                "ast_tree": ast_tree,
-                "full_source_code": content
-            }
-            
-        except Exception as e:
-            print(f"Failed to parse TypeScript file {file_path}: {str(e)}")
-            return None
-    
-    async def _parse_cobol_file(self, file_path: str, content: str) -> Dict[str, Any]:
-        """Parse COBOL file and create AST structure with full code"""
-        try:
-            ast_tree = {
-                "node_type": "CobolProgram",
-                "children": []
-            }
-            
-            lines = content.split('\n')
-            imports = []
-            functions = []
-            classes = []
-            variables = []
-            
-            current_division = None
-            current_section = None
-            
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # Extract divisions with full body
-                if 'DIVISION' in line.upper():
-                    division_name = line.split()[0]
-                    division_code = self._extract_cobol_block(lines, i, content)
-                    current_division = {
-                        "node_type": "Division",
-                        "name": division_name,
-                        "line": i,
-                        "children": [],
-                        "full_code": division_code
-                    }
-                    functions.append({
-                        "name": division_name,
-                        "line": i,
-                        "type": "division",
-                        "full_code": division_code
-                    })
-                    ast_tree["children"].append(current_division)
-                
-                # Extract sections with full body
-                elif 'SECTION' in line.upper():
-                    section_name = line.split()[0]
-                    section_code = self._extract_cobol_block(lines, i, content)
-                    current_section = {
-                        "node_type": "Section",
-                        "name": section_name,
-                        "line": i,
-                        "children": [],
-                        "full_code": section_code
-                    }
-                    functions.append({
-                        "name": section_name,
-                        "line": i,
-                        "type": "section",
-                        "full_code": section_code
-                    })
-                    if current_division:
-                        current_division["children"].append(current_section)
-                
-                # Extract data definitions with full declaration
-                elif re.match(r'^\d{2}\s+\w+', line):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        level = parts[0]
-                        var_name = parts[1]
-                        var_code = self._extract_cobol_data_item(lines, i, content)
-                        variables.append({
-                            "name": var_name,
-                            "line": i,
-                            "level": level,
-                            "full_code": var_code
-                        })
-                        data_node = {
-                            "node_type": "DataItem",
-                            "name": var_name,
-                            "level": level,
-                            "line": i,
-                            "full_code": var_code
-                        }
-                        if current_section:
-                            current_section["children"].append(data_node)
-                        elif current_division:
-                            current_division["children"].append(data_node)
-            
-            return {
-                "file_path": file_path,
-                "language": "cobol",
-                "imports": imports,
-                "functions": functions,
-                "classes": classes,
-                "variables": variables,
-                "ast_tree": ast_tree,
-                "full_source_code": content
-            }
-            
-        except Exception as e:
-            print(f"Failed to parse COBOL file {file_path}: {str(e)}")
-            return None
-    
-    async def _parse_cpp_file(self, file_path: str, content: str) -> Dict[str, Any]:
-        """Parse C++ file and create AST structure with full code"""
-        try:
-            ast_tree = {
-                "node_type": "TranslationUnit",
-                "children": []
-            }
-            
-            lines = content.split('\n')
-            imports = []
-            functions = []
-            classes = []
-            variables = []
-            
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # Extract includes
-                if line.startswith('#include '):
-                    include_path = line[9:].strip('"<>')
-                    imports.append(line)
-                    ast_tree["children"].append({
-                        "node_type": "IncludeDirective",
-                        "line": i,
-                        "path": include_path
-                    })
-                
-                # Extract class declarations with full body
-                elif re.match(r'class\s+\w+', line) or re.match(r'struct\s+\w+', line):
-                    class_match = re.search(r'(class|struct)\s+(\w+)', line)
-                    if class_match:
-                        class_type = class_match.group(1)
-                        class_name = class_match.group(2)
-                        class_code = self._extract_code_block(lines, i, content)
-                        classes.append({
-                            "name": class_name,
-                            "line": i,
-                            "type": class_type,
-                            "full_code": class_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "ClassDeclaration",
-                            "name": class_name,
-                            "type": class_type,
-                            "line": i,
-                            "full_code": class_code
-                        })
-                
-                # Extract function declarations with full body
-                elif re.match(r'\w+\s+\w+\s*\([^)]*\)', line) and not line.startswith('#'):
-                    func_match = re.search(r'(\w+)\s+(\w+)\s*\(', line)
-                    if func_match:
-                        return_type = func_match.group(1)
-                        func_name = func_match.group(2)
-                        func_code = self._extract_code_block(lines, i, content)
-                        functions.append({
-                            "name": func_name,
-                            "line": i,
-                            "return_type": return_type,
-                            "full_code": func_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "FunctionDeclaration",
-                            "name": func_name,
-                            "return_type": return_type,
-                            "line": i,
-                            "full_code": func_code
-                        })
-                
-                # Extract variable declarations with full assignment
-                elif re.match(r'\w+\s+\w+\s*[=;]', line) and not line.startswith('#'):
-                    var_match = re.search(r'(\w+)\s+(\w+)', line)
-                    if var_match:
-                        var_type = var_match.group(1)
-                        var_name = var_match.group(2)
-                        var_code = self._extract_variable_declaration(lines, i, content)
-                        variables.append({
-                            "name": var_name,
-                            "type": var_type,
-                            "line": i,
-                            "full_code": var_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "VariableDeclaration",
-                            "name": var_name,
-                            "type": var_type,
-                            "line": i,
-                            "full_code": var_code
-                        })
+                # Declarations with full code
+                if "field_groups" in rule:
+                    fields = {field: match.group(group) for field, group in rule["field_groups"]}
+                else:
+                    name_match = rule["name_re"].search(line)
+                    if not name_match:
+                        continue
+                    fields = name_match.groupdict()
+                name = fields.pop("name")
+                # The other captured fields (kind, type, return_type) repeat across a scan, so
+                # every declaration shares one interned string per value
+                for field, value in fields.items():
+                    if value is not None:
+                        fields[field] = sys.intern(value)
+                for field, value_map in rule["value_maps"].items():
+                    fields[field] = value_map[fields[field]]
+                if rule["code"] == "block":
+                    code = self._extract_code_block(content, line_starts, i)
+                else:
+                    code = self._extract_variable_declaration(content, line_starts, i)
+                
+                # The section entry and the tree node are one shared dict
+                node = {
+                    "node_type": rule["node_type"],
+                    "name": name,
+                    "line": i,
+                    **rule["static_fields"],
+                    **fields,
+                    "full_code_span": code
+                }
+                if rule["section"]:
+                    sections[rule["section"]].append(node)
+                ast_tree["children"].append(node)
             
             return {
                 "file_path": file_path,
-                "language": "cpp",
-                "imports": imports,
-                "functions": functions,
-                "classes": classes,
-                "variables": variables,
+                "language": language,
+                **sections,
                 "ast_tree": ast_tree,
                 "full_source_code": content
             }
             
         except Exception as e:
-            print(f"Failed to parse C++ file {file_path}: {str(e)}")
+            logger.warning("Failed to parse %s file %s: %s", spec['label'], file_path, e)
             return None
     
     def _extract_modifiers(self, line: str) -> List[str]:
         """Extract modifiers from a Java line"""
-        modifiers = []
-        if 'public' in line:
-            modifiers.append('public')
-        if 'private' in line:
-            modifiers.append('private')
-        if 'protected' in line:
-            modifiers.append('protected')
-        if 'static' in line:
-            modifiers.append('static')
-        if 'final' in line:
-            modifiers.append('final')
-        if 'abstract' in line:
-            modifiers.append('abstract')
-        return modifiers
-    
-    def _extract_node_source(self, content: str, node) -> str:
-        """Extract source code for a specific AST node"""
-        try:
-            if hasattr(node, 'lineno') and hasattr(node, 'end_lineno'):
-                lines = content.split('\n')
-                start_line = node.lineno - 1
-                end_line = node.end_lineno
-                return '\n'.join(lines[start_line:end_line])
-            else:
-                return str(node)
-        except:
-            return str(node)
+        # Whole tokens only, so names like finalize() or publicKey do not count as modifiers
+        tokens = self._JAVA_METHOD_MODIFIERS.intersection(line.split())
+        return [modifier for modifier in self._JAVA_MODIFIERS if modifier in tokens]
     
-    def _get_full_function_code(self, content: str, node) -> str:
-        """Get full function code including decorators"""
-        try:
-            lines = content.split('\n')
-            start_line = node.lineno - 1
-            end_line = node.end_lineno
-            
-            # Include decorators
-            if hasattr(node, 'decorator_list') and node.decorator_list:
-                decorator_start = node.decorator_list[0].lineno - 1
-                start_line = min(start_line, decorator_start)
-            
-            return '\n'.join(lines[start_line:end_line])
-        except:
-            return str(node)
+    def _iter_line_matches(self, pattern: re.Pattern, content: str) -> Iterator[Tuple[int, re.Match]]:
+        """Run a newline-anchored line pattern over the whole content, yielding (line number, match)"""
+        # Every match starts at the newline ending the previous line, so the first line gets one
+        # too; line numbers advance incrementally between matches
+        text = '\n' + content
+        i = 0
+        last_pos = 0
+        for match in pattern.finditer(text):
+            i += text.count('\n', last_pos, match.start() + 1)
+            last_pos = match.start() + 1
+            yield i, match
     
-    def _get_full_class_code(self, content: str, node) -> str:
-        """Get full class code including decorators"""
-        try:
+    def _compute_line_starts(self, content: str, lines: Optional[List[str]] = None) -> List[int]:
+        """Offsets at which each line starts, plus one past the end of the content"""
+        if lines is None:
             lines = content.split('\n')
-            start_line = node.lineno - 1
-            end_line = node.end_lineno
-            
-            # Include decorators
-            if hasattr(node, 'decorator_list') and node.decorator_list:
-                decorator_start = node.decorator_list[0].lineno - 1
-                start_line = min(start_line, decorator_start)
-            
-            return '\n'.join(lines[start_line:end_line])
-        except:
-            return str(node)
+        line_starts = [0]
+        line_starts.extend(accumulate(len(line) + 1 for line in lines))
+        return line_starts
     
-    def _extract_code_block(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract a complete code block from a starting line"""
+    def _line_span(self, line_starts: List[int], start_line: int, end_line: int) -> CodeSpan:
+        """Span of whole lines [start_line, end_line) (0-based) without re-splitting content"""
+        end_line = min(end_line, len(line_starts) - 1)
+        if end_line <= start_line:
+            return CodeSpan(0, 0)
+        return CodeSpan(line_starts[start_line], line_starts[end_line] - 1)
+    
+    def _node_span(self, node, line_starts: List[int], include_decorators: bool = False) -> Optional[CodeSpan]:
+        """Span of the source code for a specific AST node, optionally including its decorators"""
+        if not hasattr(node, 'lineno') or getattr(node, 'end_lineno', None) is None:
+            return None
+        start_line = node.lineno - 1
+        if include_decorators and getattr(node, 'decorator_list', None):
+            start_line = min(start_line, node.decorator_list[0].lineno - 1)
+        return self._line_span(line_starts, start_line, node.end_lineno)
+    
+    def _extract_code_block(self, content: str, line_starts: List[int], start_line: int,
+                            max_end: Optional[int] = None) -> CodeSpan:
+        """Span of a complete code block from a starting line, searching no further than max_end"""
         try:
             start_idx = start_line - 1
+            if start_idx >= len(line_starts) - 1:
+                return CodeSpan(0, 0)
+            block_start = line_starts[start_idx]
+            if max_end is None:
+                max_end = len(content)
+            
+            # Jump from brace to brace with str.find; braces are tallied per line, so the block
+            # opens at the first line ending with unclosed braces and closes at the first line
+            # after it ending balanced
             brace_count = 0
-            end_idx = start_idx
-            
-            # Find the opening brace
-            for i in range(start_idx, len(lines)):
-                line = lines[i]
-                brace_count += line.count('{') - line.count('}')
-                if brace_count > 0:
-                    end_idx = i + 1
-                    break
-            
-            # Find the closing brace
-            for i in range(end_idx, len(lines)):
-                line = lines[i]
-                brace_count += line.count('{') - line.count('}')
-                if brace_count <= 0:
-                    end_idx = i + 1
-                    break
-            
-            return '\n'.join(lines[start_idx:end_idx])
+            open_end = -1
+            pos = block_start
+            next_open = content.find('{', pos, max_end)
+            next_close = content.find('}', pos, max_end)
+            while next_open != -1 or next_close != -1:
+                if next_open == -1 or (next_close != -1 and next_close < next_open):
+                    brace_pos = next_close
+                else:
+                    brace_pos = next_open
+                line_end = content.find('\n', brace_pos)
+                if line_end == -1:
+                    line_end = len(content)
+                brace_count += content.count('{', brace_pos, line_end) - content.count('}', brace_pos, line_end)
+                if open_end == -1:
+                    if brace_count > 0:
+                        open_end = line_end
+                elif brace_count <= 0:
+                    return CodeSpan(block_start, line_end)
+                
+                pos = line_end + 1
+                if next_open != -1 and next_open < pos:
+                    next_open = content.find('{', pos, max_end)
+                if next_close != -1 and next_close < pos:
+                    next_close = content.find('}', pos, max_end)
+            
+            # Unclosed blocks run to their opening line; without braces only the start line is kept
+            if open_end == -1:
+                return self._line_span(line_starts, start_idx, start_line)
+            return CodeSpan(block_start, open_end)
         except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
+            return self._line_span(line_starts, start_line - 1, start_line)
     
-    def _extract_variable_declaration(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract complete variable declaration including initialization"""
+    def _extract_variable_declaration(self, content: str, line_starts: List[int], start_line: int) -> CodeSpan:
+        """Span of a complete variable declaration including initialization"""
         try:
             start_idx = start_line - 1
-            line = lines[start_idx]
-            
-            # If line ends with semicolon, it's complete
-            if line.strip().endswith(';'):
-                return line
-            
-            # Look for semicolon in subsequent lines
-            for i in range(start_idx + 1, min(start_idx + 5, len(lines))):
-                line += '\n' + lines[i]
-                if lines[i].strip().endswith(';'):
-                    break
-            
-            return line
+            window_end = min(start_idx + 5, len(line_starts) - 1)
+            limit = line_starts[window_end] - 1
+            
+            # The declaration ends at the first line (within five) whose last non-blank character
+            # is ';'. Jump between semicolons with str.find instead of stripping every line.
+            line_idx = start_idx
+            pos = content.find(';', line_starts[start_idx], limit)
+            while pos != -1:
+                while line_starts[line_idx + 1] <= pos:
+                    line_idx += 1
+                line_end = line_starts[line_idx + 1] - 1
+                tail_start = content.rfind(';', pos, line_end) + 1
+                if tail_start == line_end or content[tail_start:line_end].isspace():
+                    return self._line_span(line_starts, start_idx, line_idx + 1)
+                pos = content.find(';', line_end, limit)
+            
+            return self._line_span(line_starts, start_idx, window_end)
         except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
+            return self._line_span(line_starts, start_line - 1, start_line)
     
-    def _extract_cobol_block(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract COBOL division or section block"""
+    def _extract_cobol_block(self, lines: List[str], line_starts: List[int], start_line: int) -> CodeSpan:
+        """Span of a COBOL division or section block"""
         try:
             start_idx = start_line - 1
             end_idx = start_idx
@@ -1241,14 +1254,13 @@ class ASTParser:
             # Find the end of the division/section
             for i in range(start_idx + 1, len(lines)):
                 line = lines[i].strip()
-                if line and (line.startswith('DIVISION') or line.startswith('SECTION') or 
-                           line.startswith('PROCEDURE') or line.startswith('DATA')):
+                if line.startswith(self._COBOL_BLOCK_END_PREFIXES):
                     break
                 end_idx = i + 1
             
-            return '\n'.join(lines[start_idx:end_idx])
+            return self._line_span(line_starts, start_idx, end_idx)
         except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
+            return self._line_span(line_starts, start_line - 1, start_line)
     
     def _extract_cobol_data_item(self, lines: List[str], start_line: int, content: str) -> str:
         """Extract COBOL data item declaration"""
@@ -1259,7 +1271,7 @@ class ASTParser:
             # Look for period or next data item
             for i in range(start_idx + 1, min(start_idx + 3, len(lines))):
                 next_line = lines[i].strip()
-                if next_line.startswith('.') or re.match(r'^\d{2}\s+', next_line):
+                if next_line.startswith('.') or self._COBOL_LEVEL_RE.match(next_line):
                     break
                 line += '\n' + next_line
             
@@ -1267,434 +1279,120 @@ class ASTParser:
         except:
             return lines[start_line - 1] if start_line <= len(lines) else ""
     
-    def _ast_to_dict(self, node) -> Dict[str, Any]:
-        """Convert AST node to dictionary"""
-        if isinstance(node, ast.AST):
-            result = {
-                'node_type': node.__class__.__name__,
-                'lineno': getattr(node, 'lineno', None),
-                'col_offset': getattr(node, 'col_offset', None)
-            }
-            
-            for field, value in ast.iter_fields(node):
-                result[field] = self._ast_to_dict(value)
-            
+    def _python_tree_to_dict(self, tree: ast.AST, line_starts: List[int]) -> Tuple[Dict[str, Any], List[str], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Convert a Python AST to dictionaries, collecting imports, functions, classes and variables in the same traversal"""
+        # (depth, section, entry) in pre-order; a stable sort by depth gives ast.walk's breadth-first order
+        found = []
+        node_span = self._node_span
+        Import, ImportFrom, FunctionDef, ClassDef, Assign, Name = ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef, ast.Assign, ast.Name
+        AST = ast.AST
+        plain_types = (str, int, float, bool)
+        
+        def convert_value(value, depth):
+            if isinstance(value, AST):
+                return convert(value, depth)
+            elif isinstance(value, list):
+                return [convert_value(item, depth) for item in value]
+            elif value is None or type(value) in plain_types:
+                return value
+            else:
+                # Constants JSON has no type for (bytes, complex, Ellipsis)
+                return str(value)
+        
+        def convert(node, depth):
+            node_type = type(node)
+            
+            if node_type is Import:
+                for alias in node.names:
+                    found.append((depth, 0, alias.name))
+            
+            elif node_type is ImportFrom:
+                module = node.module or ""
+                for alias in node.names:
+                    found.append((depth, 0, f"{module}.{alias.name}"))
+            
+            # Functions, with code stored as spans into full_source_code
+            elif node_type is FunctionDef:
+                found.append((depth, 1, {
+                    "name": node.name,
+                    "line": node.lineno,
+                    "args": [arg.arg for arg in node.args.args],
+                    "decorators": [d.id for d in node.decorator_list if hasattr(d, 'id')],
+                    "body_span": node_span(node, line_starts),
+                    "full_code_span": node_span(node, line_starts, include_decorators=True)
+                }))
+            
+            # Classes, with code stored as spans into full_source_code
+            elif node_type is ClassDef:
+                class_methods = []
+                for child in node.body:
+                    if type(child) is FunctionDef:
+                        class_methods.append({
+                            "name": child.name,
+                            "line": child.lineno,
+                            "body_span": node_span(child, line_starts)
+                        })
+                
+                found.append((depth, 2, {
+                    "name": node.name,
+                    "line": node.lineno,
+                    "bases": [base.id for base in node.bases if hasattr(base, 'id')],
+                    "methods": class_methods,
+                    "body_span": node_span(node, line_starts),
+                    "full_code_span": node_span(node, line_starts, include_decorators=True)
+                }))
+            
+            # Variables with values
+            elif node_type is Assign:
+                for target in node.targets:
+                    if type(target) is Name:
+                        found.append((depth, 3, {
+                            "name": target.id,
+                            "line": node.lineno,
+                            "value": ast.unparse(node.value) if hasattr(ast, 'unparse') else str(node.value),
+                            "full_assignment_span": node_span(node, line_starts)
+                        }))
+            
+            # Unset (None) and empty-list fields are left out; absent means "none"
+            result = {'node_type': node_type.__name__}
+            lineno = getattr(node, 'lineno', None)
+            if lineno is not None:
+                result['lineno'] = lineno
+                result['col_offset'] = node.col_offset
+            child_depth = depth + 1
+            for field in node._fields:
+                value = getattr(node, field, None)
+                if value is None or (type(value) is list and not value):
+                    continue
+                result[field] = convert_value(value, child_depth)
             return result
-        elif isinstance(node, list):
-            return [self._ast_to_dict(item) for item in node]
-        else:
-            return node 
+        
+        ast_tree = convert(tree, 0)
+        
+        found.sort(key=itemgetter(0))
+        sections = ([], [], [], [])
+        for _, section, entry in found:
+            sections[section].append(entry)
+        imports, functions, classes, variables = sections
+        return ast_tree, imports, functions, classes, variables
 
-    async def _parse_go_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_go_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse Go file and create AST structure with full code"""
-        try:
-            ast_tree = {
-                "node_type": "GoFile",
-                "children": []
-            }
-            
-            lines = content.split('\n')
-            imports = []
-            functions = []
-            classes = []
-            variables = []
-            
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # Extract package declaration
-                if line.startswith('package '):
-                    package_name = line[8:]
-                    ast_tree["children"].append({
-                        "node_type": "PackageDeclaration",
-                        "line": i,
-                        "package": package_name
-                    })
-                
-                # Extract imports
-                elif line.startswith('import '):
-                    import_stmt = line[7:].strip('"')
-                    imports.append(import_stmt)
-                    ast_tree["children"].append({
-                        "node_type": "ImportDeclaration",
-                        "line": i,
-                        "import": import_stmt
-                    })
-                
-                # Extract function declarations with full body
-                elif re.match(r'func\s+\w+\s*\(', line):
-                    func_match = re.search(r'func\s+(\w+)', line)
-                    if func_match:
-                        func_name = func_match.group(1)
-                        func_code = self._extract_code_block(lines, i, content)
-                        functions.append({
-                            "name": func_name,
-                            "line": i,
-                            "type": "function",
-                            "full_code": func_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "FunctionDeclaration",
-                            "name": func_name,
-                            "line": i,
-                            "full_code": func_code
-                        })
-                
-                # Extract struct declarations with full body
-                elif line.startswith('type ') and 'struct' in line:
-                    struct_match = re.search(r'type\s+(\w+)', line)
-                    if struct_match:
-                        struct_name = struct_match.group(1)
-                        struct_code = self._extract_code_block(lines, i, content)
-                        classes.append({
-                            "name": struct_name,
-                            "line": i,
-                            "type": "struct",
-                            "full_code": struct_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "StructDeclaration",
-                            "name": struct_name,
-                            "line": i,
-                            "full_code": struct_code
-                        })
-                
-                # Extract variable declarations with full assignment
-                elif re.match(r'(var|const)\s+\w+', line):
-                    var_match = re.search(r'(var|const)\s+(\w+)', line)
-                    if var_match:
-                        var_kind = var_match.group(1)
-                        var_name = var_match.group(2)
-                        var_code = self._extract_variable_declaration(lines, i, content)
-                        variables.append({
-                            "name": var_name,
-                            "kind": var_kind,
-                            "line": i,
-                            "full_code": var_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "VariableDeclaration",
-                            "name": var_name,
-                            "line": i,
-                            "kind": var_kind,
-                            "full_code": var_code
-                        })
-            
-            return {
-                "file_path": file_path,
-                "language": "go",
-                "imports": imports,
-                "functions": functions,
-                "classes": classes,
-                "variables": variables,
-                "ast_tree": ast_tree,
-                "full_source_code": content
-            }
-            
-        except Exception as e:
-            print(f"Failed to parse Go file {file_path}: {str(e)}")
-            return None
+        return self._parse_regex_language(file_path, content, 'go')
     
-    async def _parse_rust_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_rust_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse Rust file and create AST structure with full code"""
-        try:
-            ast_tree = {
-                "node_type": "RustFile",
-                "children": []
-            }
-            
-            lines = content.split('\n')
-            imports = []
-            functions = []
-            classes = []
-            variables = []
-            
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # Extract use statements (imports)
-                if line.startswith('use '):
-                    use_stmt = line[4:].rstrip(';')
-                    imports.append(use_stmt)
-                    ast_tree["children"].append({
-                        "node_type": "UseDeclaration",
-                        "line": i,
-                        "use": use_stmt
-                    })
-                
-                # Extract function declarations with full body
-                elif re.match(r'fn\s+\w+\s*\(', line):
-                    func_match = re.search(r'fn\s+(\w+)', line)
-                    if func_match:
-                        func_name = func_match.group(1)
-                        func_code = self._extract_code_block(lines, i, content)
-                        functions.append({
-                            "name": func_name,
-                            "line": i,
-                            "type": "function",
-                            "full_code": func_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "FunctionDeclaration",
-                            "name": func_name,
-                            "line": i,
-                            "full_code": func_code
-                        })
-                
-                # Extract struct declarations with full body
-                elif line.startswith('struct ') or line.startswith('pub struct '):
-                    struct_match = re.search(r'struct\s+(\w+)', line)
-                    if struct_match:
-                        struct_name = struct_match.group(1)
-                        struct_code = self._extract_code_block(lines, i, content)
-                        classes.append({
-                            "name": struct_name,
-                            "line": i,
-                            "type": "struct",
-                            "full_code": struct_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "StructDeclaration",
-                            "name": struct_name,
-                            "line": i,
-                            "full_code": struct_code
-                        })
-                
-                # Extract variable declarations with full assignment
-                elif re.match(r'let\s+\w+', line):
-                    var_match = re.search(r'let\s+(\w+)', line)
-                    if var_match:
-                        var_name = var_match.group(1)
-                        var_code = self._extract_variable_declaration(lines, i, content)
-                        variables.append({
-                            "name": var_name,
-                            "kind": "let",
-                            "line": i,
-                            "full_code": var_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "VariableDeclaration",
-                            "name": var_name,
-                            "line": i,
-                            "kind": "let",
-                            "full_code": var_code
-                        })
-            
-            return {
-                "file_path": file_path,
-                "language": "rust",
-                "imports": imports,
-                "functions": functions,
-                "classes": classes,
-                "variables": variables,
-                "ast_tree": ast_tree,
-                "full_source_code": content
-            }
-            
-        except Exception as e:
-            print(f"Failed to parse Rust file {file_path}: {str(e)}")
-            return None
+        return self._parse_regex_language(file_path, content, 'rust')
     
-    async def _parse_php_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_php_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse PHP file and create AST structure with full code"""
-        try:
-            ast_tree = {
-                "node_type": "PHPFile",
-                "children": []
-            }
-            
-            lines = content.split('\n')
-            imports = []
-            functions = []
-            classes = []
-            variables = []
-            
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # Extract require/include statements
-                if line.startswith('require ') or line.startswith('include ') or line.startswith('require_once ') or line.startswith('include_once '):
-                    import_stmt = line
-                    imports.append(import_stmt)
-                    ast_tree["children"].append({
-                        "node_type": "IncludeDeclaration",
-                        "line": i,
-                        "include": import_stmt
-                    })
-                
-                # Extract function declarations with full body
-                elif re.match(r'function\s+\w+\s*\(', line):
-                    func_match = re.search(r'function\s+(\w+)', line)
-                    if func_match:
-                        func_name = func_match.group(1)
-                        func_code = self._extract_code_block(lines, i, content)
-                        functions.append({
-                            "name": func_name,
-                            "line": i,
-                            "type": "function",
-                            "full_code": func_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "FunctionDeclaration",
-                            "name": func_name,
-                            "line": i,
-                            "full_code": func_code
-                        })
-                
-                # Extract class declarations with full body
-                elif line.startswith('class '):
-                    class_match = re.search(r'class\s+(\w+)', line)
-                    if class_match:
-                        class_name = class_match.group(1)
-                        class_code = self._extract_code_block(lines, i, content)
-                        classes.append({
-                            "name": class_name,
-                            "line": i,
-                            "full_code": class_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "ClassDeclaration",
-                            "name": class_name,
-                            "line": i,
-                            "full_code": class_code
-                        })
-                
-                # Extract variable declarations with full assignment
-                elif re.match(r'\$\w+\s*=', line):
-                    var_match = re.search(r'\$(\w+)', line)
-                    if var_match:
-                        var_name = var_match.group(1)
-                        var_code = self._extract_variable_declaration(lines, i, content)
-                        variables.append({
-                            "name": var_name,
-                            "kind": "variable",
-                            "line": i,
-                            "full_code": var_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "VariableDeclaration",
-                            "name": var_name,
-                            "line": i,
-                            "kind": "variable",
-                            "full_code": var_code
-                        })
-            
-            return {
-                "file_path": file_path,
-                "language": "php",
-                "imports": imports,
-                "functions": functions,
-                "classes": classes,
-                "variables": variables,
-                "ast_tree": ast_tree,
-                "full_source_code": content
-            }
-            
-        except Exception as e:
-            print(f"Failed to parse PHP file {file_path}: {str(e)}")
-            return None
+        return self._parse_regex_language(file_path, content, 'php')
     
-    async def _parse_ruby_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_ruby_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse Ruby file and create AST structure with full code"""
-        try:
-            ast_tree = {
-                "node_type": "RubyFile",
-                "children": []
-            }
-            
-            lines = content.split('\n')
-            imports = []
-            functions = []
-            classes = []
-            variables = []
-            
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # Extract require statements
-                if line.startswith('require ') or line.startswith('require_relative '):
-                    import_stmt = line
-                    imports.append(import_stmt)
-                    ast_tree["children"].append({
-                        "node_type": "RequireDeclaration",
-                        "line": i,
-                        "require": import_stmt
-                    })
-                
-                # Extract method definitions with full body
-                elif re.match(r'def\s+\w+', line):
-                    method_match = re.search(r'def\s+(\w+)', line)
-                    if method_match:
-                        method_name = method_match.group(1)
-                        method_code = self._extract_code_block(lines, i, content)
-                        functions.append({
-                            "name": method_name,
-                            "line": i,
-                            "type": "method",
-                            "full_code": method_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "MethodDeclaration",
-                            "name": method_name,
-                            "line": i,
-                            "full_code": method_code
-                        })
-                
-                # Extract class declarations with full body
-                elif line.startswith('class '):
-                    class_match = re.search(r'class\s+(\w+)', line)
-                    if class_match:
-                        class_name = class_match.group(1)
-                        class_code = self._extract_code_block(lines, i, content)
-                        classes.append({
-                            "name": class_name,
-                            "line": i,
-                            "full_code": class_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "ClassDeclaration",
-                            "name": class_name,
-                            "line": i,
-                            "full_code": class_code
-                        })
-                
-                # Extract variable declarations with full assignment
-                elif re.match(r'@\w+\s*=', line) or re.match(r'@@\w+\s*=', line) or re.match(r'\$\w+\s*=', line):
-                    var_match = re.search(r'(@@?|\$)(\w+)', line)
-                    if var_match:
-                        var_prefix = var_match.group(1)
-                        var_name = var_match.group(2)
-                        var_code = self._extract_variable_declaration(lines, i, content)
-                        variables.append({
-                            "name": var_name,
-                            "kind": "instance" if var_prefix == "@" else "class" if var_prefix == "@@" else "global",
-                            "line": i,
-                            "full_code": var_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "VariableDeclaration",
-                            "name": var_name,
-                            "line": i,
-                            "kind": "instance" if var_prefix == "@" else "class" if var_prefix == "@@" else "global",
-                            "full_code": var_code
-                        })
-            
-            return {
-                "file_path": file_path,
-                "language": "ruby",
-                "imports": imports,
-                "functions": functions,
-                "classes": classes,
-                "variables": variables,
-                "ast_tree": ast_tree,
-                "full_source_code": content
-            }
-            
-        except Exception as e:
-            print(f"Failed to parse Ruby file {file_path}: {str(e)}")
-            return None
+        return self._parse_regex_language(file_path, content, 'ruby')
     
-    async def _parse_sql_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_sql_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse SQL file and create AST structure with full code"""
         try:
             ast_tree = {
@@ -1702,91 +1400,48 @@ class ASTParser:
                 "children": []
             }
             
-            lines = content.split('\n')
+            line_starts = self._compute_line_starts(content)
             imports = []
             functions = []
             classes = []
             variables = []
             
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
+            for i, match in self._iter_line_matches(self._SQL_STATEMENT_RE, content):
+                # Only the leading word is uppercased; interned so every statement shares the keyword
+                keyword = sys.intern(match.group(1).upper())
+                node_type = self._SQL_STATEMENTS.get(keyword)
+                if node_type is None:
+                    continue
+                statement_code = self._extract_sql_statement(content, line_starts, i)
                 
-                # Extract CREATE statements
-                if line.upper().startswith('CREATE '):
-                    create_type = line.split()[1].upper()
-                    create_code = self._extract_sql_statement(lines, i, content)
+                # CREATE statements are named after the object type they create
+                if keyword == 'CREATE':
+                    line = content[line_starts[i - 1]:line_starts[i] - 1].strip()
+                    create_type = sys.intern(line.split()[1].upper())
                     functions.append({
                         "name": f"CREATE_{create_type}",
                         "line": i,
                         "type": "create",
-                        "full_code": create_code
+                        "full_code_span": statement_code
                     })
                     ast_tree["children"].append({
-                        "node_type": "CreateStatement",
+                        "node_type": node_type,
                         "type": create_type,
                         "line": i,
-                        "full_code": create_code
-                    })
-                
-                # Extract INSERT statements
-                elif line.upper().startswith('INSERT '):
-                    insert_code = self._extract_sql_statement(lines, i, content)
-                    functions.append({
-                        "name": "INSERT",
-                        "line": i,
-                        "type": "insert",
-                        "full_code": insert_code
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "InsertStatement",
-                        "line": i,
-                        "full_code": insert_code
+                        "full_code_span": statement_code
                     })
                 
-                # Extract SELECT statements
-                elif line.upper().startswith('SELECT '):
-                    select_code = self._extract_sql_statement(lines, i, content)
-                    functions.append({
-                        "name": "SELECT",
-                        "line": i,
-                        "type": "select",
-                        "full_code": select_code
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "SelectStatement",
-                        "line": i,
-                        "full_code": select_code
-                    })
-                
-                # Extract UPDATE statements
-                elif line.upper().startswith('UPDATE '):
-                    update_code = self._extract_sql_statement(lines, i, content)
-                    functions.append({
-                        "name": "UPDATE",
-                        "line": i,
-                        "type": "update",
-                        "full_code": update_code
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "UpdateStatement",
-                        "line": i,
-                        "full_code": update_code
-                    })
-                
-                # Extract DELETE statements
-                elif line.upper().startswith('DELETE '):
-                    delete_code = self._extract_sql_statement(lines, i, content)
-                    functions.append({
-                        "name": "DELETE",
-                        "line": i,
-                        "type": "delete",
-                        "full_code": delete_code
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "DeleteStatement",
+                # INSERT, SELECT, UPDATE and DELETE statements share one dict between both lists
+                else:
+                    statement_node = {
+                        "node_type": node_type,
+                        "name": keyword,
                         "line": i,
-                        "full_code": delete_code
-                    })
+                        "type": sys.intern(keyword.lower()),
+                        "full_code_span": statement_code
+                    }
+                    functions.append(statement_node)
+                    ast_tree["children"].append(statement_node)
             
             return {
                 "file_path": file_path,
@@ -1800,10 +1455,10 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse SQL file {file_path}: {str(e)}")
+            logger.warning("Failed to parse SQL file %s: %s", file_path, e)
             return None
     
-    async def _parse_html_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_html_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse HTML file and create AST structure with full code"""
         try:
             ast_tree = {
@@ -1811,44 +1466,47 @@ class ASTParser:
                 "children": []
             }
             
-            lines = content.split('\n')
+            line_starts = self._compute_line_starts(content)
             imports = []
             functions = []
             classes = []
             variables = []
             
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
+            # Only lines holding one of the tags are looked at: search for the next tag, classify
+            # its whole line, then resume on the following line
+            search = self._HTML_TAG_RE.search
+            match = search(content)
+            while match:
+                line_idx = bisect_right(line_starts, match.start()) - 1
+                i = line_idx + 1
+                line = content[line_starts[line_idx]:line_starts[i] - 1].strip()
+                match = search(content, line_starts[i])
                 
                 # Extract script tags
                 if '<script' in line:
-                    script_code = self._extract_html_tag(lines, i, content, 'script')
-                    functions.append({
+                    script_code = self._extract_html_tag(content, line_starts, i, 'script')
+                    script_node = {
+                        "node_type": "ScriptTag",
                         "name": "script",
                         "line": i,
                         "type": "script",
-                        "full_code": script_code
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "ScriptTag",
-                        "line": i,
-                        "full_code": script_code
-                    })
+                        "full_code_span": script_code
+                    }
+                    functions.append(script_node)
+                    ast_tree["children"].append(script_node)
                 
                 # Extract style tags
                 elif '<style' in line:
-                    style_code = self._extract_html_tag(lines, i, content, 'style')
-                    functions.append({
+                    style_code = self._extract_html_tag(content, line_starts, i, 'style')
+                    style_node = {
+                        "node_type": "StyleTag",
                         "name": "style",
                         "line": i,
                         "type": "style",
-                        "full_code": style_code
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "StyleTag",
-                        "line": i,
-                        "full_code": style_code
-                    })
+                        "full_code_span": style_code
+                    }
+                    functions.append(style_node)
+                    ast_tree["children"].append(style_node)
                 
                 # Extract link tags (imports)
                 elif '<link' in line:
@@ -1863,17 +1521,15 @@ class ASTParser:
                 # Extract meta tags
                 elif '<meta' in line:
                     meta_code = line
-                    variables.append({
+                    meta_node = {
+                        "node_type": "MetaTag",
                         "name": "meta",
                         "line": i,
                         "type": "meta",
                         "full_code": meta_code
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "MetaTag",
-                        "line": i,
-                        "full_code": meta_code
-                    })
+                    }
+                    variables.append(meta_node)
+                    ast_tree["children"].append(meta_node)
             
             return {
                 "file_path": file_path,
@@ -1887,10 +1543,10 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse HTML file {file_path}: {str(e)}")
+            logger.warning("Failed to parse HTML file %s: %s", file_path, e)
             return None
     
-    async def _parse_css_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_css_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse CSS file and create AST structure with full code"""
         try:
             ast_tree = {
@@ -1898,18 +1554,17 @@ class ASTParser:
                 "children": []
             }
             
-            lines = content.split('\n')
+            line_starts = self._compute_line_starts(content)
             imports = []
             functions = []
             classes = []
             variables = []
-            
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
+            
+            for i, kind, value in self._scan_css_lines(content, line_starts):
                 
                 # Extract @import statements
-                if line.startswith('@import '):
-                    import_stmt = line
+                if kind == 'import':
+                    import_stmt = value
                     imports.append(import_stmt)
                     ast_tree["children"].append({
                         "node_type": "ImportRule",
@@ -1917,24 +1572,19 @@ class ASTParser:
                         "import": import_stmt
                     })
                 
-                # Extract CSS rules
-                elif re.match(r'^[.#]?\w+', line) and '{' in line:
-                    rule_match = re.search(r'^([.#]?\w+)', line)
-                    if rule_match:
-                        rule_name = rule_match.group(1)
-                        rule_code = self._extract_css_rule(lines, i, content)
-                        classes.append({
-                            "name": rule_name,
-                            "line": i,
-                            "type": "css_rule",
-                            "full_code": rule_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "CSSRule",
-                            "name": rule_name,
-                            "line": i,
-                            "full_code": rule_code
-                        })
+                # Extract CSS rules (selector lines opening a block)
+                else:
+                    rule_name = value
+                    rule_code = self._extract_css_rule(content, line_starts, i)
+                    rule_node = {
+                        "node_type": "CSSRule",
+                        "name": rule_name,
+                        "line": i,
+                        "type": "css_rule",
+                        "full_code_span": rule_code
+                    }
+                    classes.append(rule_node)
+                    ast_tree["children"].append(rule_node)
             
             return {
                 "file_path": file_path,
@@ -1948,10 +1598,41 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse CSS file {file_path}: {str(e)}")
+            logger.warning("Failed to parse CSS file %s: %s", file_path, e)
             return None
     
-    async def _parse_xml_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _scan_css_lines(self, content: str, line_starts: List[int]) -> List[Tuple[int, str, str]]:
+        """(line, 'import' | 'rule', import statement | selector) for @import and rule-opening lines"""
+        found = []
+        
+        # Rule lines contain '{': jump between braces so declaration lines are never looked at,
+        # then check that the line starts with a selector
+        pos = content.find('{')
+        while pos != -1:
+            line_idx = bisect_right(line_starts, pos) - 1
+            line_end = line_starts[line_idx + 1] - 1
+            selector_match = self._CSS_SELECTOR_RE.match(content, line_starts[line_idx], line_end)
+            if selector_match:
+                found.append((line_idx + 1, 'rule', selector_match.group(1)))
+            pos = content.find('{', line_end)
+        
+        # Imports are lines starting with '@import ' and something after it
+        pos = content.find('@import ')
+        while pos != -1:
+            line_idx = bisect_right(line_starts, pos) - 1
+            line_start = line_starts[line_idx]
+            line_end = line_starts[line_idx + 1] - 1
+            if pos == line_start or content[line_start:pos].isspace():
+                import_stmt = content[pos:line_end].rstrip()
+                if len(import_stmt) > 8:
+                    found.append((line_idx + 1, 'import', import_stmt))
+            pos = content.find('@import ', line_end)
+        
+        # A line is either one or the other, so ordering by line restores file order
+        found.sort()
+        return found
+    
+    def _parse_xml_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse XML file and create AST structure with full code"""
         try:
             ast_tree = {
@@ -1959,53 +1640,42 @@ class ASTParser:
                 "children": []
             }
             
-            lines = content.split('\n')
+            line_starts = self._compute_line_starts(content)
             imports = []
             functions = []
             classes = []
             variables = []
             
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # Extract XML declarations
-                if line.startswith('<?xml'):
-                    declaration = line
-                    imports.append(declaration)
-                    ast_tree["children"].append({
-                        "node_type": "XMLDeclaration",
-                        "line": i,
-                        "declaration": declaration
-                    })
+            for i, match in self._iter_line_matches(self._XML_LINE_RE, content):
+                kind = match.lastgroup
+                line = match.group(kind).rstrip()
                 
-                # Extract DOCTYPE declarations
-                elif line.startswith('<!DOCTYPE'):
-                    doctype = line
-                    imports.append(doctype)
+                # Extract XML and DOCTYPE declarations
+                if kind in self._XML_DECLARATIONS:
+                    imports.append(line)
                     ast_tree["children"].append({
-                        "node_type": "DOCTYPEDeclaration",
+                        "node_type": self._XML_DECLARATIONS[kind],
                         "line": i,
-                        "doctype": doctype
+                        kind: line
                     })
                 
-                # Extract element tags
-                elif re.match(r'^<[^/!]', line):
-                    element_match = re.search(r'<(\w+)', line)
-                    if element_match:
-                        element_name = element_match.group(1)
-                        element_code = self._extract_xml_element(lines, i, content)
-                        classes.append({
-                            "name": element_name,
-                            "line": i,
-                            "type": "xml_element",
-                            "full_code": element_code
-                        })
-                        ast_tree["children"].append({
+                # Extract element tags; a tag not named right after '<' takes the first name later on
+                else:
+                    element_name = match.group("name")
+                    if element_name is None:
+                        element_match = self._XML_TAG_NAME_RE.search(line)
+                        element_name = element_match.group(1) if element_match else None
+                    if element_name:
+                        element_code = self._extract_xml_element(content, line_starts, i)
+                        element_node = {
                             "node_type": "XMLElement",
                             "name": element_name,
                             "line": i,
-                            "full_code": element_code
-                        })
+                            "type": "xml_element",
+                            "full_code_span": element_code
+                        }
+                        classes.append(element_node)
+                        ast_tree["children"].append(element_node)
             
             return {
                 "file_path": file_path,
@@ -2019,10 +1689,10 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse XML file {file_path}: {str(e)}")
+            logger.warning("Failed to parse XML file %s: %s", file_path, e)
             return None
     
-    async def _parse_json_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_json_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse JSON file and create AST structure with full code"""
         try:
             ast_tree = {
@@ -2030,13 +1700,18 @@ class ASTParser:
                 "children": []
             }
             
-            # Parse JSON content
+            # Parse JSON content (orjson when installed; its decode errors are JSONDecodeErrors too)
             try:
-                json_data = json.loads(content)
-                ast_tree["children"].append({
+                json_data = json_codec.loads(content)
+                # Only a summary is kept; the document itself stays in full_source_code
+                root_node = {
                     "node_type": "JSONRoot",
-                    "data": json_data
-                })
+                    "type": type(json_data).__name__,
+                    "size": len(content)
+                }
+                if isinstance(json_data, dict):
+                    root_node["top_level_keys"] = list(json_data)
+                ast_tree["children"].append(root_node)
             except json.JSONDecodeError:
                 # If not valid JSON, treat as text
                 ast_tree["children"].append({
@@ -2056,10 +1731,10 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse JSON file {file_path}: {str(e)}")
+            logger.warning("Failed to parse JSON file %s: %s", file_path, e)
             return None
     
-    async def _parse_yaml_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_yaml_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse YAML file and create AST structure with full code"""
         try:
             ast_tree = {
@@ -2073,29 +1748,28 @@ class ASTParser:
             classes = []
             variables = []
             
-            # Parse YAML structure
+            # Parse YAML structure; lines without a ':' are skipped before any stripping
             for i, line in enumerate(lines, 1):
+                if ':' not in line:
+                    continue
                 line = line.strip()
                 
                 # Extract key-value pairs
-                if ':' in line and not line.startswith('#'):
-                    key_value = line.split(':', 1)
-                    if len(key_value) == 2:
-                        key = key_value[0].strip()
-                        value = key_value[1].strip()
-                        variables.append({
-                            "name": key,
-                            "line": i,
-                            "type": "yaml_key",
-                            "full_code": line
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "YAMLKeyValue",
-                            "key": key,
-                            "value": value,
-                            "line": i,
-                            "full_code": line
-                        })
+                if not line.startswith('#'):
+                    key, _, value = line.partition(':')
+                    key = key.rstrip()
+                    # One dict serves as both the variable entry and the tree node
+                    key_node = {
+                        "node_type": "YAMLKeyValue",
+                        "name": key,
+                        "key": key,
+                        "value": value.strip(),
+                        "line": i,
+                        "type": "yaml_key",
+                        "full_code": line
+                    }
+                    variables.append(key_node)
+                    ast_tree["children"].append(key_node)
             
             return {
                 "file_path": file_path,
@@ -2109,10 +1783,10 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse YAML file {file_path}: {str(e)}")
+            logger.warning("Failed to parse YAML file %s: %s", file_path, e)
             return None
     
-    async def _parse_toml_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_toml_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse TOML file and create AST structure with full code"""
         try:
             ast_tree = {
@@ -2121,50 +1795,54 @@ class ASTParser:
             }
             
             lines = content.split('\n')
+            line_starts = self._compute_line_starts(content, lines)
             imports = []
             functions = []
             classes = []
             variables = []
             
+            # The section being read; its span is set when the next header (or the end) is reached
+            open_section = None
             for i, line in enumerate(lines, 1):
+                # Lines with neither a section bracket nor an '=' are skipped before any stripping
+                if '=' not in line and '[' not in line:
+                    continue
                 line = line.strip()
+                first_char = line[:1]
                 
                 # Extract sections
-                if line.startswith('[') and line.endswith(']'):
-                    section_name = line[1:-1]
-                    section_code = self._extract_toml_section(lines, i, content)
-                    classes.append({
-                        "name": section_name,
-                        "line": i,
-                        "type": "toml_section",
-                        "full_code": section_code
-                    })
-                    ast_tree["children"].append({
+                if first_char == '[' and line[-1:] == ']':
+                    if open_section is not None:
+                        self._close_section(line_starts, open_section, i)
+                    # One dict serves as both the class entry and the tree node
+                    section_node = {
                         "node_type": "TOMLSection",
-                        "name": section_name,
+                        "name": line[1:-1],
                         "line": i,
-                        "full_code": section_code
-                    })
+                        "type": "toml_section",
+                        "full_code_span": None
+                    }
+                    classes.append(section_node)
+                    ast_tree["children"].append(section_node)
+                    open_section = (i, section_node)
                 
                 # Extract key-value pairs
-                elif '=' in line and not line.startswith('#'):
-                    key_value = line.split('=', 1)
-                    if len(key_value) == 2:
-                        key = key_value[0].strip()
-                        value = key_value[1].strip()
-                        variables.append({
-                            "name": key,
-                            "line": i,
-                            "type": "toml_key",
-                            "full_code": line
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "TOMLKeyValue",
-                            "key": key,
-                            "value": value,
-                            "line": i,
-                            "full_code": line
-                        })
+                elif first_char != '#' and '=' in line:
+                    key, _, value = line.partition('=')
+                    key = key.rstrip()
+                    key_node = {
+                        "node_type": "TOMLKeyValue",
+                        "name": key,
+                        "key": key,
+                        "value": value.strip(),
+                        "line": i,
+                        "type": "toml_key",
+                        "full_code": line
+                    }
+                    variables.append(key_node)
+                    ast_tree["children"].append(key_node)
+            if open_section is not None:
+                self._close_section(line_starts, open_section, len(line_starts))
             
             return {
                 "file_path": file_path,
@@ -2178,10 +1856,10 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse TOML file {file_path}: {str(e)}")
+            logger.warning("Failed to parse TOML file %s: %s", file_path, e)
             return None
     
-    async def _parse_ini_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_ini_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse INI file and create AST structure with full code"""
         try:
             ast_tree = {
@@ -2190,50 +1868,54 @@ class ASTParser:
             }
             
             lines = content.split('\n')
+            line_starts = self._compute_line_starts(content, lines)
             imports = []
             functions = []
             classes = []
             variables = []
             
+            # The section being read; its span is set when the next header (or the end) is reached
+            open_section = None
             for i, line in enumerate(lines, 1):
+                # Lines with neither a section bracket nor an '=' are skipped before any stripping
+                if '=' not in line and '[' not in line:
+                    continue
                 line = line.strip()
+                first_char = line[:1]
                 
                 # Extract sections
-                if line.startswith('[') and line.endswith(']'):
-                    section_name = line[1:-1]
-                    section_code = self._extract_ini_section(lines, i, content)
-                    classes.append({
-                        "name": section_name,
-                        "line": i,
-                        "type": "ini_section",
-                        "full_code": section_code
-                    })
-                    ast_tree["children"].append({
+                if first_char == '[' and line[-1:] == ']':
+                    if open_section is not None:
+                        self._close_section(line_starts, open_section, i)
+                    # One dict serves as both the class entry and the tree node
+                    section_node = {
                         "node_type": "INISection",
-                        "name": section_name,
+                        "name": line[1:-1],
                         "line": i,
-                        "full_code": section_code
-                    })
+                        "type": "ini_section",
+                        "full_code_span": None
+                    }
+                    classes.append(section_node)
+                    ast_tree["children"].append(section_node)
+                    open_section = (i, section_node)
                 
                 # Extract key-value pairs
-                elif '=' in line and not line.startswith('#'):
-                    key_value = line.split('=', 1)
-                    if len(key_value) == 2:
-                        key = key_value[0].strip()
-                        value = key_value[1].strip()
-                        variables.append({
-                            "name": key,
-                            "line": i,
-                            "type": "ini_key",
-                            "full_code": line
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "INIKeyValue",
-                            "key": key,
-                            "value": value,
-                            "line": i,
-                            "full_code": line
-                        })
+                elif first_char != '#' and '=' in line:
+                    key, _, value = line.partition('=')
+                    key = key.rstrip()
+                    key_node = {
+                        "node_type": "INIKeyValue",
+                        "name": key,
+                        "key": key,
+                        "value": value.strip(),
+                        "line": i,
+                        "type": "ini_key",
+                        "full_code": line
+                    }
+                    variables.append(key_node)
+                    ast_tree["children"].append(key_node)
+            if open_section is not None:
+                self._close_section(line_starts, open_section, len(line_starts))
             
             return {
                 "file_path": file_path,
@@ -2247,10 +1929,10 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse INI file {file_path}: {str(e)}")
+            logger.warning("Failed to parse INI file %s: %s", file_path, e)
             return None
     
-    async def _parse_markdown_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_markdown_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse Markdown file and create AST structure with full code"""
         try:
             ast_tree = {
@@ -2259,46 +1941,58 @@ class ASTParser:
             }
             
             lines = content.split('\n')
+            line_starts = self._compute_line_starts(content, lines)
             imports = []
             functions = []
             classes = []
             variables = []
             
-            for i, line in enumerate(lines, 1):
-                line = line.strip()
+            # Every fence opens a block that runs through the next line starting with a fence;
+            # blocks still waiting for it are (start line, node)
+            open_blocks = []
+            for i, raw_line in enumerate(lines, 1):
+                if open_blocks and raw_line.startswith('```'):
+                    for start_line, block_node in open_blocks:
+                        block_node["full_code_span"] = self._line_span(line_starts, start_line - 1, i)
+                    open_blocks.clear()
+                line = raw_line.strip()
                 
                 # Extract headers
                 if line.startswith('#'):
-                    header_level = len(line) - len(line.lstrip('#'))
-                    header_text = line.lstrip('#').strip()
-                    functions.append({
-                        "name": f"header_{header_level}",
-                        "line": i,
-                        "type": "header",
-                        "full_code": line
-                    })
-                    ast_tree["children"].append({
+                    # One lstrip gives both the level and the text after the '#' run
+                    header_text = line.lstrip('#')
+                    header_level = len(line) - len(header_text)
+                    header_text = header_text.strip()
+                    # One dict serves as both the function entry and the tree node
+                    header_node = {
                         "node_type": "MarkdownHeader",
+                        "name": (self._MARKDOWN_HEADER_NAMES[header_level] if header_level < 7
+                                 else f"header_{header_level}"),
                         "level": header_level,
                         "text": header_text,
                         "line": i,
+                        "type": "header",
                         "full_code": line
-                    })
+                    }
+                    functions.append(header_node)
+                    ast_tree["children"].append(header_node)
                 
                 # Extract code blocks
                 elif line.startswith('```'):
-                    code_block = self._extract_markdown_code_block(lines, i, content)
-                    functions.append({
+                    block_node = {
+                        "node_type": "MarkdownCodeBlock",
                         "name": "code_block",
                         "line": i,
                         "type": "code_block",
-                        "full_code": code_block
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "MarkdownCodeBlock",
-                        "line": i,
-                        "full_code": code_block
-                    })
+                        "full_code_span": None
+                    }
+                    functions.append(block_node)
+                    ast_tree["children"].append(block_node)
+                    open_blocks.append((i, block_node))
+            
+            # Unterminated blocks keep an empty span
+            for _, block_node in open_blocks:
+                block_node["full_code_span"] = CodeSpan(0, 0)
             
             return {
                 "file_path": file_path,
@@ -2312,10 +2006,10 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse Markdown file {file_path}: {str(e)}")
+            logger.warning("Failed to parse Markdown file %s: %s", file_path, e)
             return None
     
-    async def _parse_dockerfile(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_dockerfile(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse Dockerfile and create AST structure with full code"""
         try:
             ast_tree = {
@@ -2328,12 +2022,19 @@ class ASTParser:
             functions = []
             classes = []
             variables = []
+            sections = {"functions": functions, "variables": variables}
             
             for i, line in enumerate(lines, 1):
                 line = line.strip()
                 
+                # The first word, uppercased once, picks the instruction
+                keyword, separator, _ = line.partition(' ')
+                if not separator:
+                    continue
+                keyword = keyword.upper()
+                
                 # Extract FROM instructions
-                if line.upper().startswith('FROM '):
+                if keyword == 'FROM':
                     from_instruction = line
                     imports.append(from_instruction)
                     ast_tree["children"].append({
@@ -2341,51 +2042,23 @@ class ASTParser:
                         "line": i,
                         "instruction": from_instruction
                     })
+                    continue
                 
-                # Extract RUN instructions
-                elif line.upper().startswith('RUN '):
-                    run_instruction = line
-                    functions.append({
-                        "name": "RUN",
-                        "line": i,
-                        "type": "run",
-                        "full_code": run_instruction
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "RUNInstruction",
-                        "line": i,
-                        "full_code": run_instruction
-                    })
-                
-                # Extract COPY instructions
-                elif line.upper().startswith('COPY '):
-                    copy_instruction = line
-                    functions.append({
-                        "name": "COPY",
-                        "line": i,
-                        "type": "copy",
-                        "full_code": copy_instruction
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "COPYInstruction",
-                        "line": i,
-                        "full_code": copy_instruction
-                    })
-                
-                # Extract ENV instructions
-                elif line.upper().startswith('ENV '):
-                    env_instruction = line
-                    variables.append({
-                        "name": "ENV",
-                        "line": i,
-                        "type": "environment",
-                        "full_code": env_instruction
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "ENVInstruction",
-                        "line": i,
-                        "full_code": env_instruction
-                    })
+                # Extract RUN, COPY and ENV instructions
+                instruction = self._DOCKERFILE_INSTRUCTIONS.get(keyword)
+                if instruction is None:
+                    continue
+                section, entry_type, node_type = instruction
+                # One dict serves as both the section entry and the tree node
+                instruction_node = {
+                    "node_type": node_type,
+                    "name": sys.intern(keyword),
+                    "line": i,
+                    "type": entry_type,
+                    "full_code": line
+                }
+                sections[section].append(instruction_node)
+                ast_tree["children"].append(instruction_node)
             
             return {
                 "file_path": file_path,
@@ -2399,10 +2072,10 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse Dockerfile {file_path}: {str(e)}")
+            logger.warning("Failed to parse Dockerfile %s: %s", file_path, e)
             return None
     
-    async def _parse_makefile(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_makefile(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse Makefile and create AST structure with full code"""
         try:
             ast_tree = {
@@ -2411,49 +2084,54 @@ class ASTParser:
             }
             
             lines = content.split('\n')
+            line_starts = self._compute_line_starts(content, lines)
             imports = []
             functions = []
             classes = []
             variables = []
             
+            # The target being read; it ends at the next line containing a ':'
+            open_target = None
             for i, line in enumerate(lines, 1):
+                # Lines with neither a ':' nor an '=' (most recipe lines) neither start nor end anything
+                if ':' not in line and '=' not in line:
+                    continue
                 line = line.strip()
+                if open_target is not None and ':' in line:
+                    self._close_section(line_starts, open_target, i)
+                    open_target = None
+                
+                match = self._MAKEFILE_LINE_RE.match(line)
+                if match is None:
+                    continue
                 
                 # Extract targets
-                if re.match(r'^\w+:', line):
-                    target_name = line.split(':')[0]
-                    target_code = self._extract_makefile_target(lines, i, content)
-                    functions.append({
-                        "name": target_name,
-                        "line": i,
-                        "type": "target",
-                        "full_code": target_code
-                    })
-                    ast_tree["children"].append({
+                if match.lastgroup == 'target':
+                    # One dict serves as both the function entry and the tree node
+                    target_node = {
                         "node_type": "MakefileTarget",
-                        "name": target_name,
+                        "name": match.group('target'),
                         "line": i,
-                        "full_code": target_code
-                    })
+                        "type": "target",
+                        "full_code_span": None
+                    }
+                    functions.append(target_node)
+                    ast_tree["children"].append(target_node)
+                    open_target = (i, target_node)
                 
                 # Extract variable assignments
-                elif '=' in line and not line.startswith('\t'):
-                    var_match = re.search(r'(\w+)\s*=', line)
-                    if var_match:
-                        var_name = var_match.group(1)
-                        var_code = line
-                        variables.append({
-                            "name": var_name,
-                            "line": i,
-                            "type": "makefile_var",
-                            "full_code": var_code
-                        })
-                        ast_tree["children"].append({
-                            "node_type": "MakefileVariable",
-                            "name": var_name,
-                            "line": i,
-                            "full_code": var_code
-                        })
+                else:
+                    var_node = {
+                        "node_type": "MakefileVariable",
+                        "name": match.group('variable'),
+                        "line": i,
+                        "type": "makefile_var",
+                        "full_code": line
+                    }
+                    variables.append(var_node)
+                    ast_tree["children"].append(var_node)
+            if open_target is not None:
+                self._close_section(line_starts, open_target, len(line_starts))
             
             return {
                 "file_path": file_path,
@@ -2467,10 +2145,10 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse Makefile {file_path}: {str(e)}")
+            logger.warning("Failed to parse Makefile %s: %s", file_path, e)
             return None
     
-    async def _parse_cmake_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    def _parse_cmake_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Parse CMake file and create AST structure with full code"""
         try:
             ast_tree = {
@@ -2479,58 +2157,36 @@ class ASTParser:
             }
             
             lines = content.split('\n')
+            line_starts = self._compute_line_starts(content, lines)
             imports = []
             functions = []
             classes = []
             variables = []
+            sections = {"functions": functions, "variables": variables}
             
             for i, line in enumerate(lines, 1):
+                # Every recorded command opens a parenthesis
+                if '(' not in line:
+                    continue
                 line = line.strip()
                 
-                # Extract project declarations
-                if line.startswith('project('):
-                    project_code = self._extract_cmake_command(lines, i, content)
-                    functions.append({
-                        "name": "project",
-                        "line": i,
-                        "type": "project",
-                        "full_code": project_code
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "CMakeProject",
-                        "line": i,
-                        "full_code": project_code
-                    })
-                
-                # Extract add_executable commands
-                elif line.startswith('add_executable('):
-                    exec_code = self._extract_cmake_command(lines, i, content)
-                    functions.append({
-                        "name": "add_executable",
-                        "line": i,
-                        "type": "add_executable",
-                        "full_code": exec_code
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "CMakeAddExecutable",
-                        "line": i,
-                        "full_code": exec_code
-                    })
-                
-                # Extract set commands
-                elif line.startswith('set('):
-                    set_code = self._extract_cmake_command(lines, i, content)
-                    variables.append({
-                        "name": "set",
-                        "line": i,
-                        "type": "cmake_set",
-                        "full_code": set_code
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "CMakeSet",
-                        "line": i,
-                        "full_code": set_code
-                    })
+                # The name before the first '(' picks the command with one lookup
+                command_name = line.partition('(')[0]
+                command = self._CMAKE_COMMANDS.get(command_name)
+                if command is None:
+                    continue
+                section, entry_type, node_type = command
+                
+                # One dict serves as both the section entry and the tree node
+                command_node = {
+                    "node_type": node_type,
+                    "name": sys.intern(command_name),
+                    "line": i,
+                    "type": entry_type,
+                    "full_code_span": self._extract_cmake_command(content, line_starts, i)
+                }
+                sections[section].append(command_node)
+                ast_tree["children"].append(command_node)
             
             return {
                 "file_path": file_path,
@@ -2544,14 +2200,14 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse CMake file {file_path}: {str(e)}")
+            logger.warning("Failed to parse CMake file %s: %s", file_path, e)
             return None
     
-    async def _parse_generic_file(self, file_path: str, content: str, language: str) -> Dict[str, Any]:
+    def _parse_generic_file(self, file_path: str, content: str, language: str) -> Dict[str, Any]:
         """Parse generic file and create basic AST structure"""
         try:
             ast_tree = {
-                "node_type": f"{language.capitalize()}File",
+                "node_type": sys.intern(f"{language.capitalize()}File"),
                 "children": []
             }
             
@@ -2566,18 +2222,17 @@ class ASTParser:
                 line = line.strip()
                 
                 if line:
-                    # Treat each non-empty line as a statement
-                    functions.append({
+                    # Treat each non-empty line as a statement, one dict for both lists
+                    statement_node = {
+                        "node_type": "Statement",
                         "name": f"line_{i}",
                         "line": i,
                         "type": "statement",
+                        "content": line,
                         "full_code": line
-                    })
-                    ast_tree["children"].append({
-                        "node_type": "Statement",
-                        "line": i,
-                        "content": line
-                    })
+                    }
+                    functions.append(statement_node)
+                    ast_tree["children"].append(statement_node)
             
             return {
                 "file_path": file_path,
@@ -2591,173 +2246,155 @@ class ASTParser:
             }
             
         except Exception as e:
-            print(f"Failed to parse generic file {file_path}: {str(e)}")
+            logger.warning("Failed to parse generic file %s: %s", file_path, e)
             return None
     
-    def _extract_sql_statement(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract complete SQL statement"""
-        try:
-            start_idx = start_line - 1
-            end_idx = start_idx
-            
-            # Find the end of the SQL statement (semicolon)
-            for i in range(start_idx, len(lines)):
-                line = lines[i]
-                if line.strip().endswith(';'):
-                    end_idx = i + 1
-                    break
-                elif line.strip() and not line.strip().startswith('--'):
-                    end_idx = i + 1
-            
-            return '\n'.join(lines[start_idx:end_idx])
-        except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
-    
-    def _extract_html_tag(self, lines: List[str], start_line: int, content: str, tag_name: str) -> str:
-        """Extract complete HTML tag content"""
-        try:
-            start_idx = start_line - 1
-            end_idx = start_idx
-            
-            # Find the closing tag
-            closing_tag = f"</{tag_name}>"
-            for i in range(start_idx, len(lines)):
-                line = lines[i]
-                if closing_tag in line:
-                    end_idx = i + 1
-                    break
-            
-            return '\n'.join(lines[start_idx:end_idx])
-        except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
-    
-    def _extract_css_rule(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract complete CSS rule"""
-        try:
-            start_idx = start_line - 1
-            end_idx = start_idx
-            brace_count = 0
-            
-            # Find the opening brace
-            for i in range(start_idx, len(lines)):
-                line = lines[i]
-                brace_count += line.count('{') - line.count('}')
-                if brace_count > 0:
-                    end_idx = i + 1
-                    break
-            
-            # Find the closing brace
-            for i in range(end_idx, len(lines)):
-                line = lines[i]
-                brace_count += line.count('{') - line.count('}')
-                if brace_count <= 0:
-                    end_idx = i + 1
-                    break
-            
-            return '\n'.join(lines[start_idx:end_idx])
-        except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
-    
-    def _extract_xml_element(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract complete XML element"""
+    def _extract_sql_statement(self, content: str, line_starts: List[int], start_line: int) -> CodeSpan:
+        """Span of a complete SQL statement"""
         try:
             start_idx = start_line - 1
-            end_idx = start_idx
-            
-            # Find the closing tag
-            for i in range(start_idx, len(lines)):
-                line = lines[i]
-                if line.strip().startswith('</'):
-                    end_idx = i + 1
-                    break
-            
-            return '\n'.join(lines[start_idx:end_idx])
+            line_count = len(line_starts) - 1
+            
+            # The statement ends at the first line whose last non-blank character is ';'
+            line_idx = start_idx
+            pos = content.find(';', line_starts[start_idx])
+            while pos != -1:
+                line_idx = bisect_right(line_starts, pos, line_idx) - 1
+                line_end = line_starts[line_idx + 1] - 1
+                if pos + 1 == line_end or content[pos + 1:line_end].isspace():
+                    return CodeSpan(line_starts[start_idx], line_end)
+                pos = content.find(';', pos + 1)
+            
+            # Unterminated statements run to the last line that is neither blank nor a comment
+            for end_idx in range(line_count, start_idx, -1):
+                line = content[line_starts[end_idx - 1]:line_starts[end_idx] - 1].strip()
+                if line and not line.startswith('--'):
+                    return self._line_span(line_starts, start_idx, end_idx)
+            return CodeSpan(0, 0)
         except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
+            return self._line_span(line_starts, start_line - 1, start_line)
     
-    def _extract_toml_section(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract TOML section content"""
+    def _extract_html_tag(self, content: str, line_starts: List[int], start_line: int, tag_name: str) -> CodeSpan:
+        """Span of a complete HTML tag's content"""
         try:
-            start_idx = start_line - 1
-            end_idx = start_idx
-            
-            # Find the end of the section
-            for i in range(start_idx + 1, len(lines)):
-                line = lines[i].strip()
-                if line.startswith('[') and line.endswith(']'):
-                    break
-                end_idx = i + 1
-            
-            return '\n'.join(lines[start_idx:end_idx])
+            # Runs to the first line containing the closing tag
+            pos = content.find(f"</{tag_name}>", line_starts[start_line - 1])
+            if pos == -1:
+                return CodeSpan(0, 0)
+            return self._line_span(line_starts, start_line - 1, bisect_right(line_starts, pos, start_line - 1))
         except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
+            return self._line_span(line_starts, start_line - 1, start_line)
     
-    def _extract_ini_section(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract INI section content"""
-        try:
-            start_idx = start_line - 1
-            end_idx = start_idx
-            
-            # Find the end of the section
-            for i in range(start_idx + 1, len(lines)):
-                line = lines[i].strip()
-                if line.startswith('[') and line.endswith(']'):
-                    break
-                end_idx = i + 1
-            
-            return '\n'.join(lines[start_idx:end_idx])
-        except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
+    def _extract_css_rule(self, content: str, line_starts: List[int], start_line: int) -> CodeSpan:
+        """Span of a complete CSS rule"""
+        # Brace matching is the same as for code blocks
+        return self._extract_code_block(content, line_starts, start_line)
     
-    def _extract_markdown_code_block(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract Markdown code block"""
+    def _extract_xml_element(self, content: str, line_starts: List[int], start_line: int) -> CodeSpan:
+        """Span of a complete XML element"""
         try:
-            start_idx = start_line - 1
-            end_idx = start_idx
-            
-            # Find the end of the code block
-            for i in range(start_idx + 1, len(lines)):
-                line = lines[i]
-                if line.startswith('```'):
-                    end_idx = i + 1
-                    break
-            
-            return '\n'.join(lines[start_idx:end_idx])
+            # Runs to the first line starting with a closing tag
+            line_idx = start_line - 1
+            pos = content.find('</', line_starts[line_idx])
+            while pos != -1:
+                line_idx = bisect_right(line_starts, pos, line_idx) - 1
+                line_start = line_starts[line_idx]
+                if pos == line_start or content[line_start:pos].isspace():
+                    return self._line_span(line_starts, start_line - 1, line_idx + 1)
+                pos = content.find('</', line_starts[line_idx + 1])
+            return CodeSpan(0, 0)
         except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
+            return self._line_span(line_starts, start_line - 1, start_line)
     
-    def _extract_makefile_target(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract Makefile target content"""
-        try:
-            start_idx = start_line - 1
-            end_idx = start_idx
-            
-            # Find the end of the target (next target or end of file)
-            for i in range(start_idx + 1, len(lines)):
-                line = lines[i].strip()
-                if line and not line.startswith('\t') and ':' in line:
-                    break
-                end_idx = i + 1
-            
-            return '\n'.join(lines[start_idx:end_idx])
-        except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
+    def _close_section(self, line_starts: List[int], section: Tuple[int, Dict[str, Any]], end_line: int):
+        """Set the span of an open (start line, node) section that ends before end_line"""
+        # A section with no lines before the next one is left empty
+        start_idx = section[0] - 1
+        end_idx = end_line - 1
+        span = self._line_span(line_starts, start_idx, end_idx if end_idx > start_idx + 1 else start_idx)
+        section[1]["full_code_span"] = span
     
-    def _extract_cmake_command(self, lines: List[str], start_line: int, content: str) -> str:
-        """Extract CMake command content"""
+    def _extract_cmake_command(self, content: str, line_starts: List[int], start_line: int) -> CodeSpan:
+        """Span of a CMake command, through the line where its parentheses balance"""
         try:
-            start_idx = start_line - 1
-            end_idx = start_idx
-            
-            # Find the end of the command (closing parenthesis)
-            paren_count = 0
-            for i in range(start_idx, len(lines)):
-                line = lines[i]
-                paren_count += line.count('(') - line.count(')')
-                if paren_count <= 0:
-                    end_idx = i + 1
-                    break
-            
-            return '\n'.join(lines[start_idx:end_idx])
+            block_start = line_starts[start_line - 1]
+            line_end = content.find('\n', block_start)
+            if line_end == -1:
+                line_end = len(content)
+            paren_count = content.count('(', block_start, line_end) - content.count(')', block_start, line_end)
+            
+            # Parentheses are tallied per line, and only a line with a ')' can close the command,
+            # so jump from one such line to the next
+            while paren_count > 0:
+                close_pos = content.find(')', line_end)
+                if close_pos == -1:
+                    # Unclosed commands are left empty
+                    return CodeSpan(0, 0)
+                next_end = content.find('\n', close_pos)
+                if next_end == -1:
+                    next_end = len(content)
+                paren_count += content.count('(', line_end, next_end) - content.count(')', line_end, next_end)
+                line_end = next_end
+            
+            return CodeSpan(block_start, line_end)
         except:
-            return lines[start_line - 1] if start_line <= len(lines) else ""
\ No newline at end of file
+            return self._line_span(line_starts, start_line - 1, start_line)
+
+
+# Process pool shared by all ASTParser instances; each worker keeps its own parser
+_process_pool = None
+_thread_pool = None
+_worker_parser = None
+_worker_loop = None
+
+def _get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Get the shared parse worker pool, creating it on first use"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker_logging)
+    return _process_pool
+
+def _init_worker_logging():
+    """Log straight to stderr in a worker; a queue handler inherited through fork has no listener there"""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        root.addHandler(handler)
+
+def _get_thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Get the shared parse thread pool used on free-threaded builds"""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ast-parse")
+    return _thread_pool
+
+def _reset_process_pool():
+    """Drop a broken worker pool so the next batch starts a fresh one"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+def _get_worker_parser() -> ASTParser:
+    """Get this worker process's parser, creating it on first use"""
+    global _worker_parser, _worker_loop
+    if _worker_parser is None:
+        _worker_parser = ASTParser()
+        _worker_parser.async_reads = False
+        _worker_parser.offload_parsing = False
+        _worker_loop = asyncio.new_event_loop()
+    return _worker_parser
+
+def _parse_file_worker(file_path: str, language: str, mode: str = 'full') -> Optional[Dict[str, Any]]:
+    """Parse a single file inside a worker process"""
+    parser = _get_worker_parser()
+    return _worker_loop.run_until_complete(parser.parse_file(file_path, language, mode))
+
+def _parse_content_worker(file_path: str, content: str, language: str) -> Optional[Dict[str, Any]]:
+    """Parse already decoded content inside a worker process"""
+    parser = _get_worker_parser()
+    return parser._parse_source(file_path, content, language)
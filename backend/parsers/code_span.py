@@ -0,0 +1,19 @@
+from collections import namedtuple
+from typing import Any, Dict, Optional, Sequence
+
+# Half-open (start, end) character offsets into a file's full_source_code.
+# Serializes to JSON as a plain [start, end] list.
+CodeSpan = namedtuple('CodeSpan', ['start', 'end'])
+
+def span_text(content: str, span: Optional[Sequence[int]]) -> str:
+    """Materialize the source text covered by a span"""
+    if not span:
+        return ""
+    start, end = span
+    return content[start:end]
+
+def entry_text(file_data: Dict[str, Any], entry: Dict[str, Any], field: str) -> str:
+    """Get a code field from a parsed entry, resolving its span against the file's source"""
+    if field in entry:
+        return entry[field] or ""
+    return span_text(file_data.get('full_source_code', ''), entry.get(f"{field}_span"))
@@ -0,0 +1,35 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(value: Any) -> Any:
+    """Fallback encoding for values JSON has no type for"""
+    if isinstance(value, tuple):
+        # orjson hands tuple subclasses (e.g. CodeSpan) to default instead of encoding them as arrays
+        return list(value)
+    return str(value)
+
+def dumps(data: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which only the stdlib encoder supports
+            pass
+    return json.dumps(data, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str, using orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity, out-of-range floats and lone surrogates are only accepted by the stdlib
+            # parser; documents that are really malformed fail there too
+            pass
+    return json.loads(data)
@@ -0,0 +1,116 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+# Declaration rules for the line-oriented regex parsers (see ASTParser._parse_regex_language).
+#
+# Each rule is keyed by its regex group name and listed in precedence order. "pattern" is written
+# against a whitespace-stripped line exactly as re.match would see it; it is anchored to the start
+# of each line and limited to that line when the language regex is built.
+#
+# Statement rules ("key"): the child node stores rule["value"](line) under rule["key"], and an
+#   "imports" section additionally records rule["import_value"](line) (the line itself by default).
+# Declaration rules: the name comes from the "name" group, captured by the pattern itself where
+#   the pattern pins it down, otherwise by name_re searched over the line (the old parsers searched
+#   the whole line, which can find a later occurrence). Other named groups (mapped through
+#   "value_maps") are copied to both the section entry and the child node, alongside the static
+#   "entry"/"child" fields (merged into "static_fields" when the rule is built). "code" selects how the full_code_span is found: "block" (brace
+#   matched) or "variable" (up to the terminating ';').
+
+def _rule(pattern: str, node_type: str, section: str = None, **options) -> Dict[str, Any]:
+    """Build a declaration/statement rule"""
+    rule = {"pattern": pattern, "node_type": node_type, "section": section}
+    if "name_re" in options:
+        options["name_re"] = re.compile(options["name_re"])
+    else:
+        rule["fields"] = list(re.compile(pattern).groupindex)
+    rule.update(options)
+    # Resolve optional settings once here so the parse loop never falls back to defaults
+    rule.setdefault("import_value", str)
+    rule.setdefault("value_maps", {})
+    rule["static_fields"] = {**rule.get("entry", {}), **rule.get("child", {})}
+    return rule
+
+def _compile_language_regex(rules: Dict[str, Dict[str, Any]]) -> re.Pattern:
+    """Combine a language's rules into one multiline alternation, one match per declaration line"""
+    alternatives = []
+    for group, rule in rules.items():
+        # \s must not run onto the next line once the pattern is applied to the whole file
+        pattern = rule["pattern"].replace(r'\s', r'[^\S\n]')
+        # Field groups are prefixed with the rule name to stay unique across the alternation;
+        # the rule's own group closes last, so match.lastgroup still names the rule
+        if rule.get("fields"):
+            pattern = re.sub(r'\(\?P<(\w+)>', rf'(?P<{group}__\1>', pattern)
+            rule["field_groups"] = [(field, f"{group}__{field}") for field in rule["fields"]]
+        alternatives.append(f"(?P<{group}>(?:{pattern}).*)")
+    # Anchored on the newline before each line rather than a multiline '^': sre skips ahead to
+    # that literal prefix instead of trying '^' at every position. Scan '\n' + content.
+    return re.compile(r'\n[^\S\n]*(?:' + '|'.join(alternatives) + ')')
+
+def _language(root: str, label: str, rules: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Build a language spec from its root node type, display label and ordered rules"""
+    rules = dict(rules)
+    return {"root": root, "label": label, "rules": rules, "regex": _compile_language_regex(rules)}
+
+REGEX_LANGUAGE_SPECS = {
+    'javascript': _language("Program", "JavaScript", [
+        ("import", _rule(r'import .*\S|const .*require\(', "ImportDeclaration", "imports", key="import", value=str)),
+        ("function", _rule(r'function\s+(?P<name>\w+)\s*\(', "FunctionDeclaration", "functions",
+                           code="block", entry={"type": "function"})),
+        # '=>' anywhere after the '=' means the arrow form matches first
+        ("arrow", _rule(r'const\s+(?P<name>\w+)\s*=\s*.*=>', "VariableDeclaration", "functions",
+                        code="block", entry={"type": "arrow"}, child={"kind": "const"})),
+        ("function_expression", _rule(r'const\s+(?P<name>\w+)\s*=\s*function', "VariableDeclaration", "functions",
+                                      code="block", entry={"type": "function"}, child={"kind": "const"})),
+        ("class", _rule(r'class .*\S', "ClassDeclaration", "classes", name_re=r'class\s+(?P<name>\w+)', code="block")),
+        ("variable", _rule(r'(?P<kind>let|const|var)\s+(?P<name>\w+)', "VariableDeclaration", "variables", code="variable")),
+    ]),
+    'typescript': _language("Program", "TypeScript", [
+        ("import", _rule(r'import .*\S', "ImportDeclaration", "imports", key="import", value=str)),
+        ("interface", _rule(r'interface .*\S', "InterfaceDeclaration", name_re=r'interface\s+(?P<name>\w+)', code="block")),
+        ("type", _rule(r'type .*\S', "TypeAliasDeclaration", name_re=r'type\s+(?P<name>\w+)', code="block")),
+        ("function", _rule(r'function\s+(?P<name>\w+)\s*\(.*\)\s*:\s*\w+', "FunctionDeclaration", "functions",
+                           code="block", entry={"type": "function"})),
+        ("class", _rule(r'class .*\S', "ClassDeclaration", "classes", name_re=r'class\s+(?P<name>\w+)', code="block")),
+        ("variable", _rule(r'(?P<kind>let|const|var)\s+(?P<name>\w+)\s*:\s*\w+', "VariableDeclaration", "variables", code="variable")),
+    ]),
+    'cpp': _language("TranslationUnit", "C++", [
+        ("include", _rule(r'#include .*\S', "IncludeDirective", "imports", key="path", value=lambda line: line[9:].strip('"<>'))),
+        ("class", _rule(r'(?P<type>class|struct)\s+(?P<name>\w+)', "ClassDeclaration", "classes", code="block")),
+        ("function", _rule(r'(?P<return_type>\w+)\s+(?P<name>\w+)\s*\([^)\n]*\)', "FunctionDeclaration", "functions", code="block")),
+        ("variable", _rule(r'(?P<type>\w+)\s+(?P<name>\w+)\s*[=;]', "VariableDeclaration", "variables", code="variable")),
+    ]),
+    'go': _language("GoFile", "Go", [
+        ("package", _rule(r'package .*\S', "PackageDeclaration", key="package", value=lambda line: line[8:])),
+        ("import", _rule(r'import .*\S', "ImportDeclaration", "imports", key="import",
+                         value=lambda line: line[7:].strip('"'), import_value=lambda line: line[7:].strip('"'))),
+        ("function", _rule(r'func\s+(?P<name>\w+)\s*\(', "FunctionDeclaration", "functions",
+                           code="block", entry={"type": "function"})),
+        ("struct", _rule(r'type .*struct', "StructDeclaration", "classes",
+                         name_re=r'type\s+(?P<name>\w+)', code="block", entry={"type": "struct"})),
+        ("variable", _rule(r'(?P<kind>var|const)\s+(?P<name>\w+)', "VariableDeclaration", "variables", code="variable")),
+    ]),
+    'rust': _language("RustFile", "Rust", [
+        ("use", _rule(r'use .*\S', "UseDeclaration", "imports", key="use",
+                      value=lambda line: line[4:].rstrip(';'), import_value=lambda line: line[4:].rstrip(';'))),
+        ("function", _rule(r'fn\s+(?P<name>\w+)\s*\(', "FunctionDeclaration", "functions",
+                           code="block", entry={"type": "function"})),
+        ("struct", _rule(r'(?:pub )?struct .*\S', "StructDeclaration", "classes",
+                         name_re=r'struct\s+(?P<name>\w+)', code="block", entry={"type": "struct"})),
+        ("variable", _rule(r'let\s+(?P<name>\w+)', "VariableDeclaration", "variables", code="variable", entry={"kind": "let"}, child={"kind": "let"})),
+    ]),
+    'php': _language("PHPFile", "PHP", [
+        ("include", _rule(r'(?:require|include|require_once|include_once) .*\S', "IncludeDeclaration", "imports",
+                          key="include", value=str)),
+        ("function", _rule(r'function\s+(?P<name>\w+)\s*\(', "FunctionDeclaration", "functions",
+                           code="block", entry={"type": "function"})),
+        ("class", _rule(r'class .*\S', "ClassDeclaration", "classes", name_re=r'class\s+(?P<name>\w+)', code="block")),
+        ("variable", _rule(r'\$(?P<name>\w+)\s*=', "VariableDeclaration", "variables", code="variable", entry={"kind": "variable"}, child={"kind": "variable"})),
+    ]),
+    'ruby': _language("RubyFile", "Ruby", [
+        ("require", _rule(r'(?:require|require_relative) .*\S', "RequireDeclaration", "imports", key="require", value=str)),
+        ("method", _rule(r'def\s+(?P<name>\w+)', "MethodDeclaration", "functions", code="block", entry={"type": "method"})),
+        ("class", _rule(r'class .*\S', "ClassDeclaration", "classes", name_re=r'class\s+(?P<name>\w+)', code="block")),
+        ("variable", _rule(r'(?P<kind>@@?|\$)(?P<name>\w+)\s*=', "VariableDeclaration", "variables", code="variable",
+                           value_maps={"kind": {"@": "instance", "@@": "class", "$": "global"}})),
+    ]),
+}
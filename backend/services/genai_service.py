@@ -1,58 +1,201 @@
 import os
-import json
-from typing import List, Dict, Any, Optional
-from openai import AzureOpenAI
+import ast
+import random
+import asyncio
+import logging
+from operator import itemgetter
+from collections import Counter
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from models.schemas import CodebaseAnalysis, ModernizationPlan
+from parsers import json_codec
+from services.response_cache import ResponseCache
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    from azure.identity.aio import DefaultAzureCredential, get_bearer_token_provider
+except ImportError:
+    DefaultAzureCredential = None
+
+logger = logging.getLogger(__name__)
+
+# Sent first with every request; keeping it byte-identical lets the service reuse its cached prompt prefix
+SYSTEM_PROMPT = "You are an expert software engineer and code modernization specialist."
+
+# JSON mode: the model can only answer with a well-formed JSON object
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Tokenizer of the gpt-4o model family, built on first use (construction is slow)
+_token_encoding = None
+
+def _count_tokens(text: str) -> int:
+    """Tokens in text for the chat model (estimated at ~4 characters per token without tiktoken)"""
+    global _token_encoding
+    if tiktoken is None:
+        return len(text) // 4 + 1
+    if _token_encoding is None:
+        _token_encoding = tiktoken.get_encoding("o200k_base")
+    return len(_token_encoding.encode(text))
+
+# Process-wide cap on concurrent completions, shared by every GenAIService instance; a burst
+# queues here instead of drawing 429s. Recreated if the event loop changes (e.g. across asyncio.run)
+_request_slots = None
+_request_slots_loop = None
+
+def _get_request_slots(limit: int) -> asyncio.Semaphore:
+    """Get the shared completion semaphore for the running event loop"""
+    global _request_slots, _request_slots_loop
+    loop = asyncio.get_running_loop()
+    if _request_slots is None or _request_slots_loop is not loop:
+        _request_slots = asyncio.Semaphore(limit)
+        _request_slots_loop = loop
+    return _request_slots
 
 class GenAIService:
+    ENABLE_RESPONSE_CACHE = True  # Answer repeated (or near-identical) questions without a model call
+    RESPONSE_CACHE_PATH = os.path.join(".cache", "genai", "responses.sqlite3")  # On-disk response cache
+    RESPONSE_CACHE_SIMILARITY = 0.92  # Minimum cosine similarity for an embedding match
+    RESPONSE_CACHE_MAX_ENTRIES = 1000  # Oldest answers are evicted beyond this; bounds the similarity scan
+    MAX_CONNECTIONS = 100  # Pooled connections to the Azure endpoint
+    MAX_KEEPALIVE_CONNECTIONS = 20  # Idle connections kept open for reuse
+    REQUEST_TIMEOUT_SECONDS = 30.0
+    MAX_RETRIES = 5  # Retries of rate-limited (429), overloaded (5xx) and dropped requests, with backoff
+    MAX_CONCURRENT_REQUESTS = 20  # Completions in flight at once, to stay under the deployment's rate limit
+    BATCH_POLL_INITIAL_SECONDS = 5.0  # First wait between Batch API status checks, doubled up to the maximum
+    BATCH_POLL_MAX_SECONDS = 300.0
+    BATCH_MAX_WAIT_SECONDS = 25 * 3600.0  # poll_batch gives up after this; the completion window is 24h
+    CONTEXT_TOKEN_BUDGET = 4000  # Codebase summary size; files are added until it is spent
+    CONTEXT_TOP_IMPORTS = 10  # Imports shared by several files, listed once with their file counts
+    MODEL_CONTEXT_TOKENS = 128000  # Context window of the chat deployment (gpt-4o-mini)
+    MAX_COMPLETION_TOKENS = 1500  # Tokens reserved for each answer
+    EXPLANATION_CHUNK_TOKENS = 1000  # Longer snippets are explained in parallel parts of about this size
+    KEEPALIVE_INTERVAL_SECONDS = 0  # Ping the deployment this often to avoid cold starts (0 = off; each ping is a billed call)
+    
     def __init__(self):
         self.azure_client = None
         self.current_provider = "azure"
+        self._keepalive_task = None
+        self._credential = None
+        # Embedding deployment for similarity matches; without one only exact prompt repeats hit the cache
+        self.embedding_deployment = os.getenv("AZURE_EMBEDDING_DEPLOYMENT_NAME")
+        self.response_cache = (
+            ResponseCache(self.RESPONSE_CACHE_PATH, self.RESPONSE_CACHE_SIMILARITY, self.RESPONSE_CACHE_MAX_ENTRIES)
+            if self.ENABLE_RESPONSE_CACHE else None
+        )
         
     async def initialize(self):
         """Initialize AI service with Azure OpenAI"""
         try:
             # Initialize Azure OpenAI
             azure_endpoint = os.getenv("AZURE_ENDPOINT", "https://fintechazureopenai.openai.azure.com/")
-            azure_api_key = os.getenv("AZURE_API_KEY", "2822f31331b348abb8daed1311e4070a")
+            azure_api_key = os.getenv("AZURE_API_KEY")
             azure_api_version = os.getenv("AZURE_API_VERSION", "2024-05-01-preview")
             azure_deployment_name = os.getenv("AZURE_DEPLOYMENT_NAME", "gpt-4o-mini")
             
-            print(f"Initializing Azure OpenAI with endpoint: {azure_endpoint}")
+            logger.info("Initializing Azure OpenAI with endpoint: %s", azure_endpoint)
+            
+            # An API key from the environment, otherwise Microsoft Entra ID (managed identity, CLI
+            # login, ...); the token provider caches tokens and refreshes them before they expire
+            if azure_api_key:
+                credentials = {"api_key": azure_api_key}
+            elif DefaultAzureCredential is not None:
+                self._credential = DefaultAzureCredential()
+                credentials = {"azure_ad_token_provider": get_bearer_token_provider(
+                    self._credential, "https://cognitiveservices.azure.com/.default"
+                )}
+            else:
+                raise RuntimeError("Set AZURE_API_KEY or install azure-identity to authenticate with Microsoft Entra ID")
             
-            self.azure_client = AzureOpenAI(
+            # The SDK and its HTTP stack are imported only when the service is actually started
+            import httpx
+            from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+            
+            # One async client for the whole process; its pool keeps TLS connections alive between calls
+            self.azure_client = AsyncAzureOpenAI(
                 azure_endpoint=azure_endpoint,
                 api_version=azure_api_version,
-                api_key=azure_api_key
-            )
-            
-            # Test the connection
-            try:
-                response = self.azure_client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[{"role": "user", "content": "Hello"}],
-                    max_tokens=10
+                **credentials,
+                # The SDK retries with exponential backoff and jitter, waiting out Retry-After when sent
+                max_retries=self.MAX_RETRIES,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=self.MAX_CONNECTIONS,
+                        max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS
+                    ),
+                    timeout=self.REQUEST_TIMEOUT_SECONDS,
+                    http2=h2 is not None
                 )
-                print("Azure OpenAI connection test successful")
-            except Exception as test_error:
-                print(f"Azure OpenAI connection test failed: {str(test_error)}")
-                # Continue anyway, might be a test issue
+            )
             
             self.current_provider = "azure"
-            print("GenAI service initialized with Azure OpenAI")
+            if self.KEEPALIVE_INTERVAL_SECONDS > 0:
+                self._keepalive_task = asyncio.create_task(self._keepalive())
+            logger.info("GenAI service initialized with Azure OpenAI")
                 
         except Exception as e:
-            print(f"Failed to initialize Azure OpenAI service: {str(e)}")
             # Don't raise the exception, just log it and continue
-            print("Continuing without AI service - some features will be limited")
+            logger.warning("Failed to initialize Azure OpenAI service, continuing without it: %s", e)
+            self.azure_client = None
+    
+    async def healthcheck(self) -> Dict[str, Any]:
+        """Check the Azure OpenAI connection with a metadata call instead of a billed completion"""
+        if not self.azure_client:
+            return {"status": "unavailable", "provider": self.current_provider}
+        try:
+            await self.azure_client.models.list()
+            return {"status": "ok", "provider": self.current_provider}
+        except Exception as e:
+            return {"status": "error", "provider": self.current_provider, "error": str(e)}
+    
+    async def _keepalive(self):
+        """Send a one-token request periodically so the deployment and connection stay warm"""
+        while True:
+            await asyncio.sleep(self.KEEPALIVE_INTERVAL_SECONDS)
+            try:
+                await self.azure_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": "ping"}],
+                    max_tokens=1
+                )
+            except Exception as e:
+                logger.warning("Azure OpenAI keep-alive failed: %s", e)
+    
+    async def close(self):
+        """Stop the keep-alive task and close the pooled HTTP connections"""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if self.azure_client is not None:
+            await self.azure_client.close()
             self.azure_client = None
+        if self._credential is not None:
+            await self._credential.close()
+            self._credential = None
+    
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
     
     async def chat_about_codebase(
         self, 
         question: str, 
         ast_data: List[Dict[str, Any]], 
-        source_language: str
+        source_language: str,
+        session_id: Optional[str] = None
     ) -> str:
-        """Chat with AI about the codebase"""
+        """Chat with AI about the codebase (turns of one session_id are routed alike to reuse the cached prompt prefix)"""
         try:
             # if not self.azure_client:
             #     return "AI service not available. Please configure Azure OpenAI API keys."
@@ -62,13 +205,37 @@ class GenAIService:
             
             # Create prompt
             prompt = self._create_chat_prompt(question, context, source_language)
-            print('prompt', prompt)
-            return await self._chat_with_azure(prompt)
+            logger.debug("Chat prompt: %s", prompt)
+            return await self._chat_with_azure(prompt, self._chat_cache_bucket(source_language, session_id), user=session_id)
     
         except Exception as e:
-            print(f"Failed to chat about codebase: {str(e)}")
+            logger.warning("Failed to chat about codebase: %s", e)
             return f"Error: {str(e)}"
     
+    async def stream_chat_about_codebase(
+        self,
+        question: str,
+        ast_data: List[Dict[str, Any]],
+        source_language: str,
+        session_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Chat with AI about the codebase, yielding the answer as it is generated"""
+        try:
+            context = self._prepare_codebase_context(ast_data, source_language)
+            prompt = self._create_chat_prompt(question, context, source_language)
+            async for text in self._stream_with_azure(
+                prompt, self._chat_cache_bucket(source_language, session_id), user=session_id
+            ):
+                yield text
+        except Exception as e:
+            logger.warning("Failed to chat about codebase: %s", e)
+            yield f"Error: {str(e)}"
+    
+    @staticmethod
+    def _chat_cache_bucket(source_language: str, session_id: Optional[str]) -> str:
+        """Cache bucket for chat answers; per session, so a similar prompt about another project never matches"""
+        return f"chat:{source_language}:{session_id}" if session_id else f"chat:{source_language}"
+    
     async def analyze_code_structure(
         self, 
         ast_data: List[Dict[str, Any]], 
@@ -82,16 +249,18 @@ class GenAIService:
             context = self._prepare_codebase_context(ast_data, source_language)
             prompt = self._create_analysis_prompt(context, source_language)
             
-            response = await self._chat_with_azure(prompt)
+            response = await self._chat_with_azure(
+                prompt, f"analysis:{source_language}", JSON_RESPONSE_FORMAT, schema=CodebaseAnalysis
+            )
             
-            # Try to parse JSON response
             try:
-                return json.loads(response)
-            except:
-                return {"analysis": response}
+                return CodebaseAnalysis.model_validate_json(response).model_dump()
+            except ValidationError as e:
+                logger.warning("Invalid code structure analysis: %s", e)
+                return {"error": "Invalid analysis response", "analysis": response}
                 
         except Exception as e:
-            print(f"Failed to analyze code structure: {str(e)}")
+            logger.warning("Failed to analyze code structure: %s", e)
             return {"error": str(e)}
     
     async def suggest_modernization(
@@ -108,103 +277,336 @@ class GenAIService:
             context = self._prepare_codebase_context(ast_data, source_language)
             prompt = self._create_modernization_prompt(context, source_language, target_language)
             
-            response = await self._chat_with_azure(prompt)
+            response = await self._chat_with_azure(
+                prompt, f"modernization:{source_language}:{target_language}", JSON_RESPONSE_FORMAT,
+                schema=ModernizationPlan
+            )
             
             try:
-                return json.loads(response)
-            except:
-                return {"suggestions": response}
+                return ModernizationPlan.model_validate_json(response).model_dump()
+            except ValidationError as e:
+                logger.warning("Invalid modernization suggestions: %s", e)
+                return {"error": "Invalid modernization response", "suggestions": response}
                 
         except Exception as e:
-            print(f"Failed to suggest modernization: {str(e)}")
+            logger.warning("Failed to suggest modernization: %s", e)
             return {"error": str(e)}
     
+    async def analyze_all(
+        self,
+        ast_data: List[Dict[str, Any]],
+        source_language: str,
+        target_language: str
+    ) -> Dict[str, Any]:
+        """Run structure analysis and modernization suggestions concurrently"""
+        analysis, modernization = await asyncio.gather(
+            self.analyze_code_structure(ast_data, source_language),
+            self.suggest_modernization(ast_data, source_language, target_language)
+        )
+        return {"analysis": analysis, "modernization": modernization}
+    
     def _prepare_codebase_context(self, ast_data: List[Dict[str, Any]], source_language: str) -> str:
         """Prepare context from AST data for AI analysis"""
-        context = f"Codebase in {source_language} with {len(ast_data)} files:\n\n"
+        # Pieces are collected and joined once instead of re-copying the growing string
+        parts = [f"Codebase in {source_language} with {len(ast_data)} files:\n\n"]
         
-        for i, file_data in enumerate(ast_data[:5]):  # Limit to first 5 files
-            file_path = file_data.get('file_path', f'file_{i+1}')
-            functions = file_data.get('functions', [])
-            classes = file_data.get('classes', [])
-            imports = file_data.get('imports', [])
-            
-            context += f"File {i+1}: {file_path}\n"
+        # Imports repeated across files are summarized once instead of in every file's list
+        import_counts = Counter()
+        for file_data in ast_data:
+            import_counts.update(dict.fromkeys(file_data.get('imports') or (), 1))
+        top_imports = [(name, count) for name, count in import_counts.most_common(self.CONTEXT_TOP_IMPORTS) if count > 1]
+        if top_imports:
+            parts.append(f"Top imports: {', '.join(f'{name} ({count})' for name, count in top_imports)}\n\n")
+        shared_imports = {name for name, _ in top_imports}
+        
+        tokens_left = self.CONTEXT_TOKEN_BUDGET - _count_tokens(''.join(parts))
+        get_name = itemgetter('name')
+        
+        # Files with the most declarations first, for as long as the token budget lasts
+        ranked = sorted(
+            ast_data,
+            key=lambda file_data: len(file_data.get('functions') or ()) + len(file_data.get('classes') or ()),
+            reverse=True
+        )
+        included = 0
+        for i, file_data in enumerate(ranked, 1):
+            summary = [f"File {i}: {file_data.get('file_path', f'file_{i}')}\n"]
+            imports = [name for name in file_data.get('imports') or () if name not in shared_imports]
             if imports:
-                context += f"  Imports: {', '.join(imports[:5])}\n"
+                summary.append(f"  Imports: {', '.join(imports[:5])}\n")
+            functions = file_data.get('functions')
             if functions:
-                context += f"  Functions: {', '.join([f['name'] for f in functions[:3]])}\n"
+                summary.append(f"  Functions: {', '.join(map(get_name, functions[:3]))}\n")
+            classes = file_data.get('classes')
             if classes:
-                context += f"  Classes: {', '.join([c['name'] for c in classes[:3]])}\n"
-            context += "\n"
+                summary.append(f"  Classes: {', '.join(map(get_name, classes[:3]))}\n")
+            summary.append("\n")
+            summary = ''.join(summary)
+            tokens_left -= _count_tokens(summary)
+            if tokens_left < 0:
+                break
+            parts.append(summary)
+            included = i
         
-        if len(ast_data) > 5:
-            context += f"... and {len(ast_data) - 5} more files\n"
+        if len(ast_data) > included:
+            parts.append(f"... and {len(ast_data) - included} more files\n")
         
-        return context
+        return ''.join(parts)
     
     def _create_chat_prompt(self, question: str, context: str, source_language: str) -> str:
         """Create a prompt for chatting about the codebase"""
+        # Stable instructions and context first, the per-request question last
         return f"""
 You are an expert software engineer analyzing a {source_language} codebase.
 
+Please provide a helpful and accurate response based on the codebase context. Be specific and reference the actual code structure when possible.
+
 Codebase Context:
 {context}
 
 Question: {question}
-
-Please provide a helpful and accurate response based on the codebase context. Be specific and reference the actual code structure when possible.
 """
     
     def _create_analysis_prompt(self, context: str, source_language: str) -> str:
         """Create a prompt for code analysis"""
         return f"""
-Analyze this {source_language} codebase and provide insights in JSON format:
-
-{context}
+Analyze this {source_language} codebase and provide insights in JSON format.
 
 Return a JSON object with:
 - language: the programming language
 - total_files: number of files analyzed
 - structure: brief description of code structure and architecture
 - complexity: assessment of code complexity (Low/Medium/High)
-- suggestions: list of improvement suggestions
-- patterns: common patterns found in the code
+- suggestions: list of improvement suggestions (strings)
+- patterns: common patterns found in the code (strings)
+
+{context}
 """
     
     def _create_modernization_prompt(self, context: str, source_language: str, target_language: str) -> str:
         """Create a prompt for modernization suggestions"""
         return f"""
-Suggest modernization strategies for converting this {source_language} codebase to {target_language}:
-
-{context}
+Suggest modernization strategies for converting this {source_language} codebase to {target_language}.
 
 Return a JSON object with:
 - source_language: original language
 - target_language: target language
-- modernization_plan: step-by-step plan for conversion
+- modernization_plan: step-by-step plan for conversion (list of strings)
 - estimated_effort: effort assessment (Low/Medium/High)
-- key_changes: list of major changes needed
-- dependencies: list of new dependencies required
-- risks: potential risks and challenges
+- key_changes: list of major changes needed (strings)
+- dependencies: list of new dependencies required (strings)
+- risks: potential risks and challenges (strings)
+
+{context}
 """
     
-    async def _chat_with_azure(self, prompt: str) -> str:
-        """Chat using Azure OpenAI"""
+    async def _embed_prompt(self, prompt: str):
+        """Unit-length embedding of a prompt, or None when no embedding deployment is configured"""
+        if not self.embedding_deployment:
+            return None
         try:
-            response = self.azure_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert software engineer and code modernization specialist."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.3
-            )
-            return response.choices[0].message.content
+            response = await self.azure_client.embeddings.create(model=self.embedding_deployment, input=prompt)
+            return ResponseCache.normalize(response.data[0].embedding)
         except Exception as e:
-            print(f"Azure OpenAI error: {str(e)}")
+            logger.warning("Azure OpenAI embedding error: %s", e)
+            return None
+    
+    def _chat_request_body(
+        self,
+        prompt: str,
+        response_format: Optional[Dict[str, Any]] = None,
+        user: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Chat completion parameters for a prompt, shared by direct and Batch API requests"""
+        body = {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": self.MAX_COMPLETION_TOKENS,
+            "temperature": 0.3
+        }
+        if response_format is not None:
+            body["response_format"] = response_format
+        if user is not None:
+            # A stable end-user id lets the service send repeat requests where their prefix is cached
+            body["user"] = user
+        return body
+    
+    async def _cached_response(self, prompt: str, cache_bucket: Optional[str]) -> Tuple[Optional[str], Any]:
+        """Cached answer for a prompt (or None) and the prompt embedding to store a new answer under"""
+        if cache_bucket is None or self.response_cache is None:
+            return None, None
+        # Exact repeats skip the embedding call entirely
+        cached = self.response_cache.get_exact(cache_bucket, prompt)
+        if cached is not None:
+            return cached, None
+        embedding = await self._embed_prompt(prompt)
+        if embedding is not None:
+            # The scan is linear in the cached entries, so it runs off the event loop
+            cached = await asyncio.to_thread(self.response_cache.get_similar, cache_bucket, embedding)
+        return cached, embedding
+    
+    def _check_prompt_size(self, prompt: str) -> Optional[str]:
+        """Error message for a prompt that cannot fit the model context, or None if it fits"""
+        prompt_tokens = _count_tokens(SYSTEM_PROMPT) + _count_tokens(prompt)
+        logger.debug("Prompt uses %s of %s context tokens", prompt_tokens, self.MODEL_CONTEXT_TOKENS)
+        if prompt_tokens + self.MAX_COMPLETION_TOKENS > self.MODEL_CONTEXT_TOKENS:
+            logger.warning("Rejecting prompt of %s tokens (model context is %s)", prompt_tokens, self.MODEL_CONTEXT_TOKENS)
+            return (f"Error: prompt is too long ({prompt_tokens} tokens, limit "
+                    f"{self.MODEL_CONTEXT_TOKENS - self.MAX_COMPLETION_TOKENS})")
+        return None
+    
+    @staticmethod
+    def _is_cacheable(content: Optional[str], schema: Optional[Type[BaseModel]]) -> bool:
+        """Whether an answer may be cached; an answer that fails its schema would be replayed on every repeat"""
+        if not content:
+            return False
+        if schema is None:
+            return True
+        try:
+            schema.model_validate_json(content)
+            return True
+        except ValidationError:
+            return False
+    
+    async def _chat_with_azure(
+        self,
+        prompt: str,
+        cache_bucket: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        user: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None
+    ) -> str:
+        """Chat using Azure OpenAI (answers are cached per bucket when cache_bucket is given, and only if they match schema when one is given)"""
+        # Oversized prompts are refused here rather than by the service after a full round-trip
+        size_error = self._check_prompt_size(prompt)
+        if size_error is not None:
+            return size_error
+        cached, embedding = await self._cached_response(prompt, cache_bucket)
+        if cached is not None:
+            return cached
+        try:
+            async with _get_request_slots(self.MAX_CONCURRENT_REQUESTS):
+                response = await self.azure_client.chat.completions.create(
+                    **self._chat_request_body(prompt, response_format, user)
+                )
+            content = response.choices[0].message.content
+            if cache_bucket is not None and self.response_cache is not None and self._is_cacheable(content, schema):
+                self.response_cache.put(cache_bucket, prompt, content, embedding)
+            return content
+        except Exception as e:
+            logger.warning("Azure OpenAI error: %s", e)
             return f"Error communicating with Azure OpenAI: {str(e)}"
+    
+    async def _stream_with_azure(
+        self,
+        prompt: str,
+        cache_bucket: Optional[str] = None,
+        user: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream a chat completion's text as it arrives (complete answers are cached like _chat_with_azure)"""
+        size_error = self._check_prompt_size(prompt)
+        if size_error is not None:
+            yield size_error
+            return
+        cached, embedding = await self._cached_response(prompt, cache_bucket)
+        if cached is not None:
+            yield cached
+            return
+        # The upstream stream is read into a queue by a separate task, so the completion slot is
+        # released once generation ends even if the client reads the answer slowly
+        received = asyncio.Queue()
+        reader = asyncio.create_task(self._read_stream(prompt, user, received))
+        parts = []
+        try:
+            while True:
+                text = await received.get()
+                if text is None:
+                    break
+                if isinstance(text, Exception):
+                    logger.warning("Azure OpenAI error: %s", text)
+                    yield f"Error communicating with Azure OpenAI: {str(text)}"
+                    return
+                parts.append(text)
+                yield text
+        finally:
+            # A client that disconnects early stops the upstream request too
+            reader.cancel()
+        # An empty answer (e.g. every chunk filtered) is not cached, or each repeat would get it too
+        if cache_bucket is not None and self.response_cache is not None and parts:
+            self.response_cache.put(cache_bucket, prompt, ''.join(parts), embedding)
+    
+    async def _read_stream(self, prompt: str, user: Optional[str], received: asyncio.Queue):
+        """Put a streamed completion's text pieces on a queue, then None (or the exception that ended it)"""
+        try:
+            async with _get_request_slots(self.MAX_CONCURRENT_REQUESTS):
+                response = await self.azure_client.chat.completions.create(
+                    **self._chat_request_body(prompt, user=user), stream=True
+                )
+                async for chunk in response:
+                    # Azure sends content-filter results as chunks without choices
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        received.put_nowait(chunk.choices[0].delta.content)
+            received.put_nowait(None)
+        except Exception as e:
+            received.put_nowait(e)
+    
+    async def submit_batch(self, tasks: List[Dict[str, str]]) -> str:
+        """Submit prompts ({"custom_id", "prompt"} dicts) as one Batch API job and return its batch id"""
+        lines = [
+            json_codec.dumps({
+                "custom_id": task["custom_id"],
+                "method": "POST",
+                "url": "/chat/completions",
+                "body": self._chat_request_body(task["prompt"])
+            })
+            for task in tasks
+        ]
+        batch_file = await self.azure_client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.azure_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    async def poll_batch(self, batch_id: str, max_wait_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for a batch job to finish (or max_wait_seconds to pass) and return its responses by custom_id"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self.BATCH_MAX_WAIT_SECONDS if max_wait_seconds is None else max_wait_seconds)
+        delay = self.BATCH_POLL_INITIAL_SECONDS
+        while True:
+            batch = await self.azure_client.batches.retrieve(batch_id)
+            remaining = deadline - loop.time()
+            if batch.status in ("completed", "failed", "expired", "cancelled") or remaining <= 0:
+                break
+            # Exponential backoff with full jitter keeps many pollers from hitting the API in step
+            await asyncio.sleep(min(random.uniform(0, delay), remaining))
+            delay = min(delay * 2, self.BATCH_POLL_MAX_SECONDS)
+        
+        # Successful requests are in the output file and failed ones in the error file
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            output = await self.azure_client.files.content(file_id)
+            # Records are parsed straight from the downloaded bytes, without decoding the file first
+            for line in output.content.splitlines():
+                if not line.strip():
+                    continue
+                record = json_codec.loads(line)
+                response = record.get("response") or {}
+                choices = (response.get("body") or {}).get("choices") or []
+                if choices:
+                    results[record["custom_id"]] = choices[0]["message"]["content"]
+                else:
+                    results[record["custom_id"]] = {"error": record.get("error") or response}
+        return {"batch_id": batch_id, "status": batch.status, "results": results}
         
     async def generate_code_explanation(self, code_snippet: str, language: str) -> str:
         """Generate explanation for a code snippet"""
@@ -212,8 +614,34 @@ Return a JSON object with:
             if not self.azure_client:
                 return "AI service not available. Please configure Azure OpenAI API keys."
             
-            prompt = f"""
-Explain this {language} code snippet in detail:
+            chunks = self._chunk_code_snippet(code_snippet, language)
+            if len(chunks) == 1:
+                return await self._chat_with_azure(
+                    self._create_explanation_prompt(code_snippet, language), f"explanation:{language}"
+                )
+            
+            # Parts are explained concurrently, so a long snippet takes about as long as its slowest part
+            explanations = await asyncio.gather(*(
+                self._chat_with_azure(
+                    self._create_explanation_prompt(chunk, language, f"lines {first_line}-{last_line}"),
+                    f"explanation:{language}"
+                )
+                for first_line, last_line, chunk in chunks
+            ))
+            return "\n\n".join(
+                f"## Lines {first_line}-{last_line}\n\n{explanation}"
+                for (first_line, last_line, _), explanation in zip(chunks, explanations)
+            )
+                        
+        except Exception as e:
+            logger.warning("Failed to generate code explanation: %s", e)
+            return f"Error: {str(e)}"
+    
+    def _create_explanation_prompt(self, code_snippet: str, language: str, part: Optional[str] = None) -> str:
+        """Create a prompt for explaining a code snippet (or one part of a longer snippet)"""
+        subject = f"part ({part}) of a longer {language} code snippet" if part else f"{language} code snippet"
+        return f"""
+Explain this {subject} in detail:
 
 ```{language}
 {code_snippet}
@@ -226,9 +654,41 @@ Provide:
 4. Potential improvements or optimizations
 5. Best practices applied or missing
 """
-            
-            return await self._chat_with_azure(prompt)
-                        
-        except Exception as e:
-            print(f"Failed to generate code explanation: {str(e)}")
-            return f"Error: {str(e)}" 
\ No newline at end of file
+    
+    def _chunk_code_snippet(self, code_snippet: str, language: str) -> List[Tuple[int, int, str]]:
+        """Split a long snippet at top-level definitions into (first line, last line, code) parts near the chunk size"""
+        if _count_tokens(code_snippet) <= self.EXPLANATION_CHUNK_TOKENS:
+            return [(1, code_snippet.count('\n') + 1, code_snippet)]
+        lines = code_snippet.splitlines(keepends=True)
+        
+        # Top-level statements (with their decorators) for Python; elsewhere an unindented line
+        # after a blank line starts a new block
+        starts = None
+        if language == 'python':
+            try:
+                starts = [
+                    min([node.lineno] + [decorator.lineno for decorator in getattr(node, 'decorator_list', ())]) - 1
+                    for node in ast.parse(code_snippet).body
+                ]
+            except (SyntaxError, ValueError):
+                pass
+        if not starts:
+            starts = [
+                i for i, line in enumerate(lines)
+                if line[:1].strip() and (i == 0 or not lines[i - 1].strip())
+            ]
+        starts = sorted({0, *starts})
+        
+        # Consecutive blocks are merged until a part reaches the chunk size
+        chunks = []
+        chunk_start = 0
+        chunk_tokens = 0
+        for block_start, block_end in zip(starts, starts[1:] + [len(lines)]):
+            block_tokens = _count_tokens(''.join(lines[block_start:block_end]))
+            if chunk_tokens and chunk_tokens + block_tokens > self.EXPLANATION_CHUNK_TOKENS:
+                chunks.append((chunk_start + 1, block_start, ''.join(lines[chunk_start:block_start])))
+                chunk_start = block_start
+                chunk_tokens = 0
+            chunk_tokens += block_tokens
+        chunks.append((chunk_start + 1, len(lines), ''.join(lines[chunk_start:])))
+        return chunks
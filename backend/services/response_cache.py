@@ -0,0 +1,140 @@
+import os
+import math
+import sqlite3
+import hashlib
+import logging
+import operator
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """SQLite-backed cache of model responses, matched by exact prompt or by prompt embedding similarity"""
+
+    def __init__(self, db_path: str, similarity_threshold: float = 0.92, max_entries: int = 1000):
+        self.db_path = db_path
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self._conn = None
+        self._disabled = False
+        # get_similar may run on a worker thread, so connection and vector lists are shared under a lock
+        self._lock = threading.Lock()
+        # (rowid, unit-length prompt embedding, response) per bucket in insertion order, loaded on first use
+        self._vectors: Dict[str, List[Tuple[int, array, str]]] = {}
+
+    @staticmethod
+    def prompt_hash(prompt: str) -> str:
+        """Exact-match key for a prompt"""
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def normalize(embedding: Sequence[float]) -> array:
+        """Scale an embedding to unit length so similarity is a plain dot product"""
+        norm = math.sqrt(sum(map(operator.mul, embedding, embedding))) or 1.0
+        return array('f', (value / norm for value in embedding))
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the cache database, or None if it cannot be used"""
+        with self._lock:
+            if self._conn is None and not self._disabled:
+                self._open()
+        return self._conn
+
+    def _open(self):
+        """Create the connection and table, disabling the cache if that fails"""
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "bucket TEXT NOT NULL, prompt_hash TEXT NOT NULL, embedding BLOB, response TEXT NOT NULL, "
+                "PRIMARY KEY (bucket, prompt_hash))"
+            )
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Response cache disabled, cannot open %s: %s", self.db_path, e)
+            self._disabled = True
+
+    def get_exact(self, bucket: str, prompt: str) -> Optional[str]:
+        """Response stored for this exact prompt, or None"""
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            with self._lock:
+                row = conn.execute(
+                    "SELECT response FROM responses WHERE bucket = ? AND prompt_hash = ?",
+                    (bucket, self.prompt_hash(prompt))
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Response cache lookup failed: %s", e)
+            return None
+        return row[0] if row else None
+
+    def _bucket_vectors(self, conn: sqlite3.Connection, bucket: str) -> List[Tuple[int, array, str]]:
+        """Embeddings of a bucket, read from disk once per process"""
+        vectors = self._vectors.get(bucket)
+        if vectors is None:
+            vectors = []
+            for rowid, blob, response in conn.execute(
+                "SELECT rowid, embedding, response FROM responses "
+                "WHERE bucket = ? AND embedding IS NOT NULL ORDER BY rowid", (bucket,)
+            ):
+                vector = array('f')
+                vector.frombytes(blob)
+                vectors.append((rowid, vector, response))
+            self._vectors[bucket] = vectors
+        return vectors
+
+    def get_similar(self, bucket: str, embedding: array) -> Optional[str]:
+        """Response of the most similar cached prompt, if it clears the similarity threshold (a linear scan; safe to run in a thread)"""
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            with self._lock:
+                # Scanned from a snapshot, so a concurrent put does not change the list mid-scan
+                vectors = list(self._bucket_vectors(conn, bucket))
+        except sqlite3.Error as e:
+            logger.warning("Response cache lookup failed: %s", e)
+            return None
+        best_similarity = self.similarity_threshold
+        best_response = None
+        for _, vector, response in vectors:
+            if len(vector) != len(embedding):
+                continue
+            similarity = sum(map(operator.mul, vector, embedding))
+            if similarity >= best_similarity:
+                best_similarity = similarity
+                best_response = response
+        return best_response
+
+    def put(self, bucket: str, prompt: str, response: str, embedding: Optional[array] = None):
+        """Store a response under its prompt (and embedding, when one was computed)"""
+        conn = self._connect()
+        if conn is None:
+            return
+        with self._lock:
+            try:
+                rowid = conn.execute(
+                    "INSERT OR REPLACE INTO responses (bucket, prompt_hash, embedding, response) VALUES (?, ?, ?, ?)",
+                    (bucket, self.prompt_hash(prompt), embedding.tobytes() if embedding is not None else None, response)
+                ).lastrowid
+                # Rowids only grow, so everything this far behind the newest entry is the oldest overflow
+                oldest_kept = rowid - self.max_entries + 1
+                evicted = conn.execute("DELETE FROM responses WHERE rowid < ?", (oldest_kept,)).rowcount
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("Failed to store response cache entry: %s", e)
+                return
+            if evicted:
+                for vectors in self._vectors.values():
+                    stale = 0
+                    while stale < len(vectors) and vectors[stale][0] < oldest_kept:
+                        stale += 1
+                    del vectors[:stale]
+            if embedding is not None and bucket in self._vectors:
+                self._vectors[bucket].append((rowid, embedding, response))
@@ -44,8 +44,6 @@ if __name__ == "__main__":
     # Set environment variables if not already set
     if not os.getenv("AZURE_ENDPOINT"):
         os.environ["AZURE_ENDPOINT"] = "https://fintechazureopenai.openai.azure.com/"
-    if not os.getenv("AZURE_API_KEY"):
-        os.environ["AZURE_API_KEY"] = "2822f31331b348abb8daed1311e4070a"
     if not os.getenv("AZURE_API_VERSION"):
         os.environ["AZURE_API_VERSION"] = "2024-05-01-preview"
     if not os.getenv("AZURE_DEPLOYMENT_NAME"):
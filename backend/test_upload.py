@@ -3,48 +3,37 @@
 Test script for zip file upload functionality
 """
 import requests
+from requests.adapters import HTTPAdapter
 import zipfile
+import io
 import os
-import tempfile
-import shutil
+from pathlib import Path
+
+# One keep-alive session for every request to the local server
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
 
 def create_test_zip():
     """Create a test zip file with some sample files"""
-    # Create a temporary directory
-    temp_dir = tempfile.mkdtemp()
+    # Create some sample files
+    sample_files = {
+        'main.py': 'print("Hello, World!")',
+        'utils.py': 'def helper():\n    return "Helper function"',
+        'README.md': '# Test Project\nThis is a test project for upload.',
+        'config.json': '{"name": "test", "version": "1.0.0"}'
+    }
     
-    try:
-        # Create some sample files
-        sample_files = {
-            'main.py': 'print("Hello, World!")',
-            'utils.py': 'def helper():\n    return "Helper function"',
-            'README.md': '# Test Project\nThis is a test project for upload.',
-            'config.json': '{"name": "test", "version": "1.0.0"}'
-        }
-        
-        # Write files to temp directory
+    # Build the archive in memory, straight from the sample contents (so no macOS metadata);
+    # the files are tiny, so they are stored rather than deflated
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zipf:
         for filename, content in sample_files.items():
-            filepath = os.path.join(temp_dir, filename)
-            with open(filepath, 'w') as f:
-                f.write(content)
-        
-        # Create zip file without macOS metadata
-        zip_path = 'test_project.zip'
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, temp_dir)
-                    # Skip macOS metadata files
-                    if not file.startswith('.') and file != '.DS_Store':
-                        zipf.write(file_path, arcname)
-        
-        print(f"Created test zip file: {zip_path}")
-        return zip_path
-        
-    finally:
-        # Clean up temp directory
-        shutil.rmtree(temp_dir)
+            zipf.writestr(filename, content)
+    
+    zip_path = 'test_project.zip'
+    Path(zip_path).write_bytes(buffer.getvalue())
+    print(f"Created test zip file: {zip_path}")
+    return zip_path
 
 def test_upload():
     """Test the upload endpoint"""
@@ -53,7 +42,6 @@ def test_upload():
     
     try:
         # Prepare the upload data
-        files = {'file': open(zip_path, 'rb')}
         data = {
             'source_language': 'python',
             'description': 'Test project for zip upload',
@@ -62,7 +50,8 @@ def test_upload():
         
         # Make the upload request
         print("Uploading test zip file...")
-        response = requests.post('http://localhost:8000/api/upload', files=files, data=data)
+        with open(zip_path, 'rb') as zip_file:
+            response = SESSION.post('http://localhost:8000/api/upload', files={'file': zip_file}, data=data)
         
         if response.status_code == 200:
             result = response.json()
@@ -85,7 +74,7 @@ def test_upload():
 def test_projects_list():
     """Test the projects list endpoint"""
     print("\nTesting projects list...")
-    response = requests.get('http://localhost:8000/api/projects')
+    response = SESSION.get('http://localhost:8000/api/projects')
     
     if response.status_code == 200:
         projects = response.json()